@@ -1,256 +1,361 @@
-from flask import Flask, render_template, request, jsonify, redirect, url_for
-import sqlite3
+from flask import Flask, render_template, request, jsonify, redirect, url_for, g, has_request_context, send_from_directory, Response, stream_with_context
 import json
+import mimetypes
+import threading
+from collections import Counter, OrderedDict
 import random
 from datetime import datetime, date, timedelta
 import os
 
+from build_assets import MANIFEST_NAME, build_assets
+from day_catch_up import RELEASED, ROLL_FORWARD, catch_up, regroup_pool
+from day_rollover import DayRolloverWorker
+from db import get_pool, release_all_threads
+from fulltext_search import search_fulltext
+from grading import grade_answer, grade_batch, split_meanings
+from migrations import migrate
+from progress_cache import ProgressCache, read_cache_version, read_progress_version
+from response_cache import ResponseMemo, make_entry
+from review_feed import count_due, decode_cursor, fetch_page, iter_due_reviews, load_review_items, new_seed
+from review_priority import ReviewPriorityQueue, read_due_version, release_lease
+from review_load import forecast
+from scheduler import get_scheduler, rating_from_result, review_item
+from session_bundle import build_bundle
+from session_plan import load_plan
+from tenancy import ShardRouter, resolve_learner
+from vocab_importer import DEFAULT_WORD_BOOKS, import_word_books
+from word_index import WordDetailIndex
+from word_sampler import sample_unlearned_ids, sampling_rng
+from word_search import WordSearchIndex
+
 app = Flask(__name__)
 
+# 每日学习计划（每天多少词、分几组、几轮、交叉复习方式），从 SESSION_PLAN_FILE 中按名称选择，见 session_plan.py
+app.config.setdefault('SESSION_PLAN', 'standard')
+app.config.setdefault('SESSION_PLAN_FILE', 'session_plans.json')
+# 不为None时覆盖学习计划中的每日单词数和分组数
+app.config.setdefault('DAILY_WORD_COUNT', None)
+app.config.setdefault('DAILY_GROUP_COUNT', None)
+# 选词随机种子；设置后同一天的选词结果可复现（用于测试和基准测试）
+app.config.setdefault('WORD_SAMPLE_SEED', None)
+# 多学习者模式：每个学习者的学习数据保存在 LEARNER_DB_DIR 下各自的分片数据库中，
+# 共享词库（VOCABULARY_DATABASE，默认即 DATABASE）以只读方式挂载
+app.config.setdefault('MULTI_TENANT', False)
+app.config.setdefault('LEARNER_DB_DIR', 'learners')
+app.config.setdefault('VOCABULARY_DATABASE', None)
+# 同时打开的学习者分片数量上限（LRU淘汰）
+app.config.setdefault('MAX_OPEN_LEARNER_DBS', 64)
+# 复习调度器：ebbinghaus（固定间隔）、sm2 或 fsrs，参数如 {'retention': 0.9}（见 scheduler.py）
+app.config.setdefault('REVIEW_SCHEDULER', 'ebbinghaus')
+app.config.setdefault('REVIEW_SCHEDULER_PARAMS', {})
+# 安排复习日期时在间隔 ±15% 的窗口内选择复习量最少的一天，削平复习高峰
+app.config.setdefault('REVIEW_LOAD_BALANCE', True)
+# 每天最多复习的单词数（None 为不限），超出的积压按优先级留到之后几天
+app.config.setdefault('REVIEW_DAILY_CAP', 200)
+# 后台换日线程：每天到换日时间（本地时间 HH:MM，零点或零点之后）提前准备新一天的词池
+# 每个进程在处理第一个请求时启动一个线程，多个进程之间用 DAY_ROLLOVER_LOCK 文件锁保证只有一个在换日
+app.config.setdefault('DAY_ROLLOVER_WORKER', True)
+app.config.setdefault('DAY_ROLLOVER_TIME', '00:00')
+app.config.setdefault('DAY_ROLLOVER_LOCK', 'day_rollover.lock')
+# 以前未完成的学习任务（可能连续多天）：roll_forward 最近一天整体迁移到今天、
+# merge 合并各天还在学习的单词、release 全部退回未学习（见 day_catch_up.py）
+app.config.setdefault('CATCH_UP_POLICY', ROLL_FORWARD)
+
 DATABASE = 'vocabulary.db'
 
-def get_db():
-    conn = sqlite3.connect(DATABASE)
-    conn.row_factory = sqlite3.Row
-    return conn
+# 按需从原始词书文件读取单词完整详情
+word_detail_index = WordDetailIndex(DATABASE)
 
-def init_db():
-    conn = get_db()
-    
-    # 总词库表
-    conn.execute('''
-        CREATE TABLE IF NOT EXISTS master_vocabulary (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            word TEXT NOT NULL UNIQUE,
-            phonetic TEXT,
-            translation TEXT,
-            example_sentence TEXT,
-            status TEXT DEFAULT 'unlearned'
-        )
-    ''')
-    
-    # 每日词池表
-    conn.execute('''
-        CREATE TABLE IF NOT EXISTS daily_pool (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            master_word_id INTEGER,
-            date TEXT,
-            group_number INTEGER,
-            FOREIGN KEY (master_word_id) REFERENCES master_vocabulary (id)
-        )
-    ''')
-    
-    # 每日学习表 - R1认
-    conn.execute('''
-        CREATE TABLE IF NOT EXISTS daily_r1_recognition (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            daily_pool_id INTEGER,
-            word TEXT,
-            phonetic TEXT,
-            translation TEXT,
-            example_sentence TEXT,
-            is_mastered INTEGER DEFAULT 0,
-            FOREIGN KEY (daily_pool_id) REFERENCES daily_pool (id)
-        )
-    ''')
-    
-    # 每日学习表 - R2写
-    conn.execute('''
-        CREATE TABLE IF NOT EXISTS daily_r2_spelling (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            daily_pool_id INTEGER,
-            word TEXT,
-            phonetic TEXT,
-            translation TEXT,
-            example_sentence TEXT,
-            is_mastered INTEGER DEFAULT 0,
-            FOREIGN KEY (daily_pool_id) REFERENCES daily_pool (id)
-        )
-    ''')
-    
-    # 每日学习表 - R3听（预留）
-    conn.execute('''
-        CREATE TABLE IF NOT EXISTS daily_r3_listening (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            daily_pool_id INTEGER,
-            word TEXT,
-            phonetic TEXT,
-            translation TEXT,
-            example_sentence TEXT,
-            is_mastered INTEGER DEFAULT 0,
-            FOREIGN KEY (daily_pool_id) REFERENCES daily_pool (id)
-        )
-    ''')
-    
-    # 每日学习表 - R4说（预留）
-    conn.execute('''
-        CREATE TABLE IF NOT EXISTS daily_r4_speaking (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            daily_pool_id INTEGER,
-            word TEXT,
-            phonetic TEXT,
-            translation TEXT,
-            example_sentence TEXT,
-            is_mastered INTEGER DEFAULT 0,
-            FOREIGN KEY (daily_pool_id) REFERENCES daily_pool (id)
-        )
-    ''')
-    
-    # 学习记录表
-    conn.execute('''
-        CREATE TABLE IF NOT EXISTS learning_records (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            master_word_id INTEGER,
-            first_studied_at TEXT,
-            FOREIGN KEY (master_word_id) REFERENCES master_vocabulary (id)
-        )
-    ''')
-    
-    # 复习队列表
-    conn.execute('''
-        CREATE TABLE IF NOT EXISTS review_queue (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            learning_record_id INTEGER,
-            master_word_id INTEGER,
-            next_review_date TEXT,
-            review_interval INTEGER,
-            FOREIGN KEY (learning_record_id) REFERENCES learning_records (id),
-            FOREIGN KEY (master_word_id) REFERENCES master_vocabulary (id)
-        )
-    ''')
-    
-    # 学习进度表 - 检查并添加缺失的字段
-    conn.execute('''
-        CREATE TABLE IF NOT EXISTS daily_progress (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            date TEXT UNIQUE,
-            current_stage TEXT,
-            current_group INTEGER,
-            current_round INTEGER,
-            current_dimension TEXT,
-            stage_progress TEXT,
-            completed_stages TEXT
+# 每日学习进度缓存（进程级，按版本号校验）
+progress_cache = ProgressCache()
+# 历史记录接口的响应缓存
+history_memo = ResponseMemo()
+# 单词搜索索引（按词库区分，最多保留 MAX_SEARCH_INDEXES 个）
+search_indexes = OrderedDict()
+search_indexes_lock = threading.Lock()
+MAX_SEARCH_INDEXES = 8
+# 复习优先级队列（按数据范围区分，每天重建）
+review_queues = OrderedDict()
+review_queues_lock = threading.Lock()
+MAX_REVIEW_QUEUES = 64
+
+# 学习维度及其在 daily_word_state 表中的编号
+DIMENSIONS = {
+    'recognition': 1,
+    'spelling': 2,
+    'listening': 3,
+    'speaking': 4
+}
+
+# 热点接口的SQL（query_plans.py 直接引用这些常量检查执行计划，修改时无需另行同步）
+POOL_COUNT_SQL = 'SELECT COUNT(*) FROM daily_pool WHERE date = ?'
+PROGRESS_SQL = 'SELECT * FROM daily_progress WHERE date = ?'
+# 只重置状态1（掌握了），不重置状态2（我会这个）
+RESET_ROUND_SQL = '''
+    UPDATE daily_word_state SET is_mastered = 0
+    WHERE dimension = ? AND is_mastered = 1 AND daily_pool_id IN (
+        SELECT id FROM daily_pool WHERE date = ? AND group_number = ?
+    )
+'''
+GROUP_WORDS_SQL = '''
+    SELECT dp.id, mv.word, mv.phonetic, mv.translation, mv.example_sentence
+    FROM daily_pool dp
+    JOIN daily_word_state ws ON ws.daily_pool_id = dp.id AND ws.dimension = ?
+    JOIN master_vocabulary mv ON dp.master_word_id = mv.id
+    WHERE dp.date = ? AND dp.group_number = ? AND ws.is_mastered = 0
+    ORDER BY dp.id
+'''
+MARK_WORD_SQL = 'UPDATE daily_word_state SET is_mastered = ? WHERE daily_pool_id = ? AND dimension = ?'
+COMPLETE_LEARNED_SQL = '''
+    UPDATE master_vocabulary SET status = 'learned'
+    WHERE id IN (SELECT master_word_id FROM daily_pool WHERE date = ?)
+'''
+COMPLETE_RECORDS_SQL = '''
+    INSERT OR IGNORE INTO learning_records (master_word_id, first_studied_at)
+    SELECT DISTINCT master_word_id, date FROM daily_pool WHERE date = ?
+'''
+COMPLETE_REVIEWS_SQL = '''
+    INSERT OR IGNORE INTO review_queue
+    (learning_record_id, master_word_id, next_review_date, review_interval, last_review_date)
+    SELECT lr.id, lr.master_word_id, ?, 1, ?
+    FROM learning_records lr
+    WHERE lr.first_studied_at = ?
+      AND lr.master_word_id IN (SELECT master_word_id FROM daily_pool WHERE date = ?)
+'''
+HISTORY_DAY_EXISTS_SQL = 'SELECT 1 FROM daily_pool WHERE date = ? LIMIT 1'
+HISTORY_DATES_SQL = '''
+    SELECT date, COUNT(*) AS word_count FROM daily_pool
+    GROUP BY date
+    ORDER BY date DESC
+'''
+HISTORY_WORDS_SQL = '''
+    SELECT dp.group_number, mv.word, mv.phonetic, mv.translation, mv.example_sentence
+    FROM daily_pool dp
+    JOIN master_vocabulary mv ON dp.master_word_id = mv.id
+    WHERE dp.date = ?
+    ORDER BY dp.group_number, mv.word
+'''
+SEARCH_WORD_SQL = 'SELECT * FROM master_vocabulary WHERE LOWER(word) = ?'
+GROUP_COUNTS_SQL = 'SELECT group_number, COUNT(*) as count FROM daily_pool WHERE date = ? GROUP BY group_number ORDER BY group_number'
+TODAY_WORDS_SQL = '''
+    SELECT dp.id as daily_pool_id, dp.group_number, mv.id as master_id,
+           mv.word, mv.phonetic, mv.translation, mv.example_sentence,
+           -- 检查各维度是否还有未掌握的单词
+           CASE WHEN EXISTS(SELECT 1 FROM daily_word_state WHERE daily_pool_id = dp.id AND dimension = 1) THEN 1 ELSE 0 END as has_recognition,
+           CASE WHEN EXISTS(SELECT 1 FROM daily_word_state WHERE daily_pool_id = dp.id AND dimension = 2) THEN 1 ELSE 0 END as has_spelling
+    FROM daily_pool dp
+    JOIN master_vocabulary mv ON dp.master_word_id = mv.id
+    WHERE dp.date = ?
+    ORDER BY dp.group_number, mv.word
+'''
+REMOVE_WORD_STATE_SQL = 'DELETE FROM daily_word_state WHERE daily_pool_id = ?'
+
+def grading_words_query(table, count):
+    """按 count 个 daily_pool 或 review_queue 的 id 取出单词的SQL"""
+    placeholders = ','.join('?' * count)
+    return f'''
+        SELECT t.id, mv.word, mv.translation
+        FROM {table} t
+        JOIN master_vocabulary mv ON t.master_word_id = mv.id
+        WHERE t.id IN ({placeholders})
+    '''
+
+def suggestion_details_query(count):
+    """按 count 个单词 id 取出翻译和学习状态的SQL"""
+    placeholders = ','.join('?' * count)
+    return f'SELECT id, translation, status FROM master_vocabulary WHERE id IN ({placeholders})'
+
+_shard_router = None
+
+def get_shard_router():
+    """返回学习者分片路由（首次使用时按配置创建）"""
+    global _shard_router
+    if _shard_router is None:
+        _shard_router = ShardRouter(
+            app.config['VOCABULARY_DATABASE'] or DATABASE,
+            shard_dir=app.config['LEARNER_DB_DIR'],
+            max_open=app.config['MAX_OPEN_LEARNER_DBS']
         )
-    ''')
-    
-    # 检查并添加缺失的字段（用于升级现有数据库）
-    try:
-        conn.execute('SELECT stage_progress FROM daily_progress LIMIT 1')
-    except:
-        conn.execute('ALTER TABLE daily_progress ADD COLUMN stage_progress TEXT')
-        
+    return _shard_router
+
+def current_learner():
+    """返回当前请求的学习者ID"""
+    if 'learner_id' not in g:
+        g.learner_id = resolve_learner(request)
+    return g.learner_id
+
+def cache_scope():
+    """进程级缓存的数据范围：多学习者模式下按学习者区分"""
+    if app.config['MULTI_TENANT'] and has_request_context():
+        return current_learner()
+    return DATABASE
+
+def vocabulary_scope():
+    """单词内容缓存（如搜索索引）的数据范围：多学习者模式下所有学习者共用共享词库"""
+    if app.config['MULTI_TENANT']:
+        return app.config['VOCABULARY_DATABASE'] or DATABASE
+    return DATABASE
+
+def get_db(database=None):
+    """获取当前线程的数据库连接（来自连接池，conn.close() 即归还连接池）
+    多学习者模式下，请求内未指定数据库时返回当前学习者的分片连接"""
+    if database is None and app.config['MULTI_TENANT'] and has_request_context():
+        return get_shard_router().pool_for(current_learner()).acquire()
+    return get_pool(database or DATABASE).acquire()
+
+@app.after_request
+def remember_learner(response):
+    """通过 learner 参数切换学习者后写入Cookie，后续请求无需再带参数"""
+    if app.config['MULTI_TENANT'] and 'learner_id' in g and request.args.get('learner') == g.learner_id:
+        response.set_cookie('learner_id', g.learner_id, max_age=365 * 24 * 3600, samesite='Lax')
+    return response
+
+@app.teardown_appcontext
+def release_db(exception):
+    """请求结束时归还本线程持有的数据库连接，未提交的事务会被回滚"""
+    release_all_threads()
+    if _shard_router is not None:
+        _shard_router.release_thread()
+
+# 构建后的静态资源目录（见 build_assets.py）
+ASSET_DIR = os.path.join(app.static_folder, 'dist')
+_asset_manifest = {'mtime': None, 'entries': {}}
+
+def load_asset_manifest():
+    """读取静态资源 manifest，文件更新后重新加载"""
+    path = os.path.join(ASSET_DIR, MANIFEST_NAME)
     try:
-        conn.execute('SELECT completed_stages FROM daily_progress LIMIT 1')
-    except:
-        conn.execute('ALTER TABLE daily_progress ADD COLUMN completed_stages TEXT')
-    
-    conn.commit()
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return {}
+    if _asset_manifest['mtime'] != mtime:
+        with open(path, encoding='utf-8') as f:
+            _asset_manifest['entries'] = json.load(f)
+        _asset_manifest['mtime'] = mtime
+    return _asset_manifest['entries']
+
+@app.template_global()
+def asset_url(filename):
+    """静态资源地址：已构建时返回带内容哈希的文件，否则返回原始文件"""
+    hashed = load_asset_manifest().get(filename)
+    if hashed:
+        return url_for('asset_file', filename=hashed)
+    return url_for('static', filename=filename)
+
+@app.route('/assets/<path:filename>')
+def asset_file(filename):
+    """带内容哈希的静态资源：优先返回预压缩版本，允许浏览器永久缓存"""
+    mimetype = mimetypes.guess_type(filename)[0]
+    response = None
+    for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+        if request.accept_encodings[encoding] and os.path.isfile(os.path.join(ASSET_DIR, filename + suffix)):
+            response = send_from_directory(ASSET_DIR, filename + suffix, mimetype=mimetype)
+            response.headers['Content-Encoding'] = encoding
+            break
+    if response is None:
+        response = send_from_directory(ASSET_DIR, filename, mimetype=mimetype)
+    response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    response.vary.add('Accept-Encoding')
+    return response
+
+def create_word_states(conn, daily_pool_ids):
+    """为词池中的单词创建各维度的掌握状态（初始为未掌握）"""
+    conn.executemany(
+        'INSERT OR IGNORE INTO daily_word_state (daily_pool_id, dimension) VALUES (?, ?)',
+        [(pool_id, code) for pool_id in daily_pool_ids for code in DIMENSIONS.values()]
+    )
+
+def init_db(database=None):
+    """初始化数据库：按版本顺序执行尚未应用的结构迁移"""
+    conn = get_db(database)
+    migrate(conn)
     conn.close()
 
-def import_vocabulary_from_json():
-    """从JSON文件导入词汇到master_vocabulary表"""
-    conn = get_db()
-    
-    # 检查是否已经导入过数据
-    count = conn.execute('SELECT COUNT(*) FROM master_vocabulary').fetchone()[0]
-    if count > 0:
-        print(f"词汇库已存在 {count} 个单词")
-        conn.close()
+def import_vocabulary_from_json(paths=None, rescan=False):
+    """从JSON词书文件增量导入词汇到master_vocabulary表
+
+    只写入新增或内容变化的记录，已在学习或已学会的单词保持原有状态。
+    """
+    paths = paths or [p for p in DEFAULT_WORD_BOOKS if os.path.exists(p)]
+    if not paths:
+        print("未找到词书文件，跳过导入")
         return
     
     try:
-        with open('CET4luan_2.json', 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                
-                data = json.loads(line)
-                word_info = data['content']['word']
-                
-                # 提取信息
-                word = word_info['wordHead']
-                phonetic = word_info.get('content', {}).get('usphone', '')
-                
-                # 获取中文释义
-                translations = []
-                trans_list = word_info.get('content', {}).get('trans', [])
-                for trans in trans_list:
-                    translations.append(trans.get('tranCn', ''))
-                translation = '；'.join(filter(None, translations))
-                
-                # 获取例句
-                example_sentence = ''
-                sentences = word_info.get('content', {}).get('sentence', {}).get('sentences', [])
-                if sentences:
-                    example_sentence = sentences[0].get('sContent', '')
-                
-                # 插入数据库
-                conn.execute('''
-                    INSERT OR IGNORE INTO master_vocabulary 
-                    (word, phonetic, translation, example_sentence, status)
-                    VALUES (?, ?, ?, ?, 'unlearned')
-                ''', (word, phonetic, translation, example_sentence))
-        
-        conn.commit()
-        imported_count = conn.execute('SELECT COUNT(*) FROM master_vocabulary').fetchone()[0]
-        print(f"成功导入 {imported_count} 个单词到词汇库")
-        
+        import_word_books(paths, database=DATABASE, rescan=rescan)
     except Exception as e:
         print(f"导入词汇时出错: {e}")
-    finally:
-        conn.close()
 
 class LearningFlowManager:
-    """自动化学习流程管理器"""
-    
-    LEARNING_STAGES = [
-        # 第1组：认→写→认→写→认→写（3轮）
-        {'stage': 'group1_main', 'group': 1, 'dimensions': ['recognition', 'spelling'], 'rounds': 3},
-        # 第2组：认→写→认→写→认→写（3轮）  
-        {'stage': 'group2_main', 'group': 2, 'dimensions': ['recognition', 'spelling'], 'rounds': 3},
-        # 交叉复习：第1组(认→写)1轮 + 第2组(认→写)1轮
-        {'stage': 'cross_review_1_2', 'groups': [1, 2], 'dimensions': ['recognition', 'spelling'], 'rounds': 1},
-        # 第3组：认→写→认→写→认→写（3轮）
-        {'stage': 'group3_main', 'group': 3, 'dimensions': ['recognition', 'spelling'], 'rounds': 3},
-        # 交叉复习：第2组(认→写)1轮 + 第3组(认→写)1轮  
-        {'stage': 'cross_review_2_3', 'groups': [2, 3], 'dimensions': ['recognition', 'spelling'], 'rounds': 1},
-        # 大乱斗（可选）
-        {'stage': 'final_battle', 'groups': [1, 2, 3], 'dimensions': ['recognition', 'spelling'], 'rounds': 1}
-    ]
+    """自动化学习流程管理器（学习流程由当前学习计划决定，见 session_plan.py）"""
+    
+    @staticmethod
+    def progress_cache_key(date_str):
+        """进度缓存的键：多学习者模式下按学习者区分"""
+        return (cache_scope(), date_str)
+    
+    @staticmethod
+    def remember_progress(key, version):
+        """记录本次请求中已校验过的进度版本，同一请求内再次读取无需查询数据库"""
+        if has_request_context():
+            g.setdefault('progress_versions', {})[key] = version
+    
+    @staticmethod
+    def invalidate_progress(date_str=None):
+        """进度被迁移或重置后使缓存失效"""
+        key = LearningFlowManager.progress_cache_key(date_str) if date_str else None
+        progress_cache.invalidate(key)
+        if has_request_context():
+            g.pop('progress_versions', None)
     
     @staticmethod
     def get_current_progress(date_str):
-        """获取当前学习进度"""
+        """获取当前学习进度（优先读取缓存）"""
+        key = LearningFlowManager.progress_cache_key(date_str)
+        version = g.get('progress_versions', {}).get(key) if has_request_context() else None
+        
         conn = get_db()
-        progress = conn.execute(
-            'SELECT * FROM daily_progress WHERE date = ?', (date_str,)
-        ).fetchone()
+        if version is None:
+            version = read_progress_version(conn)
+        cached = progress_cache.get(key, version)
+        if cached is not None:
+            conn.close()
+            LearningFlowManager.remember_progress(key, version)
+            return cached
+        
+        # 版本号先于数据读取：期间若有其他进程写入，缓存的版本号偏旧，下次读取会重新加载
+        progress = conn.execute(PROGRESS_SQL, (date_str,)).fetchone()
         conn.close()
         
         if not progress:
             return LearningFlowManager.create_initial_progress(date_str)
         
-        return {
-            'current_stage': progress['current_stage'] or 'group1_main',
-            'current_group': progress['current_group'] or 1,
-            'current_round': progress['current_round'] or 1,
-            'current_dimension': progress['current_dimension'] or 'recognition',
+        initial = get_session_plan().initial_progress()
+        progress = {
+            'current_stage': progress['current_stage'] or initial['current_stage'],
+            'current_group': progress['current_group'] or initial['current_group'],
+            'current_round': progress['current_round'] or initial['current_round'],
+            'current_dimension': progress['current_dimension'] or initial['current_dimension'],
             'stage_progress': json.loads(progress['stage_progress'] or '{}'),
             'completed_stages': json.loads(progress['completed_stages'] or '[]')
         }
+        progress_cache.put(key, version, progress)
+        LearningFlowManager.remember_progress(key, version)
+        return progress
+    
+    @staticmethod
+    def write_through(date_str, conn, progress):
+        """写入进度后（提交前）同步更新缓存，此时持有写锁，读到的版本号就是本次写入的版本"""
+        key = LearningFlowManager.progress_cache_key(date_str)
+        version = read_progress_version(conn)
+        conn.commit()
+        progress_cache.put(key, version, progress)
+        LearningFlowManager.remember_progress(key, version)
     
     @staticmethod
     def create_initial_progress(date_str):
         """创建初始学习进度"""
-        initial_progress = {
-            'current_stage': 'group1_main',
-            'current_group': 1,
-            'current_round': 1,
-            'current_dimension': 'recognition',
-            'stage_progress': {},
-            'completed_stages': []
-        }
+        initial_progress = get_session_plan().initial_progress()
         
         conn = get_db()
         conn.execute('''
@@ -266,16 +371,16 @@ class LearningFlowManager:
             json.dumps(initial_progress['stage_progress']),
             json.dumps(initial_progress['completed_stages'])
         ))
-        conn.commit()
+        LearningFlowManager.write_through(date_str, conn, initial_progress)
         conn.close()
         
         return initial_progress
     
     @staticmethod
     def update_progress(date_str, progress):
-        """更新学习进度"""
+        """更新学习进度（同时更新缓存）"""
         conn = get_db()
-        conn.execute('''
+        cursor = conn.execute('''
             UPDATE daily_progress 
             SET current_stage = ?, current_group = ?, current_round = ?, 
                 current_dimension = ?, stage_progress = ?, completed_stages = ?
@@ -289,356 +394,257 @@ class LearningFlowManager:
             json.dumps(progress['completed_stages']),
             date_str
         ))
-        conn.commit()
+        if cursor.rowcount:
+            LearningFlowManager.write_through(date_str, conn, progress)
+        else:
+            # 没有对应的进度记录，数据库未变化，缓存也不应保存这份进度
+            conn.commit()
+            LearningFlowManager.invalidate_progress(date_str)
         conn.close()
     
-    @staticmethod
-    def get_current_stage_info(stage_name):
-        """获取当前阶段信息"""
-        for stage in LearningFlowManager.LEARNING_STAGES:
-            if stage['stage'] == stage_name:
-                return stage
-        return None
-    
     @staticmethod
     def advance_to_next_phase(progress):
-        """推进到下一个学习阶段"""
-        current_stage_info = LearningFlowManager.get_current_stage_info(progress['current_stage'])
-        
-        if not current_stage_info:
-            return progress
-        
-        # 检查是否是交叉复习阶段
-        is_cross_review = 'cross_review' in progress['current_stage']
-        
-        if is_cross_review:
-            # 交叉复习逻辑：需要处理多个组
-            return LearningFlowManager.advance_cross_review_phase(progress, current_stage_info)
-        else:
-            # 单组学习逻辑
-            return LearningFlowManager.advance_single_group_phase(progress, current_stage_info)
+        """推进到学习计划中的下一步，开始新一轮时重置相应组的掌握状态"""
+        plan = get_session_plan()
+        reset_groups = plan.advance(progress)
+        if reset_groups:
+            today_str = date.today().isoformat()
+            dimensions = plan.stages[plan.stage_order[progress['current_stage']]]['dimensions']
+            for group in reset_groups:
+                for dimension in dimensions:
+                    LearningFlowManager.reset_round_progress(today_str, group, dimension)
+        return progress
     
     @staticmethod
     def reset_round_progress(date_str, group, dimension):
         """重置指定组和维度的单词掌握状态，用于开始新一轮学习"""
-        conn = get_db()
-        
-        table_map = {
-            'recognition': 'daily_r1_recognition',
-            'spelling': 'daily_r2_spelling'
-        }
-        
-        if dimension not in table_map:
-            conn.close()
+        if dimension not in ('recognition', 'spelling'):
             return
-            
-        table_name = table_map[dimension]
+        
+        conn = get_db()
         
         # 重置指定组和维度的单词掌握状态，只重置状态1（掌握了），不重置状态2（我会这个）
-        conn.execute(f'''
-            UPDATE {table_name} SET is_mastered = 0
-            WHERE daily_pool_id IN (
-                SELECT id FROM daily_pool WHERE date = ? AND group_number = ?
-            ) AND is_mastered = 1
-        ''', (date_str, group))
+        conn.execute(RESET_ROUND_SQL, (DIMENSIONS[dimension], date_str, group))
         
         conn.commit()
         conn.close()
     
-    @staticmethod
-    def advance_single_group_phase(progress, stage_info):
-        """推进单组学习阶段"""
-        # 在同一轮内，先完成认，再完成写
-        if progress['current_dimension'] == 'recognition':
-            progress['current_dimension'] = 'spelling'
-            return progress
-        
-        # 如果写也完成了，检查是否需要下一轮
-        if progress['current_round'] < stage_info['rounds']:
-            progress['current_round'] += 1
-            progress['current_dimension'] = 'recognition'
-            
-            # 重置当前组的所有维度的掌握状态，开始新一轮
-            from datetime import date
-            today_str = date.today().isoformat()
-            LearningFlowManager.reset_round_progress(today_str, progress['current_group'], 'recognition')
-            LearningFlowManager.reset_round_progress(today_str, progress['current_group'], 'spelling')
-            
-            return progress
-        
-        # 当前阶段完成，进入下一个阶段
-        return LearningFlowManager.move_to_next_stage(progress)
-    
-    @staticmethod
-    def advance_cross_review_phase(progress, stage_info):
-        """推进交叉复习阶段"""
-        groups = stage_info['groups']
-        current_group_index = groups.index(progress['current_group'])
-        
-        # 在同一组内，先完成认，再完成写
-        if progress['current_dimension'] == 'recognition':
-            progress['current_dimension'] = 'spelling'
-            return progress
-        
-        # 如果当前组的写也完成了，切换到下一组
-        if current_group_index < len(groups) - 1:
-            progress['current_group'] = groups[current_group_index + 1]
-            progress['current_dimension'] = 'recognition'
-            return progress
-        
-        # 所有组都完成，进入下一个阶段
-        return LearningFlowManager.move_to_next_stage(progress)
-    
-    @staticmethod
-    def move_to_next_stage(progress):
-        """移动到下一个学习阶段"""
-        current_stage_index = None
-        for i, stage in enumerate(LearningFlowManager.LEARNING_STAGES):
-            if stage['stage'] == progress['current_stage']:
-                current_stage_index = i
-                break
-        
-        if current_stage_index is None or current_stage_index >= len(LearningFlowManager.LEARNING_STAGES) - 1:
-            # 所有阶段完成
-            progress['current_stage'] = 'completed'
-            return progress
-        
-        # 移动到下一阶段
-        next_stage = LearningFlowManager.LEARNING_STAGES[current_stage_index + 1]
-        progress['completed_stages'].append(progress['current_stage'])
-        progress['current_stage'] = next_stage['stage']
-        progress['current_round'] = 1
-        progress['current_dimension'] = 'recognition'
-        
-        # 设置当前组（单组或交叉复习的第一组）
-        if 'group' in next_stage:
-            progress['current_group'] = next_stage['group']
-        elif 'groups' in next_stage:
-            progress['current_group'] = next_stage['groups'][0]
-        
-        return progress
-    
     @staticmethod
     def get_stage_description(stage_name, group, round_num, dimension):
         """获取阶段描述"""
-        stage_info = LearningFlowManager.get_current_stage_info(stage_name)
-        if not stage_info:
-            return "未知阶段"
-        
-        dimension_name = "认（英译汉）" if dimension == 'recognition' else "写（汉译英）"
-        
-        if stage_name == 'group1_main':
-            return f"第1组主学习 - 第{round_num}轮{dimension_name}"
-        elif stage_name == 'group2_main':
-            return f"第2组主学习 - 第{round_num}轮{dimension_name}"
-        elif stage_name == 'group3_main':
-            return f"第3组主学习 - 第{round_num}轮{dimension_name}"
-        elif stage_name == 'cross_review_1_2':
-            return f"交叉复习(1-2组) - 第{group}组{dimension_name}"
-        elif stage_name == 'cross_review_2_3':
-            return f"交叉复习(2-3组) - 第{group}组{dimension_name}"
-        elif stage_name == 'final_battle':
-            return f"大乱斗模式 - 第{group}组{dimension_name}"
-        elif stage_name == 'completed':
-            return "🎉 今日学习全部完成！"
-        
-        return f"{stage_name} - 第{group}组第{round_num}轮{dimension_name}"
+        return get_session_plan().describe(stage_name, group, round_num, dimension)
 
-def check_and_migrate_unfinished_tasks():
-    """检查并迁移前一天未完成的任务到今天"""
-    today = date.today()
-    yesterday = (today - timedelta(days=1)).isoformat()
-    today_str = today.isoformat()
-    
-    conn = get_db()
-    
-    # 检查昨天是否有未完成的学习任务
-    yesterday_progress = conn.execute(
-        'SELECT * FROM daily_progress WHERE date = ?', (yesterday,)
-    ).fetchone()
-    
-    if not yesterday_progress:
-        conn.close()
-        return False, "昨天没有学习记录"
-    
-    # 检查昨天的任务是否已完成
-    if yesterday_progress['current_stage'] == 'completed':
-        conn.close()
-        return False, "昨天的任务已完成"
-    
-    # 检查今天是否已有任务或进度记录
-    today_pool = conn.execute(
-        'SELECT COUNT(*) FROM daily_pool WHERE date = ?', (today_str,)
-    ).fetchone()[0]
-    
-    today_progress = conn.execute(
-        'SELECT COUNT(*) FROM daily_progress WHERE date = ?', (today_str,)
-    ).fetchone()[0]
-    
-    if today_pool > 0 or today_progress > 0:
-        conn.close()
-        return False, "今天已有学习任务或进度记录，无法迁移"
-    
-    print(f"检测到昨天({yesterday})的任务未完成，正在迁移到今天...")
-    
+def invalidate_day_caches():
+    """词池或进度被迁移后使相关缓存失效"""
+    LearningFlowManager.invalidate_progress()
+    history_memo.invalidate()
+
+# 编译好的学习计划（按计划文件、名称和覆盖设置缓存）
+session_plans = {}
+session_plans_lock = threading.Lock()
+
+def get_session_plan():
+    """返回当前配置的学习计划（首次使用时读取并编译）"""
+    key = (app.config['SESSION_PLAN_FILE'], app.config['SESSION_PLAN'],
+           app.config['DAILY_WORD_COUNT'], app.config['DAILY_GROUP_COUNT'])
+    with session_plans_lock:
+        plan = session_plans.get(key)
+        if plan is None:
+            plan = session_plans[key] = load_plan(*key)
+    return plan
+
+@app.template_global()
+def session_plan():
+    """模板中使用的当前学习计划"""
+    return get_session_plan()
+
+def get_daily_plan_size():
+    """返回 (每日单词数, 分组数, 每组单词数)"""
+    plan = get_session_plan()
+    return plan.daily_words, plan.group_count, plan.group_size
+
+def has_json1(conn):
+    """检查SQLite是否内置JSON1扩展（json_each）"""
     try:
-        # 1. 更新daily_pool表中的日期
-        conn.execute('UPDATE daily_pool SET date = ? WHERE date = ?', (today_str, yesterday))
-        
-        # 2. 重置所有学习维度表的掌握状态为0（重新开始学习）
-        learning_tables = ['daily_r1_recognition', 'daily_r2_spelling', 'daily_r3_listening', 'daily_r4_speaking']
-        for table in learning_tables:
-            conn.execute(f'''
-                UPDATE {table} SET is_mastered = 0 
-                WHERE daily_pool_id IN (
-                    SELECT id FROM daily_pool WHERE date = ?
-                )
-            ''', (today_str,))
-        
-        # 3. 更新昨天的学习进度记录日期
-        # 由于前面已经确认今天没有进度记录，可以直接更新
-        conn.execute('''
-            UPDATE daily_progress SET 
-                date = ?,
-                current_stage = 'group1_main',
-                current_group = 1,
-                current_round = 1,
-                current_dimension = 'recognition',
-                stage_progress = '{}',
-                completed_stages = '[]'
-            WHERE date = ?
-        ''', (today_str, yesterday))
-        
-        conn.commit()
-        print(f"成功将昨天的任务完整迁移到今天并重置学习状态")
-        
-        conn.close()
-        return True, f"已将昨天({yesterday})未完成的任务迁移到今天并重置学习进度"
-        
-    except Exception as e:
-        conn.rollback()
-        conn.close()
-        print(f"迁移任务时出错: {e}")
-        return False, f"迁移失败: {e}"
+        conn.execute("SELECT value FROM json_each('[]')").fetchall()
+        return True
+    except Exception:
+        return False
 
-def initialize_today_words():
-    """初始化今日学习单词"""
-    today = date.today().isoformat()
-    conn = get_db()
-    
-    # 检查今日是否已初始化
-    existing = conn.execute(
-        'SELECT COUNT(*) FROM daily_pool WHERE date = ?', (today,)
-    ).fetchone()[0]
+def create_daily_pool(conn, date_str, word_ids, group_size):
+    """把一批单词按顺序分组写入当日词池，并创建各维度掌握状态（调用方负责事务）"""
+    if has_json1(conn):
+        # 集合操作：一条 INSERT ... SELECT 写入词池，一条写入全部掌握状态
+        conn.execute('''
+            INSERT INTO daily_pool (master_word_id, date, group_number)
+            SELECT value, ?, key / ? + 1 FROM json_each(?) ORDER BY key
+        ''', (date_str, group_size, json.dumps(word_ids)))
+        conn.execute('''
+            INSERT OR IGNORE INTO daily_word_state (daily_pool_id, dimension)
+            SELECT dp.id, d.value FROM daily_pool dp, json_each(?) d
+            WHERE dp.date = ?
+        ''', (json.dumps(list(DIMENSIONS.values())), date_str))
+    else:
+        conn.executemany(
+            'INSERT INTO daily_pool (master_word_id, date, group_number) VALUES (?, ?, ?)',
+            [(word_id, date_str, i // group_size + 1) for i, word_id in enumerate(word_ids)]
+        )
+        pool_ids = [row[0] for row in conn.execute(
+            'SELECT id FROM daily_pool WHERE date = ?', (date_str,)
+        )]
+        create_word_states(conn, pool_ids)
     
+    conn.execute('''
+        UPDATE master_vocabulary SET status = 'learning'
+        WHERE id IN (SELECT master_word_id FROM daily_pool WHERE date = ?)
+    ''', (date_str,))
+
+def prepare_day_pool(conn, day, daily_size=None, group_count=None):
+    """准备 day 的学习词池（调用方持有写事务并负责提交）
+    已有词池时什么也不做；否则先按 CATCH_UP_POLICY 处理以前所有未完成的日期，
+    迁移过来的单词不足每日数量时（roll_forward 除外）再抽取新单词补足。
+    返回 (状态, 补漏结果)：状态为 'ready'（已准备过）、'migrated'（整天迁移）、'created'
+    或 'insufficient'（可用单词不足），没有未完成的日期时补漏结果为None"""
+    day_str = day.isoformat()
+    existing = conn.execute(POOL_COUNT_SQL, (day_str,)).fetchone()[0]
     if existing > 0:
-        conn.close()
-        return False  # 已经初始化过
-    
-    # 先检查并迁移昨天未完成的任务
-    migrated, message = check_and_migrate_unfinished_tasks()
-    if migrated:
-        print(message)
-        return True  # 迁移成功，无需重新初始化
+        return 'ready', None
+    
+    default_size, default_groups, _ = get_daily_plan_size()
+    daily_size = daily_size or default_size
+    group_count = group_count or default_groups
+    group_size = -(-daily_size // group_count)
+    
+    summary = catch_up(conn, day_str, app.config['CATCH_UP_POLICY'], daily_size, group_size,
+                       get_session_plan().initial_progress())
+    if summary:
+        print(f"补漏 {summary['days']}（{summary['policy']}）：{summary['carried']}个单词移到今天，"
+              f"{summary['released']}个单词退回未学习")
+        if summary['policy'] == ROLL_FORWARD and summary['carried']:
+            return 'migrated', summary
+    carried = summary['carried'] if summary else 0
+    
+    # 从master_vocabulary中随机选择unlearned状态的单词（按持久化的随机排序键取，O(k)）
+    rng = sampling_rng(app.config['WORD_SAMPLE_SEED'], day_str)
+    word_ids = sample_unlearned_ids(conn, daily_size - carried, rng)
+    if carried + len(word_ids) < daily_size:
+        return 'insufficient', summary
+    
+    # 分组写入词池，并将这些单词状态改为learning；与迁移过来的单词一起重新分组
+    if word_ids:
+        create_daily_pool(conn, day_str, word_ids, group_size)
+    if carried:
+        regroup_pool(conn, day_str, group_size)
+    return 'created', summary
+
+def roll_over_day(conn, day, daily_size=None, group_count=None):
+    """在一个写事务中准备 day 的词池并提交：其他连接要么看不到新词池，要么看到完整的词池
+    写锁保证多个标签页或换日线程同时执行时只有一个真正准备词池"""
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        status, summary = prepare_day_pool(conn, day, daily_size, group_count)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
     
-    # 重新获取数据库连接（因为迁移函数中已关闭）
+    if summary:
+        invalidate_day_caches()
+    return status
+
+def initialize_today_words(daily_size=None, group_count=None):
+    """初始化今日学习单词
+
+    daily_size、group_count 默认取当前学习计划的每日单词数和分组数。
+    换日线程已经准备好词池时只需一次读取；否则在请求中准备（先处理以前未完成的任务）。
+    """
+    today = date.today()
     conn = get_db()
     
-    # 从master_vocabulary中随机选择60个unlearned状态的单词
-    unlearned_words = conn.execute('''
-        SELECT * FROM master_vocabulary 
-        WHERE status = 'unlearned' 
-        ORDER BY RANDOM() 
-        LIMIT 60
-    ''').fetchall()
-    
-    if len(unlearned_words) < 60:
-        conn.close()
-        return False  # 可用单词不足60个
-    
-    # 将这些单词状态改为learning
-    word_ids = [word['id'] for word in unlearned_words]
-    placeholders = ','.join(['?' for _ in word_ids])
-    conn.execute(f'''
-        UPDATE master_vocabulary 
-        SET status = 'learning' 
-        WHERE id IN ({placeholders})
-    ''', word_ids)
-    
-    # 分成3组，每组20个单词
-    for group_num in range(1, 4):
-        start_idx = (group_num - 1) * 20
-        end_idx = start_idx + 20
-        group_words = unlearned_words[start_idx:end_idx]
+    try:
+        # 检查今日是否已初始化
+        existing = conn.execute(POOL_COUNT_SQL, (today.isoformat(),)).fetchone()[0]
+        if existing > 0:
+            return False  # 已经初始化过
         
-        for word in group_words:
-            # 插入到daily_pool
-            cursor = conn.execute('''
-                INSERT INTO daily_pool (master_word_id, date, group_number)
-                VALUES (?, ?, ?)
-            ''', (word['id'], today, group_num))
-            daily_pool_id = cursor.lastrowid
-            
-            # 复制到4个学习表
-            word_data = (
-                daily_pool_id, word['word'], word['phonetic'], 
-                word['translation'], word['example_sentence']
-            )
-            
-            for table in ['daily_r1_recognition', 'daily_r2_spelling', 
-                         'daily_r3_listening', 'daily_r4_speaking']:
-                conn.execute(f'''
-                    INSERT INTO {table} 
-                    (daily_pool_id, word, phonetic, translation, example_sentence)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', word_data)
-    
-    conn.commit()
-    conn.close()
-    return True
+        return roll_over_day(conn, today, daily_size, group_count) in ('migrated', 'created')
+    finally:
+        conn.close()
+
+def learner_connections():
+    """换日时需要处理的数据库连接：单学习者模式为主数据库，多学习者模式为每个已有的学习者分片"""
+    if not app.config['MULTI_TENANT']:
+        yield DATABASE, get_db()
+        return
+    router = get_shard_router()
+    for learner_id in router.learner_ids():
+        yield learner_id, router.pool_for(learner_id).acquire()
+
+def roll_over_learners(date_str):
+    """换日线程的回调：为每个学习者准备 date_str 的学习词池"""
+    day = date.fromisoformat(date_str)
+    results = Counter()
+    try:
+        for scope, conn in learner_connections():
+            try:
+                results[roll_over_day(conn, day)] += 1
+            except Exception as e:
+                results['failed'] += 1
+                print(f"⚠️ 为 {scope} 准备 {date_str} 的词池时出错: {e}")
+            finally:
+                conn.close()
+    finally:
+        release_all_threads()
+        if _shard_router is not None:
+            _shard_router.release_thread()
+    print(f"🌅 {date_str} 换日完成: {dict(results)}")
+    return dict(results)
+
+rollover_worker = None
+rollover_worker_pid = None
+rollover_worker_lock = threading.Lock()
+
+def start_day_rollover():
+    """启动后台换日线程（每个进程一个；fork 出的子进程没有父进程的线程，按进程号重新启动）"""
+    global rollover_worker, rollover_worker_pid
+    with rollover_worker_lock:
+        if rollover_worker is None or rollover_worker_pid != os.getpid():
+            rollover_worker = DayRolloverWorker(roll_over_learners, app.config['DAY_ROLLOVER_TIME'],
+                                                lock_path=app.config['DAY_ROLLOVER_LOCK'])
+            rollover_worker_pid = os.getpid()
+            rollover_worker.start()
+    return rollover_worker
+
+@app.before_request
+def ensure_day_rollover():
+    """处理请求的进程都启动换日线程（debug 模式重载器的监视进程不处理请求，不会启动）"""
+    if app.config['DAY_ROLLOVER_WORKER'] and rollover_worker_pid != os.getpid():
+        start_day_rollover()
 
 def complete_daily_learning():
-    """完成今日学习，将词汇标记为learned并加入复习队列"""
+    """完成今日学习，将词汇标记为learned并加入复习队列
+
+    用几条集合操作语句一次完成，耗时与当日单词数量基本无关。
+    可以安全地重复执行：重复提交不会产生重复的学习记录或复习计划。
+    """
     today = date.today().isoformat()
+    next_review = (date.today() + timedelta(days=1)).isoformat()
     conn = get_db()
     
     try:
-        # 获取今日学习的所有单词
-        words_learned = conn.execute('''
-            SELECT DISTINCT dp.master_word_id, mv.word
-            FROM daily_pool dp
-            JOIN master_vocabulary mv ON dp.master_word_id = mv.id
-            WHERE dp.date = ?
-        ''', (today,)).fetchall()
+        conn.execute('BEGIN IMMEDIATE')
+        
+        # 更新master_vocabulary状态为learned
+        conn.execute(COMPLETE_LEARNED_SQL, (today,))
+        
+        # 插入学习记录（每个单词每天一条）
+        conn.execute(COMPLETE_RECORDS_SQL, (today,))
         
-        for word in words_learned:
-            master_word_id = word['master_word_id']
-            
-            # 更新master_vocabulary状态为learned
-            conn.execute('''
-                UPDATE master_vocabulary 
-                SET status = 'learned' 
-                WHERE id = ?
-            ''', (master_word_id,))
-            
-            # 插入学习记录
-            cursor = conn.execute('''
-                INSERT INTO learning_records (master_word_id, first_studied_at)
-                VALUES (?, ?)
-            ''', (master_word_id, today))
-            
-            learning_record_id = cursor.lastrowid
-            
-            # 加入复习队列（第一次复习间隔1天）
-            next_review = (date.today() + timedelta(days=1)).isoformat()
-            conn.execute('''
-                INSERT INTO review_queue 
-                (learning_record_id, master_word_id, next_review_date, review_interval)
-                VALUES (?, ?, ?, ?)
-            ''', (learning_record_id, master_word_id, next_review, 1))
+        # 加入复习队列（第一次复习间隔1天，每条学习记录一条；记忆状态由调度器在第一次复习时初始化）
+        cursor = conn.execute(COMPLETE_REVIEWS_SQL, (next_review, today, today, today))
         
         conn.commit()
-        print(f"完成今日学习，共{len(words_learned)}个单词加入复习队列")
+        print(f"完成今日学习，新增{cursor.rowcount}个单词加入复习队列")
         return True
         
     except Exception as e:
@@ -648,77 +654,42 @@ def complete_daily_learning():
     finally:
         conn.close()
 
-def get_review_words():
-    """获取今日需要复习的单词"""
-    today = date.today().isoformat()
-    conn = get_db()
-    
-    review_words = conn.execute('''
-        SELECT rq.*, mv.word, mv.phonetic, mv.translation, mv.example_sentence,
-               lr.first_studied_at
-        FROM review_queue rq
-        JOIN master_vocabulary mv ON rq.master_word_id = mv.id
-        JOIN learning_records lr ON rq.learning_record_id = lr.id
-        WHERE rq.next_review_date <= ?
-        ORDER BY rq.next_review_date, RANDOM()
-    ''', (today,)).fetchall()
-    
-    conn.close()
-    
-    return [{
-        'id': word['id'],
-        'master_word_id': word['master_word_id'],
-        'word': word['word'],
-        'phonetic': word['phonetic'],
-        'translation': word['translation'],
-        'example_sentence': word['example_sentence'],
-        'review_interval': word['review_interval'],
-        'first_studied_at': word['first_studied_at']
-    } for word in review_words]
+def review_item_json(row):
+    """复习项目的返回格式"""
+    return {
+        'id': row['id'],
+        'master_word_id': row['master_word_id'],
+        'word': row['word'],
+        'phonetic': row['phonetic'],
+        'translation': row['translation'],
+        'example_sentence': row['example_sentence'],
+        'review_interval': row['review_interval'],
+        'first_studied_at': row['first_studied_at']
+    }
+
+def get_review_scheduler():
+    """按配置创建复习调度器"""
+    return get_scheduler(app.config['REVIEW_SCHEDULER'], **app.config['REVIEW_SCHEDULER_PARAMS'])
 
-def update_review_schedule(review_id, success):
-    """更新复习计划"""
+def update_review_schedule(review_id, success, grade=None):
+    """更新复习计划：由调度器根据复习结果更新记忆状态和下次复习日期"""
     conn = get_db()
     
-    # 获取当前复习记录
-    review = conn.execute(
-        'SELECT * FROM review_queue WHERE id = ?', (review_id,)
-    ).fetchone()
-    
-    if not review:
-        conn.close()
+    try:
+        rating = rating_from_result(success, grade)
+        interval = review_item(conn, get_review_scheduler(), review_id, rating,
+                               balance=app.config['REVIEW_LOAD_BALANCE'])
+        if interval is None:
+            return False
+        release_lease(conn, review_id)
+        conn.commit()
+        return True
+    except Exception as e:
+        conn.rollback()
+        print(f"更新复习计划时出错: {e}")
         return False
-    
-    current_interval = review['review_interval']
-    
-    if success:
-        # 复习成功，增加间隔（艾宾浩斯间隔：1, 2, 4, 7, 15, 30天）
-        interval_map = {1: 2, 2: 4, 4: 7, 7: 15, 15: 30, 30: 60}
-        new_interval = interval_map.get(current_interval, 60)
-        
-        if new_interval >= 60:
-            # 间隔达到60天，认为已经长期记忆，删除复习记录
-            conn.execute('DELETE FROM review_queue WHERE id = ?', (review_id,))
-        else:
-            # 更新下次复习时间
-            next_review = (date.today() + timedelta(days=new_interval)).isoformat()
-            conn.execute('''
-                UPDATE review_queue 
-                SET next_review_date = ?, review_interval = ?
-                WHERE id = ?
-            ''', (next_review, new_interval, review_id))
-    else:
-        # 复习失败，重置为1天后复习
-        next_review = (date.today() + timedelta(days=1)).isoformat()
-        conn.execute('''
-            UPDATE review_queue 
-            SET next_review_date = ?, review_interval = 1
-            WHERE id = ?
-        ''', (next_review, review_id))
-    
-    conn.commit()
-    conn.close()
-    return True
+    finally:
+        conn.close()
 
 @app.route('/')
 def index():
@@ -730,9 +701,7 @@ def today_status():
     conn = get_db()
     
     # 检查今日是否已初始化
-    pool_count = conn.execute(
-        'SELECT COUNT(*) FROM daily_pool WHERE date = ?', (today,)
-    ).fetchone()[0]
+    pool_count = conn.execute(POOL_COUNT_SQL, (today,)).fetchone()[0]
     
     if pool_count == 0:
         conn.close()
@@ -742,16 +711,14 @@ def today_status():
         })
     
     # 检查学习进度
-    progress = conn.execute(
-        'SELECT * FROM daily_progress WHERE date = ?', (today,)
-    ).fetchone()
+    progress = conn.execute(PROGRESS_SQL, (today,)).fetchone()
     
     conn.close()
     
     if progress is None:
         return jsonify({
             'initialized': True,
-            'message': '今日单词已准备完毕，共60个单词分为3组'
+            'message': f'今日单词已准备完毕，共{pool_count}个单词分为{get_session_plan().group_count}组'
         })
     else:
         return jsonify({
@@ -787,7 +754,18 @@ def learning_progress():
         'current_dimension': progress['current_dimension'],
         'current_round': progress['current_round'],
         'stage_description': stage_description,
-        'completed_stages': progress['completed_stages']
+        'completed_stages': progress['completed_stages'],
+        'stages': get_session_plan().outline(),
+        'stage_index': get_session_plan().stage_position(progress['current_stage'])
+    })
+
+@app.route('/api/cache_stats')
+def cache_stats():
+    """缓存命中统计"""
+    return jsonify({
+        'progress': progress_cache.stats(),
+        'history': history_memo.stats(),
+        'day_rollover': rollover_worker.stats() if rollover_worker is not None else None
     })
 
 @app.route('/start_auto_learning')
@@ -850,6 +828,7 @@ def complete_current_phase():
         'next_group': progress['current_group'],
         'next_dimension': progress['current_dimension'],
         'stage_description': stage_description,
+        'stage_index': get_session_plan().stage_position(progress['current_stage']),
         'is_completed': progress['current_stage'] == 'completed'
     })
 
@@ -858,7 +837,7 @@ def learning_page(dimension, group):
     if dimension not in ['recognition', 'spelling', 'listening', 'speaking']:
         return "维度不支持", 400
     
-    if group not in [1, 2, 3]:
+    if not 1 <= group <= get_session_plan().group_count:
         return "组别无效", 400
     
     return render_template('learning.html', dimension=dimension, group=group)
@@ -867,30 +846,14 @@ def learning_page(dimension, group):
 def get_words(dimension, group):
     """获取指定组和维度的单词"""
     today = date.today().isoformat()
-    conn = get_db()
-    
-    # 根据维度确定表名
-    table_map = {
-        'recognition': 'daily_r1_recognition',
-        'spelling': 'daily_r2_spelling',
-        'listening': 'daily_r3_listening',
-        'speaking': 'daily_r4_speaking'
-    }
     
-    if dimension not in table_map:
-        conn.close()
+    if dimension not in DIMENSIONS:
         return jsonify({'error': '不支持的维度'}), 400
     
-    table_name = table_map[dimension]
+    conn = get_db()
     
-    # 获取指定组的未掌握单词
-    words = conn.execute(f'''
-        SELECT lr.*, dp.group_number
-        FROM {table_name} lr
-        JOIN daily_pool dp ON lr.daily_pool_id = dp.id
-        WHERE dp.date = ? AND dp.group_number = ? AND lr.is_mastered = 0
-        ORDER BY lr.id
-    ''', (today, group)).fetchall()
+    # 获取指定组的未掌握单词（id 为 daily_pool_id，配合维度定位掌握状态）
+    words = conn.execute(GROUP_WORDS_SQL, (DIMENSIONS[dimension], today, group)).fetchall()
     
     conn.close()
     
@@ -902,6 +865,82 @@ def get_words(dimension, group):
         'example_sentence': word['example_sentence']
     } for word in words])
 
+@app.route('/api/session_bundle')
+def session_bundle():
+    """今日学习数据包：全部单词 + 各维度掌握位图；带 since 参数时只返回变化部分"""
+    today = date.today().isoformat()
+    conn = get_db()
+    bundle = build_bundle(conn, today, DIMENSIONS, cache_scope(), request.args.get('since'))
+    conn.close()
+    
+    response = jsonify(bundle)
+    response.headers['Cache-Control'] = 'private, no-store'
+    return response
+
+# 答题动作对应写入的掌握状态：1掌握了（可重置），2我会这个（不可重置），None不修改
+ANSWER_ACTIONS = {
+    'mastered': 1,
+    'skip': 2,
+    'not_mastered': None
+}
+
+# 由服务端评分决定能否记为掌握的维度：用户输入的答案可以和标准答案比较
+GRADED_DIMENSIONS = {'spelling'}
+
+def parse_answer_events(events):
+    """校验答题事件列表，返回 [(daily_pool_id, 维度, 动作, 答案)]；有无效事件时返回None
+    答案只在需要评分的维度上使用，可以省略"""
+    if not isinstance(events, list):
+        return None
+    
+    parsed = []
+    for event in events:
+        if not isinstance(event, dict):
+            return None
+        word_id = event.get('word_id')
+        dimension = event.get('dimension')
+        action = event.get('action')
+        answer = event.get('answer')
+        if not isinstance(word_id, int) or dimension not in DIMENSIONS or action not in ANSWER_ACTIONS:
+            return None
+        if answer is not None and not isinstance(answer, str):
+            return None
+        parsed.append((word_id, dimension, action, answer))
+    return parsed
+
+def enforce_answer_grades(conn, events):
+    """按服务端评分修正答题事件，返回 ([(daily_pool_id, 维度编号, 动作)], 被拒绝的事件)
+    需要评分的维度上，没有给出答案或答案不正确的“掌握了”改为未掌握，并在被拒绝的事件中返回
+    {word_id, dimension, error}，由页面同步本地状态并提示；“我会这个”由用户自行声明，不评分"""
+    pool_ids = {word_id for word_id, dimension, action, _ in events
+                if action == 'mastered' and dimension in GRADED_DIMENSIONS}
+    words = load_grading_words(conn, 'daily_pool', pool_ids)
+    
+    enforced, rejected = [], []
+    for word_id, dimension, action, answer in events:
+        if action == 'mastered' and dimension in GRADED_DIMENSIONS:
+            word = words.get(word_id)
+            error = None
+            if not word:
+                error = '单词不存在'
+            elif answer is None:
+                error = '缺少答案，无法评分'
+            elif not grade_answer(answer, expected_answers(dimension, word))['correct']:
+                error = '答案未通过评分'
+            if error:
+                action = 'not_mastered'
+                rejected.append({'word_id': word_id, 'dimension': dimension, 'error': error})
+        enforced.append((word_id, DIMENSIONS[dimension], action))
+    return enforced, rejected
+
+def apply_answer_events(conn, events):
+    """按顺序应用一批答题事件（调用方负责事务），返回写入的事件数"""
+    updates = [(ANSWER_ACTIONS[action], word_id, dimension)
+               for word_id, dimension, action in events
+               if ANSWER_ACTIONS[action] is not None]
+    conn.executemany(MARK_WORD_SQL, updates)
+    return len(updates)
+
 @app.route('/api/mark_word', methods=['POST'])
 def mark_word():
     """标记单词掌握状态"""
@@ -909,30 +948,110 @@ def mark_word():
     word_id = data.get('word_id')
     dimension = data.get('dimension')
     mastered = data.get('mastered', False)
+    answer = data.get('answer')
     
     if not word_id or not dimension:
         return jsonify({'error': '参数不完整'}), 400
     
-    table_map = {
-        'recognition': 'daily_r1_recognition',
-        'spelling': 'daily_r2_spelling',
-        'listening': 'daily_r3_listening',
-        'speaking': 'daily_r4_speaking'
-    }
-
-    if dimension not in table_map:
+    if dimension not in DIMENSIONS:
         return jsonify({'error': '不支持的维度'}), 400
     
+    if answer is not None and not isinstance(answer, str):
+        return jsonify({'error': '答案格式错误'}), 400
+    
     conn = get_db()
     
-    if mastered:
-        # 如果掌握了，标记为已掌握状态1（可重置）
-        conn.execute(f'UPDATE {table_map[dimension]} SET is_mastered = 1 WHERE id = ?', (word_id,))
+    # 如果掌握了，标记为已掌握状态1（可重置）；写（汉译英）需要答案通过服务端评分
+    events, rejected = enforce_answer_grades(
+        conn, [(word_id, dimension, 'mastered' if mastered else 'not_mastered', answer)]
+    )
+    apply_answer_events(conn, events)
     
     conn.commit()
     conn.close()
     
-    return jsonify({'success': True})
+    return jsonify({'success': True, 'rejected': rejected})
+
+@app.route('/api/submit_answers', methods=['POST'])
+def submit_answers():
+    """批量提交答题事件（掌握/未掌握/跳过），在一个事务内按顺序应用"""
+    # sendBeacon 在页面卸载时以 text/plain 发送，因此忽略 Content-Type
+    data = request.get_json(force=True, silent=True) or {}
+    events = parse_answer_events(data.get('events'))
+    
+    if events is None:
+        return jsonify({'error': '答题事件格式错误'}), 400
+    
+    conn = get_db()
+    
+    try:
+        enforced, rejected = enforce_answer_grades(conn, events)
+        applied = apply_answer_events(conn, enforced)
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        return jsonify({'error': f'提交失败: {str(e)}'}), 500
+    finally:
+        conn.close()
+    
+    return jsonify({'success': True, 'received': len(events), 'applied': applied, 'rejected': rejected})
+
+# 一次评分请求最多包含的答案数
+MAX_GRADE_BATCH = 200
+
+def expected_answers(dimension, word):
+    """某个维度下可接受的标准答案：认识（英译中）按释义逐个比较，其余维度比较英文拼写"""
+    if dimension == 'recognition':
+        return split_meanings(word['translation']) or [word['translation'] or '']
+    return word['word']
+
+def load_grading_words(conn, table, ids):
+    """按 daily_pool 或 review_queue 的 id 批量取出单词，返回 {id: row}"""
+    if not ids:
+        return {}
+    rows = conn.execute(grading_words_query(table, len(ids)), list(ids)).fetchall()
+    return {row['id']: row for row in rows}
+
+@app.route('/api/grade_answers', methods=['POST'])
+def grade_answers():
+    """批量评分：标准答案由服务端查出，返回每个答案的相似度和错误类型
+    每项为 {word_id, dimension, answer}（今日学习，word_id 为 daily_pool_id）
+    或 {review_id, answer}（复习，按英译中评分）"""
+    data = request.get_json(silent=True) or {}
+    answers = data.get('answers')
+    
+    if not isinstance(answers, list) or not answers:
+        return jsonify({'error': '参数不完整'}), 400
+    if len(answers) > MAX_GRADE_BATCH:
+        return jsonify({'error': f'一次最多评分{MAX_GRADE_BATCH}个答案'}), 400
+    
+    # 校验时记下每项的类型，后面按同一结果取单词：(表名, id, 维度, 答案)
+    items = []
+    for item in answers:
+        if not isinstance(item, dict) or not isinstance(item.get('answer', ''), str):
+            return jsonify({'error': '答案格式错误'}), 400
+        if isinstance(item.get('review_id'), int):
+            items.append(('review_queue', item['review_id'], 'recognition', item.get('answer', '')))
+        elif isinstance(item.get('word_id'), int) and item.get('dimension') in DIMENSIONS:
+            items.append(('daily_pool', item['word_id'], item['dimension'], item.get('answer', '')))
+        else:
+            return jsonify({'error': '答案格式错误'}), 400
+    
+    conn = get_db()
+    words = {table: load_grading_words(conn, table, {word_id for t, word_id, _, _ in items if t == table})
+             for table in ('daily_pool', 'review_queue')}
+    conn.close()
+    
+    pairs = []
+    for table, word_id, dimension, answer in items:
+        word = words[table].get(word_id)
+        pairs.append((answer, expected_answers(dimension, word) if word else None))
+    
+    graded = iter(grade_batch([pair for pair in pairs if pair[1] is not None]))
+    # 找不到对应单词的答案返回None，其余按请求顺序返回
+    results = [next(graded) if expected is not None else None for _, expected in pairs]
+    
+    return jsonify({'success': True, 'results': results})
 
 @app.route('/api/reset_group_progress', methods=['POST'])
 def reset_group_progress():
@@ -944,14 +1063,7 @@ def reset_group_progress():
     if not group or not dimension:
         return jsonify({'error': '参数不完整'}), 400
     
-    table_map = {
-        'recognition': 'daily_r1_recognition',
-        'spelling': 'daily_r2_spelling',
-        'listening': 'daily_r3_listening',
-        'speaking': 'daily_r4_speaking'
-    }
-    
-    if dimension not in table_map:
+    if dimension not in DIMENSIONS:
         return jsonify({'error': '不支持的维度'}), 400
     
     today = date.today().isoformat()
@@ -959,15 +1071,9 @@ def reset_group_progress():
     
     try:
         # 重置指定组和维度的单词掌握状态，只重置状态1（掌握了），不重置状态2（我会这个）
-        table_name = table_map[dimension]
-        conn.execute(f'''
-            UPDATE {table_name} SET is_mastered = 0
-            WHERE daily_pool_id IN (
-                SELECT id FROM daily_pool WHERE date = ? AND group_number = ?
-            ) AND is_mastered = 1
-        ''', (today, group))
+        cursor = conn.execute(RESET_ROUND_SQL, (DIMENSIONS[dimension], today, group))
         
-        affected_rows = conn.cursor.rowcount
+        affected_rows = cursor.rowcount
         conn.commit()
         conn.close()
         
@@ -983,7 +1089,7 @@ def reset_group_progress():
 
 @app.route('/api/skip_word', methods=['POST'])
 def skip_word():
-    """跳过单词（我会这个）- 从当前维度表中删除"""
+    """跳过单词（我会这个）- 在当前维度标记为不可重置的已掌握"""
     data = request.json
     word_id = data.get('word_id')
     dimension = data.get('dimension')
@@ -991,20 +1097,13 @@ def skip_word():
     if not word_id or not dimension:
         return jsonify({'error': '参数不完整'}), 400
     
-    table_map = {
-        'recognition': 'daily_r1_recognition',
-        'spelling': 'daily_r2_spelling',
-        'listening': 'daily_r3_listening',
-        'speaking': 'daily_r4_speaking'
-    }
-    
-    if dimension not in table_map:
+    if dimension not in DIMENSIONS:
         return jsonify({'error': '不支持的维度'}), 400
     
     conn = get_db()
     
     # 跳过单词（我会这个）- 标记为已掌握状态2（不可重置）
-    conn.execute(f'UPDATE {table_map[dimension]} SET is_mastered = 2 WHERE id = ?', (word_id,))
+    apply_answer_events(conn, [(word_id, DIMENSIONS[dimension], 'skip')])
     
     conn.commit()
     conn.close()
@@ -1016,26 +1115,136 @@ def review_page():
     """复习页面"""
     return render_template('review.html')
 
+# 复习单词每页的默认数量和上限
+REVIEW_PAGE_SIZE = 50
+MAX_REVIEW_PAGE_SIZE = 200
+
+def get_review_queue(conn):
+    """返回当前数据范围今天的复习优先级队列，跨天、首次使用或有项目在今天新到期（其他进程写入）时重建"""
+    scope = cache_scope()
+    today = date.today().isoformat()
+    due_version = read_due_version(conn)
+    with review_queues_lock:
+        queue = review_queues.get(scope)
+        if (queue is None or queue.today != today or queue.due_version != due_version
+                or queue.daily_cap != app.config['REVIEW_DAILY_CAP']):
+            queue = review_queues[scope] = ReviewPriorityQueue.build(conn, today, app.config['REVIEW_DAILY_CAP'])
+            while len(review_queues) > MAX_REVIEW_QUEUES:
+                review_queues.popitem(last=False)
+        else:
+            review_queues.move_to_end(scope)
+    return queue
+
+@app.route('/api/review_next')
+def review_next():
+    """按优先级（最接近遗忘的优先）返回接下来要复习的单词，count 默认10，受每日复习上限限制"""
+    count = max(1, min(request.args.get('count', 10, type=int), MAX_REVIEW_PAGE_SIZE))
+    
+    conn = get_db()
+    queue = get_review_queue(conn)
+    rows = load_review_items(conn, queue.take(conn, count))
+    stats = queue.stats(conn)
+    conn.close()
+    
+    return jsonify(dict(stats, items=[review_item_json(row) for row in rows]))
+
 @app.route('/api/review_words')
 def api_get_review_words():
-    """获取今日需要复习的单词"""
-    words = get_review_words()
-    return jsonify(words)
+    """获取今日需要复习的单词（按到期日期从早到晚，同一天内按种子洗牌）
+    - 分页：?limit=50&cursor=...，第一页可指定 seed 使顺序可复现，返回 next_cursor
+    - 流式：?format=ndjson，每行一个单词，逐批读取数据库，第一行为 {"seed", "total"}"""
+    today = date.today().isoformat()
+    cursor = request.args.get('cursor')
+    seed = request.args.get('seed', type=int)
+    
+    if cursor and decode_cursor(cursor) is None:
+        return jsonify({'error': '无效的翻页游标'}), 400
+    
+    if request.args.get('format') == 'ndjson':
+        return stream_review_words(today, cursor, seed)
+    
+    limit = max(1, min(request.args.get('limit', REVIEW_PAGE_SIZE, type=int), MAX_REVIEW_PAGE_SIZE))
+    conn = get_db()
+    rows, next_cursor, seed = fetch_page(conn, today, limit, cursor, seed)
+    # 总数只在第一页返回
+    total = count_due(conn, today) if not cursor else None
+    conn.close()
+    
+    return jsonify({
+        'items': [review_item_json(row) for row in rows],
+        'next_cursor': next_cursor,
+        'seed': seed,
+        'total': total
+    })
+
+def stream_review_words(today, cursor, seed):
+    """以 NDJSON 流式返回从 cursor 开始的全部到期单词"""
+    decoded = decode_cursor(cursor) if cursor else None
+    if decoded:
+        seed = decoded[0]
+    elif seed is None:
+        seed = new_seed()
+    
+    def generate():
+        conn = get_db()
+        try:
+            yield json.dumps({'seed': seed, 'total': count_due(conn, today)}) + '\n'
+            for row in iter_due_reviews(conn, today, seed, decoded):
+                yield json.dumps(review_item_json(row), ensure_ascii=False) + '\n'
+        finally:
+            conn.close()
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+# 复习负荷预测最多的天数
+MAX_FORECAST_DAYS = 365
+
+@app.route('/api/review_forecast')
+def review_forecast():
+    """未来 N 天每天到期的复习数量（第0天为今天，包含已过期的单词）"""
+    days = request.args.get('days', 14, type=int)
+    days = max(1, min(days, MAX_FORECAST_DAYS))
+    
+    conn = get_db()
+    counts = forecast(conn, days)
+    conn.close()
+    
+    return jsonify({
+        'start': date.today().isoformat(),
+        'days': days,
+        'counts': counts,
+        'total': sum(counts),
+        'peak': max(counts)
+    })
 
 @app.route('/api/review_word', methods=['POST'])
 def review_word():
-    """复习单词结果"""
+    """复习单词结果；没有给出 success 而给出了 answer 时，由服务端评分决定是否复习成功"""
     data = request.json
     review_id = data.get('review_id')
-    success = data.get('success', False)
+    success = data.get('success')
+    answer = data.get('answer')
     
     if not review_id:
         return jsonify({'error': '参数不完整'}), 400
     
-    result = update_review_schedule(review_id, success)
+    grade = None
+    if isinstance(answer, str):
+        conn = get_db()
+        word = load_grading_words(conn, 'review_queue', [review_id]).get(review_id)
+        conn.close()
+        if word:
+            grade = grade_answer(answer, expected_answers('recognition', word))
+            if success is None:
+                success = grade['correct']
+    
+    result = update_review_schedule(review_id, bool(success), grade)
     
     if result:
-        return jsonify({'success': True})
+        queue = review_queues.get(cache_scope())
+        if queue is not None:
+            queue.complete(review_id)
+        return jsonify({'success': True, 'grade': grade})
     else:
         return jsonify({'error': '更新复习计划失败'}), 500
 
@@ -1044,48 +1253,70 @@ def history_page():
     """历史记录页面"""
     return render_template('history.html')
 
+# 已结束且学习完成的日期只会因单词内容修改而变化，浏览器可短时间直接使用缓存，之后按 ETag 协商
+CLOSED_DAY_CACHE_CONTROL = 'private, max-age=300'
+REVALIDATE_CACHE_CONTROL = 'private, no-cache'
+# 多学习者模式下同一地址按 Cookie 或请求头区分学习者，浏览器缓存也要按这些请求头区分
+LEARNER_VARY_HEADERS = ('Cookie', 'X-Learner-Id')
+
+def conditional_response(body, etag, last_modified, cache_control):
+    """返回带 ETag/Last-Modified 的 JSON 响应，客户端缓存仍有效时返回 304"""
+    response = app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    response.headers['Cache-Control'] = cache_control
+    response.vary.update(LEARNER_VARY_HEADERS)
+    return response.make_conditional(request)
+
+def history_version(conn):
+    """某天历史记录的版本号；多学习者模式下单词内容在共享词库中，同时校验共享词库的版本号"""
+    version = read_cache_version(conn, 'history')
+    if app.config['MULTI_TENANT']:
+        row = conn.execute("SELECT version FROM vocab.cache_versions WHERE name = 'vocabulary'").fetchone()
+        return version, row[0] if row else 0
+    return version
+
 @app.route('/api/history_dates')
 def get_history_dates():
     """获取所有有学习记录的日期"""
+    today = date.today().isoformat()
     conn = get_db()
     
-    dates = conn.execute('''
-        SELECT DISTINCT date FROM daily_pool 
-        ORDER BY date DESC
-    ''').fetchall()
+    # 历史日期列表只会因今天以前的数据变化或今天词池的创建/删除而变化
+    version = (
+        read_cache_version(conn, 'history'),
+        conn.execute(HISTORY_DAY_EXISTS_SQL, (today,)).fetchone() is not None,
+        today
+    )
+    key = (cache_scope(), 'dates')
+    cached = history_memo.get(key, version)
+    if cached is None:
+        dates = conn.execute(HISTORY_DATES_SQL).fetchall()
+        cached = history_memo.put(key, version,
+                                  [{'date': row['date'], 'word_count': row['word_count']} for row in dates],
+                                  REVALIDATE_CACHE_CONTROL)
     
     conn.close()
     
-    return jsonify([{'date': date['date']} for date in dates])
+    return conditional_response(*cached)
 
-@app.route('/api/history/<date>')
-def get_history_by_date(date):
-    """获取指定日期的学习历史"""
-    conn = get_db()
+def build_history(conn, date_str):
+    """查询指定日期的学习历史"""
+    # 一次查询取出所有组的词汇
+    words = conn.execute(HISTORY_WORDS_SQL, (date_str,)).fetchall()
     
     # 获取该日期的词汇按组分类
-    groups_data = {}
-    for group_num in [1, 2, 3]:
-        # 获取该组的词汇
-        words = conn.execute('''
-            SELECT mv.word, mv.phonetic, mv.translation, mv.example_sentence
-            FROM daily_pool dp
-            JOIN master_vocabulary mv ON dp.master_word_id = mv.id
-            WHERE dp.date = ? AND dp.group_number = ?
-            ORDER BY mv.word
-        ''', (date, group_num)).fetchall()
-        
-        groups_data[f'group_{group_num}'] = [{
+    groups_data = {f'group_{group_num}': [] for group_num in range(1, get_session_plan().group_count + 1)}
+    for word in words:
+        groups_data.setdefault(f'group_{word["group_number"]}', []).append({
             'word': word['word'],
             'phonetic': word['phonetic'],
             'translation': word['translation'],
             'example_sentence': word['example_sentence']
-        } for word in words]
+        })
     
     # 获取学习进度信息
-    progress = conn.execute('''
-        SELECT * FROM daily_progress WHERE date = ?
-    ''', (date,)).fetchone()
+    progress = conn.execute(PROGRESS_SQL, (date_str,)).fetchone()
     
     progress_info = None
     if progress:
@@ -1096,20 +1327,105 @@ def get_history_by_date(date):
             'completed_stages': json.loads(progress['completed_stages'] or '[]')
         }
     
-    conn.close()
-    
-    return jsonify({
-        'date': date,
+    return {
+        'date': date_str,
         'groups': groups_data,
         'progress': progress_info,
-        'total_words': sum(len(words) for words in groups_data.values())
-    })
+        'total_words': len(words)
+    }
+
+@app.route('/api/history/<date>')
+def get_history_by_date(date):
+    """获取指定日期的学习历史（今天以前的日期使用响应缓存）"""
+    today = datetime.now().date().isoformat()
+    conn = get_db()
+    
+    if date >= today:
+        # 今天的数据仍在变化，每次重新查询，只用 ETag 节省传输
+        payload = build_history(conn, date)
+        conn.close()
+        return conditional_response(*make_entry(payload, REVALIDATE_CACHE_CONTROL))
+    
+    version = history_version(conn)
+    key = (cache_scope(), date)
+    cached = history_memo.get(key, version)
+    if cached is None:
+        payload = build_history(conn, date)
+        # 未完成的日期仍可能被迁移到之后的日期，只能协商缓存；已完成或已退回单词的日期不再变化
+        closed = payload['progress'] is not None and payload['progress']['current_stage'] in ('completed', RELEASED)
+        cached = history_memo.put(key, version, payload,
+                                  CLOSED_DAY_CACHE_CONTROL if closed else REVALIDATE_CACHE_CONTROL)
+    conn.close()
+    
+    return conditional_response(*cached)
 
 @app.route('/word_management')
 def word_management_page():
     """单词管理页面"""
     return render_template('word_management.html')
 
+def get_search_index(conn):
+    """返回共享词库的单词搜索索引，并加载新增的单词"""
+    scope = vocabulary_scope()
+    with search_indexes_lock:
+        index = search_indexes.get(scope)
+        if index is None:
+            index = search_indexes[scope] = WordSearchIndex()
+            while len(search_indexes) > MAX_SEARCH_INDEXES:
+                search_indexes.popitem(last=False)
+        else:
+            search_indexes.move_to_end(scope)
+    index.refresh(conn)
+    return index
+
+def describe_words(conn, entries):
+    """补充单词的翻译，保持 entries 的顺序"""
+    ids = [word_id for word_id, _ in entries]
+    if not ids:
+        return {}
+    rows = conn.execute(suggestion_details_query(len(ids)), ids).fetchall()
+    return {row['id']: row for row in rows}
+
+@app.route('/api/word_suggestions')
+def word_suggestions():
+    """单词联想：前缀补全（分页）+ 拼写相近的单词"""
+    query = request.args.get('q', '').strip()
+    page = max(request.args.get('page', 1, type=int), 1)
+    page_size = min(max(request.args.get('page_size', 10, type=int), 1), 50)
+    
+    if not query:
+        return jsonify({'error': '请输入单词'}), 400
+    
+    conn = get_db()
+    index = get_search_index(conn)
+    
+    entries, total = index.prefix(query, (page - 1) * page_size, page_size)
+    # 只在第一页且没有精确匹配时给出“您是不是要找”
+    fuzzy = index.fuzzy(query) if page == 1 and not index.lookup(query) else []
+    
+    details = describe_words(conn, entries + [entry for _, entry in fuzzy])
+    conn.close()
+    
+    def describe(entry):
+        word_id, word = entry
+        row = details.get(word_id)
+        return {
+            'id': word_id,
+            'word': word,
+            'translation': (row['translation'] or '') if row else '',
+            'status': row['status'] if row else None
+        }
+    
+    return jsonify({
+        'query': query,
+        'page': page,
+        'page_size': page_size,
+        'total': total,
+        'has_more': page * page_size < total,
+        'items': [describe(entry) for entry in entries],
+        'did_you_mean': [dict(describe(entry), distance=distance) for distance, entry in fuzzy]
+    })
+
 @app.route('/api/search_word', methods=['POST'])
 def search_word():
     """搜索单词"""
@@ -1122,9 +1438,7 @@ def search_word():
     conn = get_db()
     
     # 搜索单词（不区分大小写）
-    result = conn.execute(
-        'SELECT * FROM master_vocabulary WHERE LOWER(word) = ?', (word,)
-    ).fetchone()
+    result = conn.execute(SEARCH_WORD_SQL, (word,)).fetchone()
     
     conn.close()
     
@@ -1141,7 +1455,52 @@ def search_word():
             }
         })
     else:
-        return jsonify({'found': False})
+        conn = get_db()
+        did_you_mean = [entry[1] for _, entry in get_search_index(conn).fuzzy(word, limit=5)]
+        conn.close()
+        return jsonify({
+            'found': False,
+            'did_you_mean': did_you_mean
+        })
+
+@app.route('/api/search_fulltext')
+def search_fulltext_api():
+    """按中文释义、例句或单词片段检索，按相关度排序，cursor 为上一页返回的 next_cursor"""
+    query = request.args.get('q', '').strip()
+    limit = min(max(request.args.get('limit', 20, type=int), 1), 50)
+    cursor = request.args.get('cursor')
+    
+    if not query:
+        return jsonify({'error': '请输入要检索的内容'}), 400
+    
+    conn = get_db()
+    rows, next_cursor = search_fulltext(conn, query, limit, cursor)
+    conn.close()
+    
+    return jsonify({
+        'query': query,
+        'items': [{
+            'id': row['id'],
+            'word': row['word'],
+            'phonetic': row['phonetic'] or '',
+            'translation': row['translation'] or '',
+            'example_sentence': row['example_sentence'] or '',
+            'status': row['status'],
+            'translation_snippet': row['translation_snippet'] or '',
+            'example_snippet': row['example_snippet'] or ''
+        } for row in rows],
+        'next_cursor': next_cursor
+    })
+
+@app.route('/api/word_detail/<path:word>')
+def word_detail(word):
+    """获取单词的完整词典详情（例句、真题例句、短语、同近义词等）"""
+    detail = word_detail_index.get_detail(word.strip())
+    
+    if detail is None:
+        return jsonify({'found': False}), 404
+    
+    return jsonify({'found': True, 'detail': detail})
 
 @app.route('/api/add_word_to_today', methods=['POST'])
 def add_word_to_today():
@@ -1176,16 +1535,14 @@ def add_word_to_today():
             return jsonify({'error': '该单词已在今日学习列表中'}), 400
         
         # 获取今日已有的组数，确定新单词放在哪一组
-        group_counts = conn.execute(
-            'SELECT group_number, COUNT(*) as count FROM daily_pool WHERE date = ? GROUP BY group_number ORDER BY group_number',
-            (today,)
-        ).fetchall()
+        group_counts = conn.execute(GROUP_COUNTS_SQL, (today,)).fetchall()
         
-        # 找到单词数最少的组，如果没有组或每组都满20个，创建新组
+        # 找到单词数最少的组，如果没有组或每组都满了，创建新组
+        _, _, group_size = get_daily_plan_size()
         target_group = 1
         if group_counts:
             for group_num, count in group_counts:
-                if count < 20:
+                if count < group_size:
                     target_group = group_num
                     break
             else:
@@ -1197,22 +1554,9 @@ def add_word_to_today():
             'INSERT INTO daily_pool (master_word_id, date, group_number) VALUES (?, ?, ?)',
             (word_id, today, target_group)
         )
-        daily_pool_id = cursor.lastrowid
         
-        # 插入到各个学习维度表
-        word_data = (
-            daily_pool_id, word['word'], word['phonetic'], 
-            word['translation'], word['example_sentence']
-        )
-        
-        learning_tables = ['daily_r1_recognition', 'daily_r2_spelling', 
-                         'daily_r3_listening', 'daily_r4_speaking']
-        for table in learning_tables:
-            conn.execute(f'''
-                INSERT INTO {table} 
-                (daily_pool_id, word, phonetic, translation, example_sentence)
-                VALUES (?, ?, ?, ?, ?)
-            ''', word_data)
+        # 创建各个学习维度的掌握状态
+        create_word_states(conn, [cursor.lastrowid])
         
         # 更新master_vocabulary状态为learning
         conn.execute(
@@ -1245,6 +1589,9 @@ def create_and_add_word():
     if not word or not translation:
         return jsonify({'error': '单词和翻译为必填项'}), 400
     
+    if app.config['MULTI_TENANT']:
+        return jsonify({'error': '多学习者模式下共享词库为只读，请把新单词导入共享词库'}), 400
+    
     today = date.today().isoformat()
     conn = get_db()
     
@@ -1266,15 +1613,13 @@ def create_and_add_word():
         word_id = cursor.lastrowid
         
         # 获取今日已有的组数，确定新单词放在哪一组
-        group_counts = conn.execute(
-            'SELECT group_number, COUNT(*) as count FROM daily_pool WHERE date = ? GROUP BY group_number ORDER BY group_number',
-            (today,)
-        ).fetchall()
+        group_counts = conn.execute(GROUP_COUNTS_SQL, (today,)).fetchall()
         
+        _, _, group_size = get_daily_plan_size()
         target_group = 1
         if group_counts:
             for group_num, count in group_counts:
-                if count < 20:
+                if count < group_size:
                     target_group = group_num
                     break
             else:
@@ -1285,23 +1630,18 @@ def create_and_add_word():
             'INSERT INTO daily_pool (master_word_id, date, group_number) VALUES (?, ?, ?)',
             (word_id, today, target_group)
         )
-        daily_pool_id = cursor.lastrowid
         
-        # 插入到各个学习维度表
-        word_data = (daily_pool_id, word, phonetic, translation, example_sentence)
-        
-        learning_tables = ['daily_r1_recognition', 'daily_r2_spelling', 
-                         'daily_r3_listening', 'daily_r4_speaking']
-        for table in learning_tables:
-            conn.execute(f'''
-                INSERT INTO {table} 
-                (daily_pool_id, word, phonetic, translation, example_sentence)
-                VALUES (?, ?, ?, ?, ?)
-            ''', word_data)
+        # 创建各个学习维度的掌握状态
+        create_word_states(conn, [cursor.lastrowid])
         
         conn.commit()
         conn.close()
         
+        # 增量加入搜索索引（索引尚未建立时会在首次使用时加载）
+        index = search_indexes.get(vocabulary_scope())
+        if index is not None:
+            index.add(word_id, word)
+        
         return jsonify({
             'success': True, 
             'message': f'新单词 "{word}" 已创建并添加到今日学习（第{target_group}组）'
@@ -1318,17 +1658,7 @@ def get_today_words():
     today = date.today().isoformat()
     conn = get_db()
     
-    words = conn.execute('''
-        SELECT dp.id as daily_pool_id, dp.group_number, mv.id as master_id, 
-               mv.word, mv.phonetic, mv.translation, mv.example_sentence,
-               -- 检查各维度是否还有未掌握的单词
-               CASE WHEN EXISTS(SELECT 1 FROM daily_r1_recognition WHERE daily_pool_id = dp.id) THEN 1 ELSE 0 END as has_recognition,
-               CASE WHEN EXISTS(SELECT 1 FROM daily_r2_spelling WHERE daily_pool_id = dp.id) THEN 1 ELSE 0 END as has_spelling
-        FROM daily_pool dp
-        JOIN master_vocabulary mv ON dp.master_word_id = mv.id
-        WHERE dp.date = ?
-        ORDER BY dp.group_number, mv.word
-    ''', (today,)).fetchall()
+    words = conn.execute(TODAY_WORDS_SQL, (today,)).fetchall()
     
     conn.close()
     
@@ -1376,11 +1706,8 @@ def remove_word_from_today():
         master_word_id = word_info['master_word_id']
         word_text = word_info['word']
         
-        # 从各个学习维度表中删除记录
-        learning_tables = ['daily_r1_recognition', 'daily_r2_spelling', 
-                         'daily_r3_listening', 'daily_r4_speaking']
-        for table in learning_tables:
-            conn.execute(f'DELETE FROM {table} WHERE daily_pool_id = ?', (daily_pool_id,))
+        # 删除各个学习维度的掌握状态
+        conn.execute(REMOVE_WORD_STATE_SQL, (daily_pool_id,))
         
         # 从daily_pool中删除
         conn.execute('DELETE FROM daily_pool WHERE id = ?', (daily_pool_id,))
@@ -1410,6 +1737,7 @@ def history_detail_page(date):
     return render_template('history_detail.html', date=date)
 
 if __name__ == '__main__':
+    build_assets(app.static_folder)
     init_db()
-    import_vocabulary_from_json()  # 启动时导入词汇
+    import_vocabulary_from_json()  # 启动时增量导入词汇
     app.run(debug=True, port=5002)
\ No newline at end of file
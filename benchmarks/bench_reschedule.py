@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+基准测试：整个复习队列的批量重新规划
+在临时数据库中生成 --items 个带随机记忆状态的复习项目，分别用各个调度器执行 bulk_reschedule()，
+统计耗时（安装了 NumPy 时为向量化计算，否则逐行计算）。
+
+用法:
+    python benchmarks/bench_reschedule.py [--items 100000] [--seed 42]
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import scheduler
+from migrations import migrate
+
+def fill_queue(conn, items, rng):
+    """生成复习项目：上次复习在过去 60 天内，记忆状态随机"""
+    today = date.today()
+    rows = []
+    for item in range(1, items + 1):
+        stability = rng.uniform(1, 60)
+        last_review = today - timedelta(days=rng.randrange(60))
+        rows.append((item, item, (last_review + timedelta(days=int(stability))).isoformat(), int(stability),
+                     last_review.isoformat(), stability, rng.uniform(1, 10), rng.uniform(1.3, 3.0),
+                     rng.randrange(1, 8), rng.randrange(3)))
+    conn.executemany('''
+        INSERT INTO review_queue (learning_record_id, master_word_id, next_review_date, review_interval,
+                                  last_review_date, stability, difficulty, ease, reps, lapses)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', rows)
+    conn.commit()
+
+def main():
+    parser = argparse.ArgumentParser(description='复习队列批量重新规划基准测试')
+    parser.add_argument('--items', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(os.path.join(tmp, 'bench.db'))
+        migrate(conn, verbose=False)
+        fill_queue(conn, args.items, random.Random(args.seed))
+        print(f"复习项目 {args.items} 个，{'NumPy 向量化' if scheduler.np is not None else '未安装 NumPy，逐行计算'}")
+
+        for name in sorted(scheduler.SCHEDULERS):
+            started = time.perf_counter()
+            conn.execute('BEGIN IMMEDIATE')
+            scheduler.bulk_reschedule(conn, scheduler.get_scheduler(name))
+            conn.commit()
+            print(f"{name}: {time.perf_counter() - started:.2f} 秒")
+        conn.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+基准测试：每天第一次访问 /today_learning 的延迟
+在临时数据库中导入项目自带的全部词书，反复清空当天的词池后请求 /today_learning，
+统计初始化当日单词（选词、分组写入词池和各维度状态）的耗时。
+
+用法:
+    python benchmarks/bench_today_learning.py [--runs 50] [--daily-size 60] [--groups 3] [--seed 42]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import app as vocab_app
+from vocab_importer import DEFAULT_WORD_BOOKS, import_word_books
+from word_sampler import reshuffle_words
+
+def reset_today(conn, today):
+    """清空当天的词池和进度，把当天的单词放回未学习状态"""
+    conn.execute('''
+        UPDATE master_vocabulary SET status = 'unlearned'
+        WHERE id IN (SELECT master_word_id FROM daily_pool WHERE date = ?)
+    ''', (today,))
+    conn.execute('DELETE FROM daily_word_state WHERE daily_pool_id IN (SELECT id FROM daily_pool WHERE date = ?)', (today,))
+    conn.execute('DELETE FROM daily_pool WHERE date = ?', (today,))
+    conn.execute('DELETE FROM daily_progress WHERE date = ?', (today,))
+    conn.commit()
+
+def main():
+    parser = argparse.ArgumentParser(description='首次访问 /today_learning 的延迟基准测试')
+    parser.add_argument('--runs', type=int, default=50)
+    parser.add_argument('--daily-size', type=int, default=60)
+    parser.add_argument('--groups', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42, help='固定选词种子，使每次运行选出的单词相同')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database = os.path.join(tmp, 'bench.db')
+        vocab_app.DATABASE = database
+        vocab_app.app.config['DAILY_WORD_COUNT'] = args.daily_size
+        vocab_app.app.config['DAILY_GROUP_COUNT'] = args.groups
+        vocab_app.app.config['WORD_SAMPLE_SEED'] = args.seed
+        vocab_app.init_db()
+        import_word_books([os.path.join(ROOT, p) for p in DEFAULT_WORD_BOOKS], database=database, verbose=False)
+
+        conn = vocab_app.get_db()
+        reshuffle_words(conn, args.seed)
+        conn.commit()
+        conn.close()
+
+        client = vocab_app.app.test_client()
+        today = date.today().isoformat()
+        timings = []
+        for _ in range(args.runs):
+            conn = vocab_app.get_db()
+            reset_today(conn, today)
+            conn.close()
+
+            started = time.perf_counter()
+            response = client.get('/today_learning')
+            timings.append((time.perf_counter() - started) * 1000)
+            assert response.status_code == 200
+
+        conn = vocab_app.get_db()
+        pooled = conn.execute('SELECT COUNT(*) FROM daily_pool WHERE date = ?', (today,)).fetchone()[0]
+        conn.close()
+
+    timings.sort()
+    print(f"每日 {args.daily_size} 词 / {args.groups} 组，运行 {args.runs} 次，最后一次写入 {pooled} 个单词")
+    print(f"首次访问 /today_learning: 最小 {timings[0]:.2f} ms，"
+          f"中位数 {statistics.median(timings):.2f} ms，"
+          f"P95 {timings[int(len(timings) * 0.95) - 1]:.2f} ms")
+
+if __name__ == '__main__':
+    main()
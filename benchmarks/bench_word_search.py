@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+基准测试：单词搜索索引的前缀补全和拼写纠错延迟
+从数据库读取词库（可用 --expand-to 随机插入字母扩充到指定数量，模拟更大的词库），
+构建索引后对随机单词分别做前缀补全和带一个拼写错误的模糊查询。
+
+用法:
+    python benchmarks/bench_word_search.py [--db vocabulary.db] [--queries 500] [--expand-to 30000] [--seed 42]
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import string
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from word_search import WordSearchIndex
+
+def expand_words(words, target, rng):
+    """在已有单词中随机插入字母，生成不重复的新单词直到达到 target 个"""
+    expanded = set(words)
+    while len(expanded) < target:
+        word = rng.choice(words)
+        position = rng.randrange(len(word) + 1)
+        expanded.add(word[:position] + rng.choice(string.ascii_lowercase) + word[position:])
+    return sorted(expanded)
+
+def misspell(word, rng):
+    """随机替换一个字母"""
+    position = rng.randrange(len(word))
+    return word[:position] + rng.choice(string.ascii_lowercase) + word[position + 1:]
+
+def report(name, timings):
+    timings.sort()
+    print(f"{name}: 中位数 {statistics.median(timings):.3f} ms，"
+          f"P95 {timings[int(len(timings) * 0.95) - 1]:.3f} ms，最大 {timings[-1]:.3f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description='单词搜索索引基准测试')
+    parser.add_argument('--db', default=os.path.join(ROOT, 'vocabulary.db'))
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--expand-to', type=int, default=0)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    conn = sqlite3.connect(f'file:{args.db}?mode=ro', uri=True)
+    words = [word for (word,) in conn.execute('SELECT word FROM master_vocabulary ORDER BY id')]
+    conn.close()
+    if args.expand_to > len(words):
+        words = expand_words(words, args.expand_to, rng)
+
+    index = WordSearchIndex()
+    started = time.perf_counter()
+    for word_id, word in enumerate(words, 1):
+        index.add(word_id, word)
+    print(f"构建索引：{index.size} 个单词，耗时 {time.perf_counter() - started:.2f} 秒")
+
+    samples = [rng.choice(words) for _ in range(args.queries)]
+    prefix_timings = []
+    fuzzy_timings = []
+    for word in samples:
+        started = time.perf_counter()
+        index.prefix(word[:2], 0, 10)
+        prefix_timings.append((time.perf_counter() - started) * 1000)
+
+        typo = misspell(word, rng)
+        started = time.perf_counter()
+        index.fuzzy(typo)
+        fuzzy_timings.append((time.perf_counter() - started) * 1000)
+
+    report('前缀补全（2个字母，第1页）', prefix_timings)
+    report('拼写纠错（1个错误）', fuzzy_timings)
+
+if __name__ == '__main__':
+    main()
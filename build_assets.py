@@ -0,0 +1,98 @@
+"""
+静态资源构建
+把 static/css 和 static/js 下的源文件复制到 static/dist，文件名带上内容哈希，
+同时生成 gzip 和 brotli 预压缩版本，并写出 manifest.json（源文件名 -> 带哈希的文件名）。
+模板通过 asset_url() 引用资源，内容不变时文件名不变，浏览器可以永久缓存。
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+STATIC_DIR = 'static'
+SOURCE_DIRS = ['css', 'js']
+DIST_DIR = os.path.join(STATIC_DIR, 'dist')
+MANIFEST_NAME = 'manifest.json'
+
+def fingerprint(content):
+    """资源内容的短哈希"""
+    return hashlib.blake2b(content, digest_size=6).hexdigest()
+
+def write_if_changed(path, content):
+    """内容不同时才写入文件，返回是否写入"""
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            if f.read() == content:
+                return False
+    with open(path, 'wb') as f:
+        f.write(content)
+    return True
+
+def build_assets(static_dir=STATIC_DIR, verbose=True):
+    """构建所有静态资源，返回 manifest"""
+    dist_dir = os.path.join(static_dir, 'dist')
+    manifest = {}
+    written = 0
+
+    for source_dir in SOURCE_DIRS:
+        source_path = os.path.join(static_dir, source_dir)
+        if not os.path.isdir(source_path):
+            continue
+        os.makedirs(os.path.join(dist_dir, source_dir), exist_ok=True)
+
+        for filename in sorted(os.listdir(source_path)):
+            stem, ext = os.path.splitext(filename)
+            if ext not in ('.css', '.js'):
+                continue
+            with open(os.path.join(source_path, filename), 'rb') as f:
+                content = f.read()
+
+            hashed = f'{source_dir}/{stem}.{fingerprint(content)}{ext}'
+            manifest[f'{source_dir}/{filename}'] = hashed
+
+            target = os.path.join(dist_dir, hashed)
+            written += write_if_changed(target, content)
+            # mtime=0 保证相同内容生成相同的压缩文件
+            written += write_if_changed(target + '.gz', gzip.compress(content, compresslevel=9, mtime=0))
+            if brotli is not None:
+                written += write_if_changed(target + '.br', brotli.compress(content))
+
+    # 清理旧版本的文件
+    keep = set()
+    for hashed in manifest.values():
+        keep.update({hashed, hashed + '.gz', hashed + '.br'})
+    removed = 0
+    for source_dir in SOURCE_DIRS:
+        directory = os.path.join(dist_dir, source_dir)
+        if not os.path.isdir(directory):
+            continue
+        for filename in os.listdir(directory):
+            if f'{source_dir}/{filename}' not in keep:
+                os.remove(os.path.join(directory, filename))
+                removed += 1
+
+    os.makedirs(dist_dir, exist_ok=True)
+    write_if_changed(os.path.join(dist_dir, MANIFEST_NAME),
+                     json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+
+    if verbose:
+        print(f"📦 静态资源构建完成：{len(manifest)} 个文件，写入 {written} 个，清理 {removed} 个旧文件")
+        if brotli is None:
+            print("   ⚠️  未安装 brotli，只生成 gzip 预压缩文件")
+    return manifest
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='构建带内容哈希和预压缩的静态资源')
+    parser.add_argument('--static-dir', default=STATIC_DIR, help='静态资源目录')
+    args = parser.parse_args(argv)
+    build_assets(args.static_dir)
+
+if __name__ == '__main__':
+    main()
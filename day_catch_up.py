@@ -0,0 +1,136 @@
+"""
+多天未完成任务的补漏
+学习者连续几天没有完成（或没有打开）学习任务时，这些天的词池一直留在数据库中，单词停留在 'learning' 状态。
+换日时找出今天以前所有还有 'learning' 单词、进度未完成的日期，在调用方的写事务中用几条集合操作语句处理：
+- roll_forward：最近一天的任务整体迁移到今天并重新开始，更早几天的单词退回 unlearned
+- merge：各天还在学习的单词（最近的优先）合并成今天的词池，超出每日数量的退回 unlearned
+- release：全部退回 unlearned，今天重新抽取
+没有迁移到今天的词池行、掌握状态和进度都保留在历史记录中，这些天的进度标记为 released，之后不再处理。
+每次处理都记录到 catch_up_log 表。
+"""
+
+import json
+from datetime import datetime
+
+ROLL_FORWARD = 'roll_forward'
+MERGE = 'merge'
+RELEASE = 'release'
+POLICIES = (ROLL_FORWARD, MERGE, RELEASE)
+
+# 已处理（单词已退回）的日期的进度阶段
+RELEASED = 'released'
+
+UNFINISHED_DAYS_SQL = '''
+    SELECT DISTINCT dp.date
+    FROM master_vocabulary mv
+    JOIN daily_pool dp ON dp.master_word_id = mv.id
+    WHERE mv.status = 'learning' AND dp.date < ?
+      AND NOT EXISTS (
+          SELECT 1 FROM daily_progress p WHERE p.date = dp.date AND p.current_stage IN ('completed', ?)
+      )
+    ORDER BY dp.date
+'''
+
+def find_unfinished_days(conn, today):
+    """今天以前还有 'learning' 单词且进度未完成、也未处理过的日期（从早到晚）"""
+    return [row[0] for row in conn.execute(UNFINISHED_DAYS_SQL, (today, RELEASED))]
+
+def carry_forward_rows(conn, pool_ids, today):
+    """把词池中的若干行移到今天，并把它们各维度的掌握状态重置为未掌握"""
+    placeholders = ','.join('?' * len(pool_ids))
+    conn.execute(f'UPDATE daily_pool SET date = ? WHERE id IN ({placeholders})', [today] + list(pool_ids))
+    conn.execute(f'UPDATE daily_word_state SET is_mastered = 0 WHERE daily_pool_id IN ({placeholders})',
+                 list(pool_ids))
+
+def restart_progress(conn, day, today, initial):
+    """把某一天的进度记录移到今天并改为 initial（学习计划的第一步），今天已有进度记录时保留今天的"""
+    conn.execute('''
+        UPDATE daily_progress SET
+            date = ?,
+            current_stage = ?,
+            current_group = ?,
+            current_round = ?,
+            current_dimension = ?,
+            stage_progress = ?,
+            completed_stages = ?
+        WHERE date = ? AND NOT EXISTS (SELECT 1 FROM daily_progress WHERE date = ?)
+    ''', (today, initial['current_stage'], initial['current_group'], initial['current_round'],
+          initial['current_dimension'], json.dumps(initial['stage_progress']),
+          json.dumps(initial['completed_stages']), day, today))
+
+def release_days(conn, days, today):
+    """这些天中还在学习的单词退回 unlearned（今天词池中的除外），词池、掌握状态和进度保留在历史记录中，
+    还有词池行的日期把进度标记为 released（没有进度记录的补一条）
+    返回退回的单词数量"""
+    placeholders = ','.join('?' * len(days))
+    # 先查出要退回的单词再更新：多学习者模式下 master_vocabulary 是视图，rowcount 不计入视图上的更新
+    released = [row[0] for row in conn.execute(f'''
+        SELECT id FROM master_vocabulary
+        WHERE status = 'learning'
+          AND id IN (SELECT master_word_id FROM daily_pool WHERE date IN ({placeholders}))
+          AND id NOT IN (SELECT master_word_id FROM daily_pool WHERE date = ?)
+    ''', list(days) + [today])]
+    conn.execute("UPDATE master_vocabulary SET status = 'unlearned' WHERE id IN (SELECT value FROM json_each(?))",
+                 (json.dumps(released),))
+    conn.execute(f'''
+        INSERT INTO daily_progress (date, current_stage, completed_stages)
+        SELECT DISTINCT date, ?, '[]' FROM daily_pool WHERE date IN ({placeholders})
+        ON CONFLICT (date) DO UPDATE SET current_stage = excluded.current_stage
+    ''', [RELEASED] + list(days))
+    return len(released)
+
+def regroup_pool(conn, day, group_size):
+    """按词池行的先后顺序重新分组（每组 group_size 个）"""
+    conn.execute('''
+        UPDATE daily_pool SET group_number = (
+            SELECT COUNT(*) FROM daily_pool earlier
+            WHERE earlier.date = daily_pool.date AND earlier.id < daily_pool.id
+        ) / ? + 1
+        WHERE date = ?
+    ''', (group_size, day))
+
+def learning_rows(conn, days, limit):
+    """这些天中还在学习的单词的词池行id：最近一天的优先，同一单词只取一行，最多 limit 行"""
+    placeholders = ','.join('?' * len(days))
+    return [row[0] for row in conn.execute(f'''
+        SELECT MAX(dp.id)
+        FROM daily_pool dp
+        JOIN master_vocabulary mv ON dp.master_word_id = mv.id
+        WHERE dp.date IN ({placeholders}) AND mv.status = 'learning'
+        GROUP BY dp.master_word_id
+        ORDER BY MAX(dp.date) DESC, MAX(dp.id)
+        LIMIT ?
+    ''', list(days) + [limit])]
+
+def catch_up(conn, today, policy, daily_size, group_size, initial_progress):
+    """处理今天以前所有未完成的日期（调用方持有写事务并负责提交；今天的词池应当为空）
+    initial_progress 为学习计划的初始进度，roll_forward 迁移过来的进度从这里重新开始
+    返回 {'policy', 'days', 'carried', 'released'}（carried 为移到今天的单词数），没有未完成的日期时返回None"""
+    if policy not in POLICIES:
+        raise ValueError(f'未知的补漏方式: {policy}')
+    days = find_unfinished_days(conn, today)
+    if not days:
+        return None
+
+    carried = 0
+    if policy == ROLL_FORWARD:
+        pool_ids = [row[0] for row in conn.execute('SELECT id FROM daily_pool WHERE date = ?', (days[-1],))]
+        carry_forward_rows(conn, pool_ids, today)
+        # 学习计划可能已经更换，按当前的每组单词数重新分组
+        regroup_pool(conn, today, group_size)
+        restart_progress(conn, days[-1], today, initial_progress)
+        carried = len(pool_ids)
+    elif policy == MERGE:
+        pool_ids = learning_rows(conn, days, daily_size)
+        if pool_ids:
+            carry_forward_rows(conn, pool_ids, today)
+            regroup_pool(conn, today, group_size)
+        carried = len(pool_ids)
+
+    released = release_days(conn, days, today)
+    summary = {'policy': policy, 'days': days, 'carried': carried, 'released': released}
+    conn.execute('''
+        INSERT INTO catch_up_log (date, policy, days, carried, released, created_at)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', (today, policy, json.dumps(days), carried, released, datetime.now().isoformat()))
+    return summary
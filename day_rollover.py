@@ -0,0 +1,108 @@
+"""
+后台换日线程
+每天到了换日时间（默认本地时间 00:00）由后台线程为新的一天准备学习词池：
+迁移前一天未完成的任务或抽取新单词，全部在一个写事务中完成后一次性提交，
+学习者当天第一次打开学习页面时词池已经就绪，请求中只需读取。
+换日时间只能设在零点或零点之后（学习日期跟随日历日期），可以设为 00:05 等错开整点的时间。
+线程没有运行或换日失败时，第一次请求仍会自行准备词池。
+多个进程（如多个 worker）各自启动线程时，用文件锁保证只有一个进程在换日，持有锁的进程退出后由其他进程接替。
+"""
+
+import threading
+from datetime import datetime, time, timedelta
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# 两次检查之间最长的等待时间（秒）：系统休眠或调整时钟后最多延迟这么久换日，换日失败时也按此间隔重试
+MAX_SLEEP_SECONDS = 300
+
+def parse_rollover_time(value):
+    """解析 'HH:MM' 格式的换日时间"""
+    hour, minute = value.split(':')
+    return time(int(hour), int(minute))
+
+def next_rollover(now, rollover_time):
+    """now 之后的下一个换日时刻"""
+    moment = datetime.combine(now.date(), rollover_time)
+    if moment <= now:
+        moment += timedelta(days=1)
+    return moment
+
+class DayRolloverWorker(threading.Thread):
+    """换日守护线程：启动时先为当天换日一次，之后每天到换日时间调用 roll_over(date_str)
+    给出 lock_path 时先取得该文件的排他锁才开始工作（没有 fcntl 的平台不加锁）"""
+
+    def __init__(self, roll_over, rollover_time='00:00', clock=datetime.now, lock_path=None):
+        super().__init__(name='day-rollover', daemon=True)
+        self.roll_over = roll_over
+        self.rollover_time = parse_rollover_time(rollover_time)
+        self.clock = clock
+        self.lock_path = lock_path
+        self.lock_file = None
+        self.active = False
+        self.last_date = None
+        self.runs = 0
+        self.failures = 0
+        self._stopped = threading.Event()
+
+    def due(self):
+        """今天是否已到换日时间且尚未成功换日"""
+        now = self.clock()
+        return now.date().isoformat() != self.last_date and now.time() >= self.rollover_time
+
+    def run_once(self):
+        """为当天换日；失败时记录错误，稍后重试"""
+        today = self.clock().date().isoformat()
+        try:
+            self.roll_over(today)
+            self.last_date = today
+            self.runs += 1
+        except Exception as e:
+            self.failures += 1
+            print(f"⚠️ 换日失败（{today}）: {e}")
+
+    def seconds_until_next(self):
+        now = self.clock()
+        remaining = (next_rollover(now, self.rollover_time) - now).total_seconds()
+        return min(MAX_SLEEP_SECONDS, max(0.0, remaining))
+
+    def acquire_lock(self):
+        """等待换日文件锁，每 MAX_SLEEP_SECONDS 秒重试一次；线程被停止时返回 False
+        锁随文件对象一直持有到进程退出"""
+        if self.lock_path is None or fcntl is None:
+            return True
+        lock_file = open(self.lock_path, 'a')
+        while True:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                self.lock_file = lock_file
+                return True
+            except BlockingIOError:
+                if self._stopped.wait(MAX_SLEEP_SECONDS):
+                    lock_file.close()
+                    return False
+
+    def run(self):
+        if not self.acquire_lock():
+            return
+        self.active = True
+        if self.due():
+            self.run_once()
+        while not self._stopped.wait(self.seconds_until_next()):
+            if self.due():
+                self.run_once()
+
+    def stop(self):
+        self._stopped.set()
+
+    def stats(self):
+        return {
+            'rollover_time': self.rollover_time.strftime('%H:%M'),
+            'active': self.active,
+            'last_date': self.last_date,
+            'runs': self.runs,
+            'failures': self.failures
+        }
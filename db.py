@@ -0,0 +1,129 @@
+"""
+SQLite 连接池
+每个线程同一时间持有一个连接（同一线程内重复获取返回同一个连接），
+释放后连接回到空闲列表供其他线程复用，避免每次调用都重新建立连接。
+所有连接使用 WAL 日志模式及调优后的 PRAGMA，读操作不再被写操作阻塞。
+"""
+
+import sqlite3
+import threading
+
+# 每个新连接执行的 PRAGMA
+PRAGMAS = [
+    ('journal_mode', 'WAL'),         # 读写互不阻塞
+    ('synchronous', 'NORMAL'),       # WAL 模式下足够安全，提交无需每次 fsync
+    ('busy_timeout', 5000),          # 遇到写锁时等待而不是立即报错（毫秒）
+    ('cache_size', -16000),          # 页缓存约 16MB（负数单位为KB）
+    ('mmap_size', 268435456),        # 内存映射读取，最多 256MB
+    ('temp_store', 'MEMORY'),
+]
+
+class PooledConnection:
+    """连接池中的连接：close() 只是把连接归还连接池"""
+
+    def __init__(self, pool, conn):
+        self._pool = pool
+        self._conn = conn
+        self._depth = 0
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __enter__(self):
+        self._conn.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return self._conn.__exit__(exc_type, exc, tb)
+
+    def close(self):
+        """归还连接（与原先的 conn.close() 用法保持一致）"""
+        self._pool.release(self)
+
+class ConnectionPool:
+    """单个数据库文件的连接池"""
+
+    def __init__(self, database, max_idle=8, pragmas=PRAGMAS, on_connect=None, uri=False):
+        self.database = database
+        self.max_idle = max_idle
+        self.pragmas = pragmas
+        # 新连接建立后的额外初始化（如 ATTACH 共享数据库）
+        self.on_connect = on_connect
+        self.uri = uri
+        self.closed = False
+        self._idle = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _connect(self):
+        # 连接会在线程之间复用，但同一时间只会被一个线程使用
+        conn = sqlite3.connect(self.database, check_same_thread=False, uri=self.uri)
+        conn.row_factory = sqlite3.Row
+        for name, value in self.pragmas:
+            conn.execute(f'PRAGMA {name} = {value}')
+        if self.on_connect:
+            self.on_connect(conn)
+        return conn
+
+    def acquire(self):
+        """获取当前线程的连接，同一线程内可重入"""
+        pooled = getattr(self._local, 'conn', None)
+        if pooled is None:
+            with self._lock:
+                conn = self._idle.pop() if self._idle else None
+            pooled = PooledConnection(self, conn or self._connect())
+            self._local.conn = pooled
+        pooled._depth += 1
+        return pooled
+
+    def release(self, pooled, force=False):
+        """释放一次连接；最外层释放时回滚未提交的事务并放回空闲列表"""
+        if getattr(self._local, 'conn', None) is not pooled:
+            return
+        pooled._depth = 0 if force else pooled._depth - 1
+        if pooled._depth > 0:
+            return
+
+        self._local.conn = None
+        conn = pooled._conn
+        # 与直接关闭连接的语义一致：未提交的修改被丢弃
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            if not self.closed and len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def release_thread(self):
+        """强制归还当前线程持有的连接（用于请求结束时的清理）"""
+        pooled = getattr(self._local, 'conn', None)
+        if pooled is not None:
+            self.release(pooled, force=True)
+
+    def close_all(self):
+        """关闭所有空闲连接；其他线程正在使用的连接在归还时关闭"""
+        self.release_thread()
+        with self._lock:
+            self.closed = True
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+def get_pool(database):
+    """返回指定数据库文件的连接池"""
+    with _pools_lock:
+        pool = _pools.get(database)
+        if pool is None:
+            pool = _pools[database] = ConnectionPool(database)
+        return pool
+
+def release_all_threads():
+    """归还当前线程在所有连接池中持有的连接"""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.release_thread()
@@ -0,0 +1,146 @@
+"""
+全文检索（按中文释义、例句或单词片段反查单词）
+master_vocabulary_fts 使用 FTS5 trigram 分词，按 bm25 排序并返回高亮片段；
+分页使用 (得分, id) 游标，翻页时不需要 OFFSET 跳过前面的结果。
+trigram 至少需要 3 个字符，更短的关键词（如两个字的中文释义）退回到 LIKE 子串匹配。
+"""
+
+import sqlite3
+
+HIGHLIGHT_START = '<mark>'
+HIGHLIGHT_END = '</mark>'
+SNIPPET_CONTEXT = 12
+
+# bm25 各列权重：单词 > 释义 > 例句
+COLUMN_WEIGHTS = (10.0, 5.0, 1.0)
+
+def fts_available(conn):
+    """是否有可用的全文索引（学习者分片中没有索引，使用挂载的共享词库中的索引）"""
+    try:
+        conn.execute('SELECT 1 FROM master_vocabulary_fts LIMIT 0')
+    except sqlite3.OperationalError:
+        return False
+    return True
+
+def split_terms(query):
+    """按空白拆分关键词"""
+    return [term for term in query.split() if term]
+
+def match_expression(terms):
+    """把关键词转成 FTS5 查询：每个词作为短语，彼此为 AND 关系"""
+    return ' '.join('"' + term.replace('"', '""') + '"' for term in terms)
+
+def encode_cursor(score, word_id):
+    return f'{score!r}:{word_id}'
+
+def decode_cursor(cursor):
+    """解析翻页游标，无效时返回None"""
+    try:
+        score, word_id = cursor.rsplit(':', 1)
+        return float(score), int(word_id)
+    except (AttributeError, ValueError):
+        return None
+
+def make_snippet(text, terms):
+    """LIKE 检索时在 Python 中生成高亮片段"""
+    if not text:
+        return ''
+    lowered = text.lower()
+    for term in terms:
+        position = lowered.find(term.lower())
+        if position >= 0:
+            start = max(0, position - SNIPPET_CONTEXT)
+            end = min(len(text), position + len(term) + SNIPPET_CONTEXT)
+            return ''.join([
+                '…' if start > 0 else '',
+                text[start:position],
+                HIGHLIGHT_START, text[position:position + len(term)], HIGHLIGHT_END,
+                text[position + len(term):end],
+                '…' if end < len(text) else ''
+            ])
+    return text[:SNIPPET_CONTEXT * 2] + ('…' if len(text) > SNIPPET_CONTEXT * 2 else '')
+
+def fts_query(after):
+    """search_fts() 的SQL；参数依次为 匹配表达式, [score, score, id], limit"""
+    weights = ', '.join(str(weight) for weight in COLUMN_WEIGHTS)
+    keyset = 'AND (score > ? OR (score = ? AND id > ?))' if after else ''
+    return f'''
+        SELECT * FROM (
+            SELECT mv.id, mv.word, mv.phonetic, mv.translation, mv.example_sentence, mv.status,
+                   bm25(master_vocabulary_fts, {weights}) AS score,
+                   snippet(master_vocabulary_fts, 1, '{HIGHLIGHT_START}', '{HIGHLIGHT_END}', '…', 24) AS translation_snippet,
+                   snippet(master_vocabulary_fts, 2, '{HIGHLIGHT_START}', '{HIGHLIGHT_END}', '…', 24) AS example_snippet
+            FROM master_vocabulary_fts
+            JOIN master_vocabulary mv ON mv.id = master_vocabulary_fts.rowid
+            WHERE master_vocabulary_fts MATCH ?
+        )
+        WHERE 1 {keyset}
+        ORDER BY score, id
+        LIMIT ?
+    '''
+
+def search_fts(conn, terms, limit, after):
+    """FTS5 检索：按 bm25 得分（越小越相关）和 id 排序"""
+    params = [match_expression(terms)]
+    if after:
+        params += [after[0], after[0], after[1]]
+    params.append(limit + 1)
+    return conn.execute(fts_query(bool(after)), params).fetchall()
+
+def like_pattern(term):
+    """转义 LIKE 通配符，生成子串匹配模式"""
+    return '%' + term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+
+def search_like(conn, terms, limit, after):
+    """LIKE 子串检索（关键词过短或没有全文索引时使用）：单词命中优先，其次释义，最后例句"""
+    patterns = [like_pattern(term) for term in terms]
+    conditions = ' AND '.join(
+        "(word LIKE ? ESCAPE '\\' OR translation LIKE ? ESCAPE '\\' OR example_sentence LIKE ? ESCAPE '\\')"
+        for _ in patterns
+    )
+    params = [patterns[0], patterns[0]]
+    for pattern in patterns:
+        params += [pattern, pattern, pattern]
+
+    keyset = ''
+    if after:
+        keyset = 'AND (score > ? OR (score = ? AND id > ?))'
+        params += [after[0], after[0], after[1]]
+    params.append(limit + 1)
+
+    rows = conn.execute(f'''
+        SELECT * FROM (
+            SELECT id, word, phonetic, translation, example_sentence, status,
+                   CASE WHEN word LIKE ? ESCAPE '\\' THEN -3.0
+                        WHEN translation LIKE ? ESCAPE '\\' THEN -2.0
+                        ELSE -1.0 END AS score
+            FROM master_vocabulary
+            WHERE {conditions}
+        )
+        WHERE 1 {keyset}
+        ORDER BY score, id
+        LIMIT ?
+    ''', params).fetchall()
+
+    return [dict(row,
+                 translation_snippet=make_snippet(row['translation'], terms),
+                 example_snippet=make_snippet(row['example_sentence'], terms)) for row in rows]
+
+def search_fulltext(conn, query, limit=20, cursor=None):
+    """全文检索，返回 (结果列表, 下一页游标)；没有更多结果时游标为None"""
+    terms = split_terms(query)
+    if not terms:
+        return [], None
+    after = decode_cursor(cursor) if cursor else None
+
+    # trigram 分词只能匹配 3 个及以上字符的关键词
+    if fts_available(conn) and all(len(term) >= 3 for term in terms):
+        rows = [dict(row) for row in search_fts(conn, terms, limit, after)]
+    else:
+        rows = search_like(conn, terms, limit, after)
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]['score'], rows[-1]['id'])
+    return rows, next_cursor
@@ -0,0 +1,177 @@
+"""
+答案评分
+用 Myers 位并行算法计算编辑距离：把标准答案每个字符出现的位置编码成整数位图，
+逐个扫描用户答案的字符，每一步只做常数次位运算（Python 整数不限位数，任意长度的单词都是一个“字”）。
+同一批答案里相同的标准答案只构建一次位图，评分结果包括相似度和错误类型，学习页面和复习接口共用。
+相似度低于 MIN_SIMILARITY 的答案只需判定为答错，按答案长度算出距离上限，扫描中超过上限即提前结束。
+"""
+
+import re
+from functools import lru_cache
+
+# 错误类型
+EMPTY = 'empty'                  # 未作答
+EXACT = 'exact'                  # 完全正确（忽略大小写和首尾空白）
+SPACING = 'spacing'              # 只有空格、连字符、撇号不同
+SWAPPED = 'swapped_letters'      # 相邻两个字母顺序颠倒
+MISSING = 'missing_letter'       # 少一个字母
+EXTRA = 'extra_letter'           # 多一个字母
+WRONG_LETTER = 'wrong_letter'    # 一个字母写错
+CLOSE = 'close'                  # 拼写接近（编辑距离在容错范围内）
+WRONG = 'wrong'                  # 答错
+
+# 视为答对的错误类型
+CORRECT_CLASSES = {EXACT, SPACING}
+# 只差一点的拼写错误
+NEAR_MISS_CLASSES = {SWAPPED, MISSING, EXTRA, WRONG_LETTER, CLOSE}
+
+# 低于该相似度的答案不计算确切的编辑距离
+MIN_SIMILARITY = 0.5
+
+# 多个释义之间的分隔符
+MEANING_SEPARATORS = re.compile(r'[;；,，、/]')
+SPACING_CHARS = re.compile(r"[\s\-'’]+")
+
+def normalize(text):
+    """去掉首尾空白、合并连续空白并转为小写"""
+    return ' '.join((text or '').split()).lower()
+
+def split_meanings(translation):
+    """把释义拆成多个可接受的答案，去掉词性标记（如 n. / vt.）"""
+    meanings = []
+    for part in MEANING_SEPARATORS.split(translation or ''):
+        part = re.sub(r'^\s*[a-z]+\.\s*', '', part.strip())
+        if part:
+            meanings.append(part)
+    return meanings
+
+@lru_cache(maxsize=4096)
+def pattern_bitmaps(pattern):
+    """标准答案每个字符出现位置的位图 {字符: 位图}"""
+    bitmaps = {}
+    for position, char in enumerate(pattern):
+        bitmaps[char] = bitmaps.get(char, 0) | (1 << position)
+    return bitmaps
+
+def myers_distance(pattern, text, max_distance=None):
+    """Myers 位并行编辑距离（Levenshtein）
+    max_distance 不为None时，一旦可以确定距离超过上限就提前结束并返回 max_distance + 1"""
+    m = len(pattern)
+    if m == 0:
+        distance = len(text)
+    elif not text:
+        distance = m
+    else:
+        peq = pattern_bitmaps(pattern)
+        mask = (1 << m) - 1
+        high = 1 << (m - 1)
+        pv = mask      # 纵向 +1
+        mv = 0         # 纵向 -1
+        distance = m
+        remaining = len(text)
+        for char in text:
+            eq = peq.get(char, 0)
+            xv = eq | mv
+            xh = (((eq & pv) + pv) ^ pv) | eq
+            ph = mv | (~(xh | pv) & mask)
+            mh = pv & xh
+            if ph & high:
+                distance += 1
+            elif mh & high:
+                distance -= 1
+            # 第0行 D[0][j] = j，横向差恒为 +1，移入最低位
+            ph = ((ph << 1) | 1) & mask
+            mh = (mh << 1) & mask
+            pv = mh | (~(xv | ph) & mask)
+            mv = ph & xv
+            remaining -= 1
+            # 剩下的每个字符至多让距离减 1
+            if max_distance is not None and distance - remaining > max_distance:
+                return max_distance + 1
+    if max_distance is not None and distance > max_distance:
+        return max_distance + 1
+    return distance
+
+def similarity(distance, answer, expected):
+    """相似度：1 - 编辑距离 / 较长字符串的长度"""
+    longer = max(len(answer), len(expected))
+    if longer == 0:
+        return 1.0
+    return max(0.0, (longer - distance) / longer)
+
+def typo_limit(expected):
+    """按标准答案长度决定容错的编辑距离：短词 1 个，长词 2 个"""
+    return 1 if len(expected) <= 4 else 2
+
+def distance_limit(answer, expected):
+    """计算编辑距离时的上限：相似度低于 MIN_SIMILARITY 的答案只需知道答错了，超过上限即提前结束"""
+    return max(typo_limit(expected), int(max(len(answer), len(expected)) * (1 - MIN_SIMILARITY)))
+
+def is_transposition(answer, expected):
+    """answer 是否只是把 expected 中相邻两个字母对调"""
+    if len(answer) != len(expected):
+        return False
+    diffs = [i for i in range(len(answer)) if answer[i] != expected[i]]
+    return (len(diffs) == 2 and diffs[1] == diffs[0] + 1
+            and answer[diffs[0]] == expected[diffs[1]] and answer[diffs[1]] == expected[diffs[0]])
+
+def classify(answer, expected, distance):
+    """根据编辑距离和长度差判断错误类型"""
+    if distance == 0:
+        return EXACT
+    if SPACING_CHARS.sub('', answer) == SPACING_CHARS.sub('', expected):
+        return SPACING
+    if distance == 2 and is_transposition(answer, expected):
+        return SWAPPED
+    if distance == 1:
+        if len(answer) < len(expected):
+            return MISSING
+        if len(answer) > len(expected):
+            return EXTRA
+        return WRONG_LETTER
+    if distance <= typo_limit(expected):
+        return CLOSE
+    return WRONG
+
+def grade_answer(answer, expected):
+    """给一个答案评分；expected 可以是字符串或多个可接受答案的列表，取最接近的一个
+    返回 {'correct', 'typo', 'distance', 'similarity', 'expected'}"""
+    candidates = [expected] if isinstance(expected, str) else list(expected)
+    answer = normalize(answer)
+    if not answer:
+        return {'correct': False, 'typo': EMPTY, 'distance': None, 'similarity': 0.0,
+                'expected': candidates[0] if candidates else ''}
+
+    best = None
+    for candidate in candidates:
+        target = normalize(candidate)
+        limit = distance_limit(answer, target)
+        distance = myers_distance(target, answer, limit)
+        if distance > limit:
+            # 相差太远：距离记为None，相似度记为0
+            distance, score = None, 0.0
+        else:
+            score = similarity(distance, answer, target)
+        if best is None or score > best[0]:
+            best = (score, distance, target, candidate)
+            if distance == 0:
+                break
+    if best is None:
+        return {'correct': False, 'typo': WRONG, 'distance': None, 'similarity': 0.0, 'expected': ''}
+
+    score, distance, target, candidate = best
+    if distance is not None:
+        typo = classify(answer, target, distance)
+    else:
+        typo = SPACING if SPACING_CHARS.sub('', answer) == SPACING_CHARS.sub('', target) else WRONG
+    return {
+        'correct': typo in CORRECT_CLASSES,
+        'typo': typo,
+        'distance': distance,
+        'similarity': round(score, 4),
+        'expected': candidate
+    }
+
+def grade_batch(pairs):
+    """批量评分：pairs 为 [(answer, expected)]，按顺序返回评分结果；相同的标准答案共用位图缓存"""
+    return [grade_answer(answer, expected) for answer, expected in pairs]
@@ -0,0 +1,552 @@
+"""
+数据库结构迁移
+schema_version 表记录已应用的版本，init_db() 启动时按版本顺序执行尚未应用的迁移，
+每个迁移在独立的事务中执行。新增迁移时在 MIGRATIONS 末尾追加，不要修改已发布的迁移。
+"""
+
+import sqlite3
+from datetime import datetime
+
+def column_exists(conn, table, column):
+    """检查表中是否存在某个字段"""
+    return any(row[1] == column for row in conn.execute(f'PRAGMA table_info({table})'))
+
+def migration_001_baseline(conn):
+    """基础表结构（兼容升级前已存在的数据库）"""
+    # 总词库表
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS master_vocabulary (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            word TEXT NOT NULL UNIQUE,
+            phonetic TEXT,
+            translation TEXT,
+            example_sentence TEXT,
+            status TEXT DEFAULT 'unlearned'
+        )
+    ''')
+
+    # 每日词池表
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS daily_pool (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            master_word_id INTEGER,
+            date TEXT,
+            group_number INTEGER,
+            FOREIGN KEY (master_word_id) REFERENCES master_vocabulary (id)
+        )
+    ''')
+
+    # 每日学习表 - R1认
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS daily_r1_recognition (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            daily_pool_id INTEGER,
+            word TEXT,
+            phonetic TEXT,
+            translation TEXT,
+            example_sentence TEXT,
+            is_mastered INTEGER DEFAULT 0,
+            FOREIGN KEY (daily_pool_id) REFERENCES daily_pool (id)
+        )
+    ''')
+
+    # 每日学习表 - R2写
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS daily_r2_spelling (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            daily_pool_id INTEGER,
+            word TEXT,
+            phonetic TEXT,
+            translation TEXT,
+            example_sentence TEXT,
+            is_mastered INTEGER DEFAULT 0,
+            FOREIGN KEY (daily_pool_id) REFERENCES daily_pool (id)
+        )
+    ''')
+
+    # 每日学习表 - R3听（预留）
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS daily_r3_listening (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            daily_pool_id INTEGER,
+            word TEXT,
+            phonetic TEXT,
+            translation TEXT,
+            example_sentence TEXT,
+            is_mastered INTEGER DEFAULT 0,
+            FOREIGN KEY (daily_pool_id) REFERENCES daily_pool (id)
+        )
+    ''')
+
+    # 每日学习表 - R4说（预留）
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS daily_r4_speaking (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            daily_pool_id INTEGER,
+            word TEXT,
+            phonetic TEXT,
+            translation TEXT,
+            example_sentence TEXT,
+            is_mastered INTEGER DEFAULT 0,
+            FOREIGN KEY (daily_pool_id) REFERENCES daily_pool (id)
+        )
+    ''')
+
+    # 学习记录表
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS learning_records (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            master_word_id INTEGER,
+            first_studied_at TEXT,
+            FOREIGN KEY (master_word_id) REFERENCES master_vocabulary (id)
+        )
+    ''')
+
+    # 复习队列表
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS review_queue (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            learning_record_id INTEGER,
+            master_word_id INTEGER,
+            next_review_date TEXT,
+            review_interval INTEGER,
+            FOREIGN KEY (learning_record_id) REFERENCES learning_records (id),
+            FOREIGN KEY (master_word_id) REFERENCES master_vocabulary (id)
+        )
+    ''')
+
+    # 学习进度表
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS daily_progress (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            date TEXT UNIQUE,
+            current_stage TEXT,
+            current_group INTEGER,
+            current_round INTEGER,
+            current_dimension TEXT,
+            stage_progress TEXT,
+            completed_stages TEXT
+        )
+    ''')
+
+    # 早期版本的学习进度表缺少以下字段
+    for column in ['stage_progress', 'completed_stages']:
+        if not column_exists(conn, 'daily_progress', column):
+            conn.execute(f'ALTER TABLE daily_progress ADD COLUMN {column} TEXT')
+
+def migration_002_hot_path_indexes(conn):
+    """为高频查询添加二级索引（覆盖索引和表达式索引）"""
+    # 按日期、组号查每日词池；包含 master_word_id 使其成为覆盖索引
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_daily_pool_date_group
+        ON daily_pool (date, group_number, master_word_id)
+    ''')
+
+    # 各维度学习表按 daily_pool_id 关联，并按掌握状态过滤
+    for table in ['daily_r1_recognition', 'daily_r2_spelling', 'daily_r3_listening', 'daily_r4_speaking']:
+        conn.execute(f'''
+            CREATE INDEX IF NOT EXISTS idx_{table}_pool
+            ON {table} (daily_pool_id, is_mastered)
+        ''')
+
+    # 复习队列按到期日期取词
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_review_queue_next_review
+        ON review_queue (next_review_date)
+    ''')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_review_queue_master_word
+        ON review_queue (master_word_id)
+    ''')
+
+    # 按学习状态选词
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_master_vocabulary_status
+        ON master_vocabulary (status)
+    ''')
+
+    # 不区分大小写的单词查找
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_master_vocabulary_lower_word
+        ON master_vocabulary (LOWER(word))
+    ''')
+
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_learning_records_master_word
+        ON learning_records (master_word_id)
+    ''')
+
+# 旧版本每个维度一张表，表中复制了单词、音标、释义和例句
+LEGACY_DIMENSION_TABLES = [
+    (1, 'daily_r1_recognition'),
+    (2, 'daily_r2_spelling'),
+    (3, 'daily_r3_listening'),
+    (4, 'daily_r4_speaking'),
+]
+
+def migration_003_daily_word_state(conn):
+    """用一张按 (daily_pool_id, dimension) 存储掌握状态的表取代四张 daily_r* 表"""
+    # dimension: 1认 2写 3听 4说；is_mastered: 0未掌握 1掌握了（可重置） 2我会这个（不可重置）
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS daily_word_state (
+            daily_pool_id INTEGER NOT NULL,
+            dimension INTEGER NOT NULL,
+            is_mastered INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (daily_pool_id, dimension)
+        ) WITHOUT ROWID
+    ''')
+
+    existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    for dimension, table in LEGACY_DIMENSION_TABLES:
+        if table not in existing:
+            continue
+        conn.execute(f'''
+            INSERT OR REPLACE INTO daily_word_state (daily_pool_id, dimension, is_mastered)
+            SELECT daily_pool_id, ?, MAX(COALESCE(is_mastered, 0))
+            FROM {table}
+            WHERE daily_pool_id IS NOT NULL
+            GROUP BY daily_pool_id
+        ''', (dimension,))
+        conn.execute(f'DROP TABLE {table}')
+        conn.execute('DELETE FROM sqlite_sequence WHERE name = ?', (table,))
+
+def migration_004_shuffle_key(conn):
+    """为单词添加持久化的随机排序键，用于 O(k) 随机抽取未学习单词"""
+    if not column_exists(conn, 'master_vocabulary', 'shuffle_key'):
+        conn.execute('ALTER TABLE master_vocabulary ADD COLUMN shuffle_key INTEGER')
+    conn.execute('UPDATE master_vocabulary SET shuffle_key = abs(random()) WHERE shuffle_key IS NULL')
+
+    # 所有插入途径（应用、导入工具、手动SQL）新增的单词都自动获得排序键
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_master_vocabulary_shuffle_key
+        AFTER INSERT ON master_vocabulary
+        WHEN NEW.shuffle_key IS NULL
+        BEGIN
+            UPDATE master_vocabulary SET shuffle_key = abs(random()) WHERE id = NEW.id;
+        END
+    ''')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_master_vocabulary_status_shuffle
+        ON master_vocabulary (status, shuffle_key)
+    ''')
+
+def migration_005_completion_uniqueness(conn):
+    """保证完成当日学习可重复执行：每个单词每天最多一条学习记录，每条学习记录最多一条复习计划"""
+    # 清理重复提交产生的重复学习记录，复习计划改为指向保留的那条
+    conn.execute('''
+        UPDATE review_queue SET learning_record_id = (
+            SELECT MIN(keep.id) FROM learning_records keep
+            JOIN learning_records lr ON lr.master_word_id = keep.master_word_id
+                AND lr.first_studied_at IS keep.first_studied_at
+            WHERE lr.id = review_queue.learning_record_id
+        )
+        WHERE learning_record_id IN (SELECT id FROM learning_records)
+    ''')
+    conn.execute('''
+        DELETE FROM learning_records WHERE id NOT IN (
+            SELECT MIN(id) FROM learning_records GROUP BY master_word_id, first_studied_at
+        )
+    ''')
+    conn.execute('''
+        DELETE FROM review_queue WHERE id NOT IN (
+            SELECT MIN(id) FROM review_queue GROUP BY learning_record_id
+        )
+    ''')
+
+    conn.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_learning_records_word_day
+        ON learning_records (master_word_id, first_studied_at)
+    ''')
+    conn.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_review_queue_learning_record
+        ON review_queue (learning_record_id)
+    ''')
+
+def migration_006_progress_version(conn):
+    """学习进度版本号：daily_progress 的任何增删改都递增版本号，供进度缓存校验"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS cache_versions (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+    ''')
+    conn.execute("INSERT OR IGNORE INTO cache_versions (name, version) VALUES ('daily_progress', 0)")
+    for event in ('INSERT', 'UPDATE', 'DELETE'):
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_daily_progress_version_{event.lower()}
+            AFTER {event} ON daily_progress
+            BEGIN
+                UPDATE cache_versions SET version = version + 1 WHERE name = 'daily_progress';
+            END
+        ''')
+
+def migration_007_history_version(conn):
+    """历史记录版本号：今天以前的词池、学习进度或单词内容发生变化时递增，供历史接口的响应缓存校验"""
+    conn.execute("INSERT OR IGNORE INTO cache_versions (name, version) VALUES ('history', 0)")
+    bump = "UPDATE cache_versions SET version = version + 1 WHERE name = 'history';"
+    past = "date('now', 'localtime')"
+    for table in ('daily_pool', 'daily_progress'):
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_history_insert
+            AFTER INSERT ON {table} WHEN NEW.date < {past}
+            BEGIN {bump} END
+        ''')
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_history_update
+            AFTER UPDATE ON {table} WHEN OLD.date < {past} OR NEW.date < {past}
+            BEGIN {bump} END
+        ''')
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_history_delete
+            AFTER DELETE ON {table} WHEN OLD.date < {past}
+            BEGIN {bump} END
+        ''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_master_vocabulary_history_update
+        AFTER UPDATE OF word, phonetic, translation, example_sentence ON master_vocabulary
+        BEGIN {bump} END
+    ''')
+
+def migration_008_session_bundle_version(conn):
+    """词池和掌握状态的版本号，供今日学习数据包判断客户端数据是否需要更新"""
+    conn.execute("INSERT OR IGNORE INTO cache_versions (name, version) VALUES ('daily_pool', 0)")
+    conn.execute("INSERT OR IGNORE INTO cache_versions (name, version) VALUES ('daily_word_state', 0)")
+    for event in ('INSERT', 'UPDATE', 'DELETE'):
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_daily_pool_version_{event.lower()}
+            AFTER {event} ON daily_pool
+            BEGIN
+                UPDATE cache_versions SET version = version + 1 WHERE name = 'daily_pool';
+            END
+        ''')
+    for event, condition in (('INSERT', ''), ('DELETE', ''),
+                             ('UPDATE', 'WHEN OLD.is_mastered IS NOT NEW.is_mastered')):
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_daily_word_state_version_{event.lower()}
+            AFTER {event} ON daily_word_state {condition}
+            BEGIN
+                UPDATE cache_versions SET version = version + 1 WHERE name = 'daily_word_state';
+            END
+        ''')
+
+def migration_009_fulltext_search(conn):
+    """单词、释义和例句的全文索引（FTS5 trigram 分词，中英文都可按子串检索），由触发器与词库保持同步"""
+    try:
+        conn.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS master_vocabulary_fts USING fts5(
+                word, translation, example_sentence,
+                content='master_vocabulary', content_rowid='id',
+                tokenize='trigram'
+            )
+        ''')
+    except sqlite3.OperationalError:
+        # SQLite 未编译 FTS5 或版本过旧（trigram 需要 3.34+），全文检索接口会退回到 LIKE 查询
+        return
+
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_master_vocabulary_fts_insert
+        AFTER INSERT ON master_vocabulary
+        BEGIN
+            INSERT INTO master_vocabulary_fts (rowid, word, translation, example_sentence)
+            VALUES (NEW.id, NEW.word, NEW.translation, NEW.example_sentence);
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_master_vocabulary_fts_delete
+        AFTER DELETE ON master_vocabulary
+        BEGIN
+            INSERT INTO master_vocabulary_fts (master_vocabulary_fts, rowid, word, translation, example_sentence)
+            VALUES ('delete', OLD.id, OLD.word, OLD.translation, OLD.example_sentence);
+        END
+    ''')
+    # 只在被索引的列变化时更新，学习状态的频繁修改不触及全文索引
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_master_vocabulary_fts_update
+        AFTER UPDATE OF word, translation, example_sentence ON master_vocabulary
+        BEGIN
+            INSERT INTO master_vocabulary_fts (master_vocabulary_fts, rowid, word, translation, example_sentence)
+            VALUES ('delete', OLD.id, OLD.word, OLD.translation, OLD.example_sentence);
+            INSERT INTO master_vocabulary_fts (rowid, word, translation, example_sentence)
+            VALUES (NEW.id, NEW.word, NEW.translation, NEW.example_sentence);
+        END
+    ''')
+    conn.execute("INSERT INTO master_vocabulary_fts (master_vocabulary_fts) VALUES ('rebuild')")
+
+def migration_010_review_memory_state(conn):
+    """复习项目的记忆状态（供 SM-2 / FSRS 等调度器使用），旧数据按当前间隔回填"""
+    columns = [
+        ('stability', 'REAL'),
+        ('difficulty', 'REAL'),
+        ('ease', 'REAL'),
+        ('reps', 'INTEGER'),
+        ('lapses', 'INTEGER'),
+        ('last_review_date', 'TEXT'),
+    ]
+    for column, column_type in columns:
+        if not column_exists(conn, 'review_queue', column):
+            conn.execute(f'ALTER TABLE review_queue ADD COLUMN {column} {column_type}')
+
+    # 固定间隔序列下，间隔所在的档位即连续成功的次数
+    conn.execute('''
+        UPDATE review_queue
+        SET stability = review_interval,
+            reps = CASE WHEN review_interval <= 1 THEN 1
+                        WHEN review_interval <= 2 THEN 2
+                        WHEN review_interval <= 4 THEN 3
+                        WHEN review_interval <= 7 THEN 4
+                        WHEN review_interval <= 15 THEN 5
+                        ELSE 6 END,
+            lapses = 0,
+            last_review_date = date(next_review_date, '-' || review_interval || ' days')
+        WHERE stability IS NULL AND review_interval IS NOT NULL
+    ''')
+
+def migration_011_review_shuffle_key(conn):
+    """为复习项目添加持久化的随机排序键，到期单词按 (到期日期, 排序键) 索引分页读取"""
+    if not column_exists(conn, 'review_queue', 'shuffle_key'):
+        conn.execute('ALTER TABLE review_queue ADD COLUMN shuffle_key INTEGER')
+    conn.execute('UPDATE review_queue SET shuffle_key = abs(random()) WHERE shuffle_key IS NULL')
+
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_review_queue_shuffle_key
+        AFTER INSERT ON review_queue
+        WHEN NEW.shuffle_key IS NULL
+        BEGIN
+            UPDATE review_queue SET shuffle_key = abs(random()) WHERE id = NEW.id;
+        END
+    ''')
+    # 新索引以 next_review_date 开头，可以替代原来的单列索引
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_review_queue_next_review_shuffle
+        ON review_queue (next_review_date, shuffle_key)
+    ''')
+    conn.execute('DROP INDEX IF EXISTS idx_review_queue_next_review')
+
+def migration_012_catch_up_log(conn):
+    """多天未完成任务的补漏记录；按单词查词池的索引（从 'learning' 状态的单词找出所在日期）"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS catch_up_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            date TEXT NOT NULL,
+            policy TEXT NOT NULL,
+            days TEXT NOT NULL,
+            carried INTEGER NOT NULL DEFAULT 0,
+            released INTEGER NOT NULL DEFAULT 0,
+            created_at TEXT
+        )
+    ''')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_daily_pool_master_word
+        ON daily_pool (master_word_id, date)
+    ''')
+
+def migration_013_review_log(conn):
+    """每天复习过的项目，每个项目每天一行；进入长期记忆被移出队列的项目也保留记录"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS review_log (
+            date TEXT NOT NULL,
+            review_id INTEGER NOT NULL,
+            PRIMARY KEY (date, review_id)
+        ) WITHOUT ROWID
+    ''')
+
+def migration_014_vocabulary_version(conn):
+    """词库版本号：单词新增、删除或内容变化时递增，多学习者模式下共享词库的变化据此校验"""
+    conn.execute("INSERT OR IGNORE INTO cache_versions (name, version) VALUES ('vocabulary', 0)")
+    bump = "UPDATE cache_versions SET version = version + 1 WHERE name = 'vocabulary';"
+    for event in ('INSERT', 'DELETE', 'UPDATE OF word, phonetic, translation, example_sentence'):
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_master_vocabulary_version_{event.split()[0].lower()}
+            AFTER {event} ON master_vocabulary
+            BEGIN {bump} END
+        ''')
+
+def migration_015_shuffle_key_index(conn):
+    """只按排序键的索引：学习者分片的学习状态不在共享词库中，抽样时沿排序键顺序过滤已学的单词"""
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_master_vocabulary_shuffle_key
+        ON master_vocabulary (shuffle_key)
+    ''')
+
+def migration_016_review_lease(conn):
+    """复习项目的借出记录（多个进程共享），以及复习项目在今天变为到期时递增的版本号（各进程据此重建优先级堆）"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS review_lease (
+            review_id INTEGER PRIMARY KEY,
+            date TEXT NOT NULL,
+            priority REAL NOT NULL
+        )
+    ''')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_review_lease_date
+        ON review_lease (date, priority)
+    ''')
+    conn.execute("INSERT OR IGNORE INTO cache_versions (name, version) VALUES ('review_due', 0)")
+    bump = "UPDATE cache_versions SET version = version + 1 WHERE name = 'review_due';"
+    for event in ('INSERT', 'UPDATE OF next_review_date'):
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_review_queue_due_{event.split()[0].lower()}
+            AFTER {event} ON review_queue
+            WHEN NEW.next_review_date <= date('now', 'localtime')
+            BEGIN {bump} END
+        ''')
+
+# (版本号, 名称, 迁移函数)，版本号必须递增
+MIGRATIONS = [
+    (1, 'baseline', migration_001_baseline),
+    (2, 'hot_path_indexes', migration_002_hot_path_indexes),
+    (3, 'daily_word_state', migration_003_daily_word_state),
+    (4, 'shuffle_key', migration_004_shuffle_key),
+    (5, 'completion_uniqueness', migration_005_completion_uniqueness),
+    (6, 'progress_version', migration_006_progress_version),
+    (7, 'history_version', migration_007_history_version),
+    (8, 'session_bundle_version', migration_008_session_bundle_version),
+    (9, 'fulltext_search', migration_009_fulltext_search),
+    (10, 'review_memory_state', migration_010_review_memory_state),
+    (11, 'review_shuffle_key', migration_011_review_shuffle_key),
+    (12, 'catch_up_log', migration_012_catch_up_log),
+    (13, 'review_log', migration_013_review_log),
+    (14, 'vocabulary_version', migration_014_vocabulary_version),
+    (15, 'shuffle_key_index', migration_015_shuffle_key_index),
+    (16, 'review_lease', migration_016_review_lease),
+]
+
+def current_version(conn):
+    """返回数据库当前的结构版本"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            name TEXT,
+            applied_at TEXT
+        )
+    ''')
+    conn.commit()
+    return conn.execute('SELECT COALESCE(MAX(version), 0) FROM schema_version').fetchone()[0]
+
+def migrate(conn, verbose=True):
+    """执行所有尚未应用的迁移，返回应用的迁移版本列表"""
+    applied = []
+    for version, name, migration in MIGRATIONS:
+        if version <= current_version(conn):
+            continue
+
+        # 加写锁后再次确认，避免多个进程同时启动时重复执行
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if conn.execute('SELECT 1 FROM schema_version WHERE version = ?', (version,)).fetchone():
+                conn.rollback()
+                continue
+            migration(conn)
+            conn.execute(
+                'INSERT INTO schema_version (version, name, applied_at) VALUES (?, ?, ?)',
+                (version, name, datetime.now().isoformat())
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        applied.append(version)
+        if verbose:
+            print(f"数据库结构已升级到版本 {version}（{name}）")
+    return applied
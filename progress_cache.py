@@ -0,0 +1,75 @@
+"""
+学习进度缓存
+缓存解析后的每日学习进度，避免每次调用都查询 daily_progress 并解析两段 JSON。
+daily_progress 的每次增删改都会通过触发器递增 cache_versions 表中的版本号，
+读取缓存前只需按主键查询一次版本号即可判断缓存是否仍然有效，
+因此多个进程（或重置脚本）共享同一个数据库时缓存也不会返回过期数据。
+"""
+
+import copy
+import threading
+
+PROGRESS_VERSION_NAME = 'daily_progress'
+
+CACHE_VERSION_SQL = 'SELECT version FROM cache_versions WHERE name = ?'
+
+def read_cache_version(conn, name):
+    """读取 cache_versions 表中某项数据的当前版本号"""
+    row = conn.execute(CACHE_VERSION_SQL, (name,)).fetchone()
+    return row[0] if row else 0
+
+def read_progress_version(conn):
+    """读取学习进度的当前版本号"""
+    return read_cache_version(conn, PROGRESS_VERSION_NAME)
+
+class ProgressCache:
+    """按 (数据范围, 日期) 缓存学习进度，命中条件是版本号与数据库一致"""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, version):
+        """返回缓存的进度副本，版本不一致或未缓存时返回None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+            self.hits += 1
+            progress = entry[1]
+        # 调用方会直接修改进度字典，返回副本
+        return copy.deepcopy(progress)
+
+    def put(self, key, version, progress):
+        """写入（或覆盖）缓存"""
+        with self._lock:
+            if key not in self._entries and len(self._entries) >= self.max_entries:
+                # 只缓存当天进度为主，条目满了直接清空即可
+                self._entries.clear()
+            self._entries[key] = (version, copy.deepcopy(progress))
+
+    def invalidate(self, key=None):
+        """使某个缓存条目失效；不指定时清空全部缓存"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+            self.invalidations += 1
+
+    def stats(self):
+        """返回缓存统计信息"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+                'hit_rate': round(self.hits / total, 4) if total else 0.0
+            }
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+高频查询的执行计划检查
+对每个热点接口使用的SQL执行 EXPLAIN QUERY PLAN，确认没有任何一个需要全表扫描。
+HOT_QUERIES 引用 app.py 和各模块中的SQL常量（动态拼接的查询由对应的函数生成），新增热点查询时在这里登记。
+
+用法:
+    python query_plans.py [数据库文件]
+"""
+
+import argparse
+import sqlite3
+import sys
+
+import app
+import day_catch_up
+import fulltext_search
+import progress_cache
+import review_feed
+import review_load
+import review_priority
+import session_bundle
+import word_sampler
+import word_search
+
+DATABASE = 'vocabulary.db'
+
+TODAY = '2000-01-01'
+
+# (接口/用途, SQL, 参数)：SQL 直接取自各模块的常量，与实际执行的语句一致
+HOT_QUERIES = [
+    ('today_status', app.POOL_COUNT_SQL, (TODAY,)),
+    ('progress_version', progress_cache.CACHE_VERSION_SQL, ('daily_progress',)),
+    ('get_current_progress', app.PROGRESS_SQL, (TODAY,)),
+    ('initialize_today_words', word_sampler.SAMPLE_FROM_SQL, (0, 60)),
+    ('initialize_today_words_wrap', word_sampler.SAMPLE_WRAP_SQL, (0, 60)),
+    ('catch_up_unfinished_days', day_catch_up.UNFINISHED_DAYS_SQL, (TODAY, day_catch_up.RELEASED)),
+    ('get_words', app.GROUP_WORDS_SQL, (1, TODAY, 1)),
+    ('session_bundle_words', session_bundle.WORDS_SQL, (TODAY,)),
+    ('session_bundle_pool_ids', session_bundle.POOL_IDS_SQL, (TODAY,)),
+    ('session_bundle_mastery', session_bundle.MASTERY_SQL, (TODAY,)),
+    ('mark_word', app.MARK_WORD_SQL, (1, 1, 1)),
+    ('reset_round_progress', app.RESET_ROUND_SQL, (1, TODAY, 1)),
+    ('complete_daily_learning_status', app.COMPLETE_LEARNED_SQL, (TODAY,)),
+    ('complete_daily_learning_records', app.COMPLETE_RECORDS_SQL, (TODAY,)),
+    ('complete_daily_learning', app.COMPLETE_REVIEWS_SQL, (TODAY, TODAY, TODAY, TODAY)),
+    ('review_words_first_date', review_feed.FIRST_DUE_DATE_SQL, (TODAY,)),
+    ('review_words_next_date', review_feed.NEXT_DUE_DATE_SQL, (TODAY, TODAY)),
+    ('review_words_page', review_feed.segment_query(True, True, False),
+     (TODAY, 0, 2 ** 62, 0, 0, 0, 51)),
+    ('review_words_page_descending', review_feed.segment_query(True, True, True),
+     (TODAY, 0, 2 ** 62, 2 ** 61, 2 ** 61, 0, 51)),
+    ('review_words_last_segment', review_feed.segment_query(False, False, False), (TODAY, 2 ** 62, 51)),
+    ('review_words_total', review_feed.COUNT_DUE_SQL, (TODAY,)),
+    ('review_next_priorities', review_priority.DUE_PRIORITIES_SQL, (TODAY, review_priority.LAPSE_WEIGHT, TODAY)),
+    ('review_next_reviewed', review_priority.REVIEWED_COUNT_SQL, (TODAY,)),
+    ('review_next_leased', review_priority.LEASED_SQL, (TODAY, TODAY)),
+    ('review_next_still_due', review_priority.STILL_DUE_SQL, (1, TODAY)),
+    ('review_next_items', review_feed.review_items_query(2), (1, 2)),
+    ('history_dates', app.HISTORY_DATES_SQL, ()),
+    ('history_today_exists', app.HISTORY_DAY_EXISTS_SQL, (TODAY,)),
+    ('history', app.HISTORY_WORDS_SQL, (TODAY,)),
+    ('word_search_refresh', word_search.REFRESH_SQL, (3000,)),
+    ('word_suggestions', app.suggestion_details_query(2), (1, 2)),
+    ('search_fulltext', fulltext_search.fts_query(False), ('"重要的"', 21)),
+    ('search_fulltext_next_page', fulltext_search.fts_query(True), ('"重要的"', -1.0, -1.0, 1, 21)),
+    ('review_forecast', review_load.DUE_OFFSETS_SQL, (TODAY, TODAY)),
+    ('review_load_window', review_load.WINDOW_COUNTS_SQL, (TODAY, TODAY, TODAY)),
+    ('grade_answers', app.grading_words_query('daily_pool', 2), (1, 2)),
+    ('grade_review_answers', app.grading_words_query('review_queue', 2), (1, 2)),
+    ('search_word', app.SEARCH_WORD_SQL, ('trade',)),
+    ('add_word_to_today', app.GROUP_COUNTS_SQL, (TODAY,)),
+    ('get_today_words', app.TODAY_WORDS_SQL, (TODAY,)),
+    ('remove_word_from_today', app.REMOVE_WORD_STATE_SQL, (1,)),
+]
+
+# 有意读完整个索引的查询：{接口: (允许的扫描步骤, 原因)}，扫描步骤与此不同（如索引被删除后回表扫描）时仍然报错
+EXPECTED_SCANS = {
+    'history_dates': (['SCAN daily_pool USING COVERING INDEX idx_daily_pool_date_group'],
+                      '日期列表需要每个日期的单词数，只读覆盖索引不回表；结果按历史版本号缓存'),
+}
+
+def full_scans(conn, sql, params):
+    """返回查询计划中全表扫描的步骤
+    只有带检索条件的 SEARCH 步骤、虚拟表（全文索引）的检索和常量行不算；
+    SCAN ... USING [COVERING] INDEX 没有检索条件，同样要读完整个索引，也算全表扫描"""
+    plan = conn.execute('EXPLAIN QUERY PLAN ' + sql, params).fetchall()
+    return [row[3] for row in plan
+            if row[3].startswith('SCAN ') and 'VIRTUAL TABLE INDEX' not in row[3]
+            and row[3] != 'SCAN CONSTANT ROW']
+
+def check_query_plans(conn, queries=HOT_QUERIES):
+    """检查所有热点查询，返回 {接口: [全表扫描步骤]}，全部命中索引时返回空字典
+    与 EXPECTED_SCANS 中登记的扫描完全一致的不算问题"""
+    problems = {}
+    for name, sql, params in queries:
+        scans = full_scans(conn, sql, params)
+        if scans and scans != EXPECTED_SCANS.get(name, (None,))[0]:
+            problems[name] = scans
+    return problems
+
+def main(argv=None):
+    """命令行入口：存在全表扫描时返回非0"""
+    parser = argparse.ArgumentParser(description='检查高频查询的执行计划，存在全表扫描时返回非0')
+    parser.add_argument('database', nargs='?', default=DATABASE, help=f'数据库文件（默认 {DATABASE}）')
+    database = parser.parse_args(argv).database
+
+    # 先把数据库升级到最新结构
+    app.init_db(database)
+
+    conn = sqlite3.connect(database)
+    problems = check_query_plans(conn)
+    conn.close()
+
+    for name, _, _ in HOT_QUERIES:
+        if name in problems:
+            print(f"❌ {name}: {'; '.join(problems[name])}")
+        elif name in EXPECTED_SCANS:
+            print(f"⚠️ {name}: {'; '.join(EXPECTED_SCANS[name][0])}（{EXPECTED_SCANS[name][1]}）")
+        else:
+            print(f"✅ {name}")
+    return 1 if problems else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
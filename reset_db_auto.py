@@ -8,6 +8,8 @@ import sqlite3
 import os
 from datetime import datetime
 
+from migrations import migrate
+
 DATABASE = 'vocabulary.db'
 
 def reset_database():
@@ -22,6 +24,8 @@ def reset_database():
     
     try:
         conn = sqlite3.connect(DATABASE)
+        # 先把数据库升级到最新结构
+        migrate(conn)
         cursor = conn.cursor()
         
         # 1. 清除每日词池表
@@ -30,19 +34,11 @@ def reset_database():
         affected_rows = cursor.rowcount
         print(f"   ✅ 删除了 {affected_rows} 条每日词池记录")
         
-        # 2. 清除所有学习维度表的数据
-        learning_tables = [
-            'daily_r1_recognition',
-            'daily_r2_spelling', 
-            'daily_r3_listening',
-            'daily_r4_speaking'
-        ]
-        
-        for table in learning_tables:
-            print(f"🗑️  清除 {table} 数据...")
-            cursor.execute(f'DELETE FROM {table}')
-            affected_rows = cursor.rowcount
-            print(f"   ✅ 删除了 {affected_rows} 条记录")
+        # 2. 清除所有学习维度的掌握状态
+        print("🗑️  清除各维度掌握状态数据...")
+        cursor.execute('DELETE FROM daily_word_state')
+        affected_rows = cursor.rowcount
+        print(f"   ✅ 删除了 {affected_rows} 条记录")
         
         # 3. 清除学习进度表
         print("🗑️  清除学习进度数据...")
@@ -71,8 +67,7 @@ def reset_database():
         # 7. 重置自增ID
         print("🔄 重置自增ID...")
         tables_to_reset = [
-            'daily_pool', 'daily_r1_recognition', 'daily_r2_spelling',
-            'daily_r3_listening', 'daily_r4_speaking', 'daily_progress',
+            'daily_pool', 'daily_progress',
             'learning_records', 'review_queue'
         ]
         
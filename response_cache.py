@@ -0,0 +1,71 @@
+"""
+接口响应缓存
+保存序列化后的 JSON 响应及其 ETag，配合 cache_versions 表中的版本号校验：
+数据未变化时直接返回缓存的响应（或 304），不再重新查询和序列化。
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+def make_etag(body):
+    """根据响应内容生成 ETag"""
+    return hashlib.blake2b(body, digest_size=12).hexdigest()
+
+def serialize(payload):
+    """把响应数据序列化为 JSON 字节串"""
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def make_entry(payload, cache_control):
+    """序列化响应数据，返回 (body, etag, last_modified, cache_control)"""
+    body = serialize(payload)
+    return body, make_etag(body), datetime.now(timezone.utc).replace(microsecond=0), cache_control
+
+class ResponseMemo:
+    """按键缓存序列化后的响应及其版本号，超过容量时淘汰最久未使用的条目"""
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, version):
+        """返回缓存的响应条目，版本不一致或未缓存时返回None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, version, payload, cache_control):
+        """序列化并缓存响应，返回响应条目"""
+        entry = make_entry(payload, cache_control)
+        with self._lock:
+            self._entries[key] = (version, entry)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self):
+        """清空全部缓存"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """返回缓存统计信息"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 4) if total else 0.0
+            }
@@ -0,0 +1,162 @@
+"""
+到期复习单词的分页读取
+review_queue.shuffle_key 为每个复习项目持久化保存一个随机排序键（插入时由触发器生成）。
+排序键空间等分成 SHUFFLE_SEGMENTS 段，同一到期日期内按种子决定各段的先后和每段内的方向（正序或倒序），
+沿 (next_review_date, shuffle_key) 索引逐段读取，得到一个由种子决定的洗牌顺序（不同种子不只是同一顺序的轮转）；
+翻页游标记录 (种子, 日期, 排序键, id)，由排序键可以找到所在的段，
+每一页都是索引范围查询，不需要对整个积压队列排序，也不需要 OFFSET。
+"""
+
+import random
+
+from word_sampler import KEY_SPACE
+
+REVIEW_COLUMNS = '''
+    rq.id, rq.master_word_id, rq.next_review_date, rq.review_interval, rq.shuffle_key,
+    mv.word, mv.phonetic, mv.translation, mv.example_sentence, lr.first_studied_at
+'''
+
+FIRST_DUE_DATE_SQL = 'SELECT MIN(next_review_date) FROM review_queue WHERE next_review_date <= ?'
+NEXT_DUE_DATE_SQL = 'SELECT MIN(next_review_date) FROM review_queue WHERE next_review_date > ? AND next_review_date <= ?'
+COUNT_DUE_SQL = 'SELECT COUNT(*) FROM review_queue WHERE next_review_date <= ?'
+
+def new_seed():
+    """随机生成一个洗牌种子"""
+    return random.randrange(2 ** 32)
+
+# 洗牌时排序键空间等分的段数
+SHUFFLE_SEGMENTS = 16
+SEGMENT_WIDTH = KEY_SPACE // SHUFFLE_SEGMENTS
+
+def shuffle_plan(seed):
+    """种子对应的读取顺序：[(段号, 是否倒序)]"""
+    rng = random.Random(f'review:{seed}')
+    segments = list(range(SHUFFLE_SEGMENTS))
+    rng.shuffle(segments)
+    return [(segment, rng.random() < 0.5) for segment in segments]
+
+def segment_bounds(segment):
+    """段的排序键范围 [low, high)，最后一段 high 为None（KEY_SPACE 超出 SQLite 整数范围）"""
+    low = segment * SEGMENT_WIDTH
+    return low, (low + SEGMENT_WIDTH if segment < SHUFFLE_SEGMENTS - 1 else None)
+
+def encode_cursor(seed, row):
+    return f"{seed}:{row['next_review_date']}:{row['shuffle_key']}:{row['id']}"
+
+def decode_cursor(cursor):
+    """解析翻页游标：返回 (seed, date, shuffle_key, id)，无效时返回None"""
+    try:
+        seed, due_date, key, review_id = cursor.split(':')
+        return int(seed), due_date, int(key), int(review_id)
+    except (AttributeError, ValueError):
+        return None
+
+def next_due_date(conn, after, today):
+    """after 之后（after 为None时从最早开始）、今天及之前的下一个到期日期"""
+    if after is None:
+        row = conn.execute(FIRST_DUE_DATE_SQL, (today,)).fetchone()
+    else:
+        row = conn.execute(NEXT_DUE_DATE_SQL, (after, today)).fetchone()
+    return row[0]
+
+def segment_query(bounded, after, descending):
+    """read_segment() 的SQL；参数依次为 到期日期, low, [high], [key, key, id], limit"""
+    keyset = ''
+    if bounded:
+        keyset += 'AND rq.shuffle_key < ? '
+    if after:
+        if descending:
+            keyset += 'AND (rq.shuffle_key < ? OR (rq.shuffle_key = ? AND rq.id < ?))'
+        else:
+            keyset += 'AND (rq.shuffle_key > ? OR (rq.shuffle_key = ? AND rq.id > ?))'
+    order = 'rq.shuffle_key DESC, rq.id DESC' if descending else 'rq.shuffle_key, rq.id'
+    return f'''
+        SELECT {REVIEW_COLUMNS}
+        FROM review_queue rq
+        JOIN master_vocabulary mv ON rq.master_word_id = mv.id
+        JOIN learning_records lr ON rq.learning_record_id = lr.id
+        WHERE rq.next_review_date = ? AND rq.shuffle_key >= ? {keyset}
+        ORDER BY {order}
+        LIMIT ?
+    '''
+
+def read_segment(conn, due_date, low, high, after, limit, descending=False):
+    """读取某个到期日期中排序键在 [low, high) 内（high 为None时不设上限）、按 (排序键, id) 顺序
+    （descending 时倒序）位于 after=(key, id) 之后的最多 limit 个项目"""
+    params = [due_date, low]
+    if high is not None:
+        params.append(high)
+    if after:
+        params += [after[0], after[0], after[1]]
+    params.append(limit)
+    return conn.execute(segment_query(high is not None, bool(after), descending), params).fetchall()
+
+def iter_due_reviews(conn, today, seed, cursor=None, batch_size=100):
+    """按到期日期从早到晚、同一日期内按种子洗牌的顺序逐个产出到期的复习项目
+    cursor 为 decode_cursor() 的结果，从它之后继续；每次最多读取 batch_size 行"""
+    plan = shuffle_plan(seed)
+    if cursor:
+        due_date, after = cursor[1], (cursor[2], cursor[3])
+    else:
+        due_date, after = next_due_date(conn, None, today), None
+
+    while due_date is not None:
+        # 游标所在段之前的段已经读过
+        steps = plan
+        if after:
+            current = after[0] // SEGMENT_WIDTH
+            steps = plan[[segment for segment, _ in plan].index(current):]
+        for segment, descending in steps:
+            low, high = segment_bounds(segment)
+            position = after if after and after[0] // SEGMENT_WIDTH == segment else None
+            while True:
+                rows = read_segment(conn, due_date, low, high, position, batch_size, descending)
+                yield from rows
+                if len(rows) < batch_size:
+                    break
+                position = (rows[-1]['shuffle_key'], rows[-1]['id'])
+        due_date, after = next_due_date(conn, due_date, today), None
+
+def fetch_page(conn, today, limit, cursor=None, seed=None):
+    """读取一页到期的复习项目：返回 (rows, next_cursor, seed)，没有更多时 next_cursor 为None
+    cursor 优先于 seed；两者都没有时随机生成种子"""
+    decoded = decode_cursor(cursor) if cursor else None
+    if decoded:
+        seed = decoded[0]
+    elif seed is None:
+        seed = new_seed()
+
+    rows = []
+    for row in iter_due_reviews(conn, today, seed, decoded, batch_size=limit + 1):
+        rows.append(row)
+        if len(rows) > limit:
+            break
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(seed, rows[-1])
+    return rows, next_cursor, seed
+
+def review_items_query(count):
+    """按 count 个 id 读取复习项目的SQL"""
+    placeholders = ','.join('?' * count)
+    return f'''
+        SELECT {REVIEW_COLUMNS}
+        FROM review_queue rq
+        JOIN master_vocabulary mv ON rq.master_word_id = mv.id
+        JOIN learning_records lr ON rq.learning_record_id = lr.id
+        WHERE rq.id IN ({placeholders})
+    '''
+
+def load_review_items(conn, review_ids):
+    """按给定顺序读取复习项目"""
+    if not review_ids:
+        return []
+    rows = conn.execute(review_items_query(len(review_ids)), list(review_ids)).fetchall()
+    by_id = {row['id']: row for row in rows}
+    return [by_id[review_id] for review_id in review_ids if review_id in by_id]
+
+def count_due(conn, today):
+    """今天及之前到期的复习项目数量"""
+    return conn.execute(COUNT_DUE_SQL, (today,)).fetchone()[0]
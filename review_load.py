@@ -0,0 +1,77 @@
+"""
+复习负荷预测与均衡
+- forecast()：统计未来 N 天每天到期的复习数量（按距今天数做 bincount，已过期的计入今天；
+  安装了可选依赖 NumPy 时直接从查询结果构造数组，否则用 Counter 计数）
+- LoadBalancer：安排复习日期时，在目标间隔附近的容差窗口内选择负荷最低的一天，
+  避免同一天完成学习的单词在之后的复习日全部挤在同一天
+"""
+
+from collections import Counter
+from datetime import date, timedelta
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# 容差窗口为间隔的 ±15%（1、2 天的短间隔保持不变）
+BALANCE_RATIO = 0.15
+# 容差窗口的最大半径（天）
+MAX_BALANCE_DAYS = 7
+
+DUE_OFFSETS_SQL = '''
+    SELECT MAX(0, CAST(julianday(next_review_date) - julianday(?) AS INTEGER))
+    FROM review_queue
+    WHERE next_review_date < ?
+'''
+WINDOW_COUNTS_SQL = '''
+    SELECT CAST(julianday(next_review_date) - julianday(?) AS INTEGER), COUNT(*)
+    FROM review_queue
+    WHERE next_review_date BETWEEN ? AND ?
+    GROUP BY next_review_date
+'''
+
+def due_offsets(conn, days, today=None):
+    """未来 days 天内到期的复习项目距今天的天数（已过期的为0），逐个产生"""
+    today = today or date.today()
+    end = (today + timedelta(days=days)).isoformat()
+    return (row[0] for row in conn.execute(DUE_OFFSETS_SQL, (today.isoformat(), end)))
+
+def forecast(conn, days=30, today=None):
+    """未来 days 天每天到期的复习数量，第0天（今天）包含已过期的项目"""
+    offsets = due_offsets(conn, days, today)
+    if np is not None:
+        return np.bincount(np.fromiter(offsets, dtype=np.int64), minlength=days)[:days].tolist()
+    counts = Counter(offsets)
+    return [counts.get(offset, 0) for offset in range(days)]
+
+def balance_window(interval, ratio=BALANCE_RATIO, max_days=MAX_BALANCE_DAYS):
+    """间隔对应的容差半径（天）"""
+    return min(max_days, int(round(interval * ratio)))
+
+class LoadBalancer:
+    """按每天的到期数量选择复习日期；counts 为 {距今天数: 到期数量}，安排后计入对应的一天"""
+
+    def __init__(self, counts=None, ratio=BALANCE_RATIO, max_days=MAX_BALANCE_DAYS):
+        self.counts = Counter(counts or {})
+        self.ratio = ratio
+        self.max_days = max_days
+
+    @classmethod
+    def around(cls, conn, interval, today=None, ratio=BALANCE_RATIO, max_days=MAX_BALANCE_DAYS):
+        """只读取 interval 附近容差窗口内的到期数量（安排单个项目时使用）"""
+        today = today or date.today()
+        radius = balance_window(interval, ratio, max_days)
+        rows = conn.execute(WINDOW_COUNTS_SQL, (today.isoformat(),
+              (today + timedelta(days=interval - radius)).isoformat(),
+              (today + timedelta(days=interval + radius)).isoformat())).fetchall()
+        return cls(dict(rows), ratio, max_days)
+
+    def pick(self, target, interval=None):
+        """在 [target - r, target + r] 中选择负荷最低的一天（r 由间隔 interval 决定，默认即 target），
+        负荷相同时取最接近 target 的一天"""
+        radius = balance_window(target if interval is None else interval, self.ratio, self.max_days)
+        candidates = range(max(1, target - radius), target + radius + 1)
+        chosen = min(candidates, key=lambda offset: (self.counts[offset], abs(offset - target), offset))
+        self.counts[chosen] += 1
+        return chosen
@@ -0,0 +1,132 @@
+"""
+复习积压的优先级队列
+到期的复习项目按“最接近遗忘”排序：优先级 = 距上次复习的天数 / 复习间隔（逾期比例），
+再按遗忘次数加权。每个学习者每天在进程内建一次二叉堆（O(n) 建堆，有项目在当天新到期时重建），之后每次取下一个单词、
+每次答题都只需 O(log n)。
+
+取出的单词先“借出”给页面（记录在 review_lease 表），答题后才算完成；页面关闭时借出的单词在下次请求时重新返回。
+每天最多复习 daily_cap 个单词（按 review_log 中今天的记录计算），超出的积压留到之后几天。
+"""
+
+import heapq
+import threading
+
+from progress_cache import read_cache_version
+from review_feed import count_due
+
+# 每次遗忘使优先级增加的比例
+LAPSE_WEIGHT = 0.5
+
+DUE_VERSION_NAME = 'review_due'
+
+DUE_PRIORITIES_SQL = '''
+    SELECT (julianday(?) - julianday(COALESCE(last_review_date,
+                                              date(next_review_date, '-' || review_interval || ' days'))))
+           / MAX(COALESCE(review_interval, 1), 1)
+           * (1 + ? * COALESCE(lapses, 0)),
+           id
+    FROM review_queue
+    WHERE next_review_date <= ?
+'''
+REVIEWED_COUNT_SQL = 'SELECT COUNT(*) FROM review_log WHERE date = ?'
+STILL_DUE_SQL = 'SELECT 1 FROM review_queue WHERE id = ? AND next_review_date <= ?'
+LEASED_SQL = '''
+    SELECT l.review_id FROM review_lease l
+    JOIN review_queue rq ON rq.id = l.review_id
+    WHERE l.date = ? AND rq.next_review_date <= ?
+    ORDER BY l.priority DESC, l.review_id
+'''
+
+def load_due_priorities(conn, today, lapse_weight=LAPSE_WEIGHT):
+    """今天及之前到期的复习项目及其优先级：返回 [(优先级, id)]，优先级越大越先复习"""
+    return conn.execute(DUE_PRIORITIES_SQL, (today, lapse_weight, today)).fetchall()
+
+def count_reviewed(conn, today):
+    """今天已经复习过的项目数量：review_item() 每个项目每天在 review_log 中记一行，移出队列的项目也计入"""
+    return conn.execute(REVIEWED_COUNT_SQL, (today,)).fetchone()[0]
+
+def still_due(conn, review_id, today):
+    """项目是否仍然到期（可能已被其他进程复习或重新安排）"""
+    return conn.execute(STILL_DUE_SQL, (review_id, today)).fetchone() is not None
+
+def leased_ids(conn, today):
+    """今天已借出、尚未答题且仍然到期的项目，按优先级从高到低"""
+    return [row[0] for row in conn.execute(LEASED_SQL, (today, today))]
+
+def release_lease(conn, review_id):
+    """项目已答题，归还借出记录（调用方负责事务）"""
+    conn.execute('DELETE FROM review_lease WHERE review_id = ?', (review_id,))
+
+def read_due_version(conn):
+    """复习项目在今天变为到期（新加入、重新安排到今天或之前）时递增的版本号"""
+    return read_cache_version(conn, DUE_VERSION_NAME)
+
+class ReviewPriorityQueue:
+    """某一天的到期复习项目优先级堆
+    堆只是本进程的取词顺序；借出记录（review_lease）、今天的复习数量（review_log）和积压数量都在数据库中，
+    多个进程看到的每日上限和积压一致，一个进程借出的项目不会被另一个进程当作新项目再次借出。
+    有项目在今天变为到期时 review_due 版本号变化，调用方据此重建堆"""
+
+    def __init__(self, today, entries, due_version=0, daily_cap=None):
+        self.today = today
+        self.heap = [(-priority, review_id) for priority, review_id in entries]
+        heapq.heapify(self.heap)
+        self.queued = {review_id for _, review_id in self.heap}   # 仍在堆中的项目（已移除的在弹出时跳过）
+        self.due_version = due_version
+        self.daily_cap = daily_cap
+        self._lock = threading.Lock()
+
+    @classmethod
+    def build(cls, conn, today, daily_cap=None):
+        """读取到期项目建堆，并清理以前日期的借出记录"""
+        due_version = read_due_version(conn)
+        conn.execute('DELETE FROM review_lease WHERE date < ?', (today,))
+        conn.commit()
+        return cls(today, load_due_priorities(conn, today), due_version, daily_cap)
+
+    def remaining_today(self, conn):
+        """今天还能复习的数量（受每日上限限制）"""
+        backlog = count_due(conn, self.today)
+        if self.daily_cap is None:
+            return backlog
+        return max(0, min(backlog, self.daily_cap - count_reviewed(conn, self.today)))
+
+    def take(self, conn, count):
+        """按优先级返回接下来的最多 count 个项目 id：先返回已借出的，再从堆中取出并记录借出
+        在一个写事务中按数据库中的复习数量检查每日上限；从堆中取出时确认仍然到期且未被借出"""
+        with self._lock:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                count = min(count, self.remaining_today(conn))
+                leased = leased_ids(conn, self.today)
+                taken = leased[:count]
+                leased = set(leased)
+                while len(taken) < count and self.heap:
+                    priority, review_id = heapq.heappop(self.heap)
+                    if review_id not in self.queued:
+                        continue
+                    self.queued.discard(review_id)
+                    if review_id in leased or not still_due(conn, review_id, self.today):
+                        continue
+                    conn.execute('INSERT INTO review_lease (review_id, date, priority) VALUES (?, ?, ?)',
+                                 (review_id, self.today, -priority))
+                    taken.append(review_id)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            return taken
+
+    def complete(self, review_id):
+        """项目已答题：不再从本进程的堆中取出（借出记录由复习接口在同一事务中归还）"""
+        with self._lock:
+            self.queued.discard(review_id)
+
+    def stats(self, conn):
+        return {
+            'date': self.today,
+            'backlog': count_due(conn, self.today),
+            'reviewed': count_reviewed(conn, self.today),
+            'daily_cap': self.daily_cap,
+            'remaining_today': self.remaining_today(conn)
+        }
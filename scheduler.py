@@ -0,0 +1,350 @@
+"""
+间隔重复调度器
+每个复习项目的记忆状态保存在 review_queue 上（stability 记忆稳定性/天、difficulty 难度、ease 简易度、
+reps 连续成功次数、lapses 遗忘次数、last_review_date 上次复习日期），调度器根据复习结果更新记忆状态
+并给出下一次复习间隔。
+
+- ebbinghaus：固定间隔 1, 2, 4, 7, 15, 30, 60 天，失败后回到 1 天（默认，与原有行为一致）
+- sm2：SuperMemo-2，按简易度放大间隔
+- fsrs：FSRS（v4.5 参数），按记忆稳定性和目标记忆保持率计算间隔
+
+调整参数（如目标保持率）或导入旧数据后，可用 bulk_reschedule() 一次重新规划整个复习队列：
+安装了 NumPy（可选依赖，1.23 及以上，见 README）时从查询结果直接构造数组、按列向量化计算间隔，否则逐行计算。
+
+用法:
+    python scheduler.py [--db vocabulary.db] [--scheduler fsrs] [--retention 0.9] [--balance]
+"""
+
+import argparse
+import math
+import sqlite3
+from datetime import date, timedelta
+
+from grading import NEAR_MISS_CLASSES
+from review_load import LoadBalancer
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DATABASE = 'vocabulary.db'
+
+# 复习评分
+AGAIN, HARD, GOOD, EASY = 1, 2, 3, 4
+
+# 间隔达到此天数且复习成功时，认为已经长期记忆，移出复习队列
+RETIRE_INTERVAL = 60
+
+# 刚学完的单词第一次复习总在 1 天后
+FIRST_INTERVAL = 1
+
+STATE_COLUMNS = ['stability', 'difficulty', 'ease', 'reps', 'lapses']
+
+def rating_from_result(success, grade=None):
+    """把复习结果转换成评分：失败为 AGAIN；成功但服务端评分只差一点（如少一个字母）为 HARD，否则为 GOOD"""
+    if not success:
+        return AGAIN
+    if grade is not None and grade.get('typo') in NEAR_MISS_CLASSES:
+        return HARD
+    return GOOD
+
+class Scheduler:
+    """调度器接口：子类实现 initial_state()、review() 和 interval()，可选实现向量化的 intervals()"""
+
+    name = None
+
+    def initial_state(self):
+        """刚学完（第一次复习前）的记忆状态"""
+        raise NotImplementedError
+
+    def review(self, state, rating, elapsed_days):
+        """根据评分和距上次复习的天数，返回新的记忆状态"""
+        raise NotImplementedError
+
+    def interval(self, state):
+        """记忆状态对应的复习间隔（天）"""
+        raise NotImplementedError
+
+    def intervals(self, columns):
+        """向量化计算间隔：columns 为 {列名: numpy 数组}，返回整数数组；默认逐行计算"""
+        count = len(columns['stability'])
+        return np.array([
+            self.interval({name: columns[name][i] for name in STATE_COLUMNS}) for i in range(count)
+        ], dtype=np.int64)
+
+    def state_from_row(self, row):
+        """从 review_queue 行读取记忆状态，缺失的字段（旧数据）使用初始值"""
+        state = self.initial_state()
+        for name in STATE_COLUMNS:
+            if row[name] is not None:
+                state[name] = row[name]
+        return state
+
+class EbbinghausScheduler(Scheduler):
+    """固定间隔序列，成功进入下一档，失败回到第一档"""
+
+    name = 'ebbinghaus'
+    LADDER = [1, 2, 4, 7, 15, 30, 60]
+
+    def initial_state(self):
+        return {'stability': FIRST_INTERVAL, 'difficulty': None, 'ease': None, 'reps': 1, 'lapses': 0}
+
+    def review(self, state, rating, elapsed_days):
+        state = dict(state)
+        if rating == AGAIN:
+            state['stability'] = self.LADDER[0]
+            state['reps'] = 1
+            state['lapses'] += 1
+        else:
+            current = state['stability']
+            state['stability'] = next((step for step in self.LADDER if step > current), self.LADDER[-1])
+            state['reps'] += 1
+        return state
+
+    def interval(self, state):
+        # 把任意间隔归到不小于它的最近一档
+        return next((step for step in self.LADDER if step >= state['stability']), self.LADDER[-1])
+
+    def intervals(self, columns):
+        ladder = np.array(self.LADDER)
+        positions = np.searchsorted(ladder, columns['stability'], side='left')
+        return ladder[np.minimum(positions, len(ladder) - 1)].astype(np.int64)
+
+class SM2Scheduler(Scheduler):
+    """SuperMemo-2：stability 保存当前间隔，ease 为简易度"""
+
+    name = 'sm2'
+    # 评分对应的 SM-2 质量分（0-5）
+    QUALITY = {AGAIN: 1, HARD: 3, GOOD: 4, EASY: 5}
+
+    def __init__(self, initial_ease=2.5, minimum_ease=1.3, interval_modifier=1.0):
+        self.initial_ease = initial_ease
+        self.minimum_ease = minimum_ease
+        self.interval_modifier = interval_modifier
+
+    def initial_state(self):
+        # 学习当天算作第一次成功的复习
+        return {'stability': FIRST_INTERVAL, 'difficulty': None, 'ease': self.initial_ease, 'reps': 1, 'lapses': 0}
+
+    def review(self, state, rating, elapsed_days):
+        state = dict(state)
+        quality = self.QUALITY[rating]
+        ease = state['ease']
+        if quality < 3:
+            state['reps'] = 0
+            state['lapses'] += 1
+            state['stability'] = 1
+        else:
+            state['reps'] += 1
+            if state['reps'] <= 1:
+                state['stability'] = 1
+            elif state['reps'] == 2:
+                state['stability'] = 6
+            else:
+                state['stability'] = state['stability'] * ease
+        state['ease'] = max(self.minimum_ease, ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+        return state
+
+    def interval(self, state):
+        return max(1, int(round(state['stability'] * self.interval_modifier)))
+
+    def intervals(self, columns):
+        return np.maximum(1, np.rint(columns['stability'] * self.interval_modifier)).astype(np.int64)
+
+class FSRSScheduler(Scheduler):
+    """FSRS v4.5：可提取性 R(t, S) = (1 + FACTOR * t / S) ^ DECAY，按目标保持率反解间隔"""
+
+    name = 'fsrs'
+    DECAY = -0.5
+    FACTOR = 19 / 81
+    DEFAULT_WEIGHTS = (
+        0.4872, 1.4003, 3.7145, 13.8206, 5.1618, 1.2298, 0.8975, 0.031, 1.6474,
+        0.1367, 1.0461, 2.1072, 0.0793, 0.3246, 1.587, 0.2272, 2.8755
+    )
+
+    def __init__(self, retention=0.9, weights=DEFAULT_WEIGHTS, maximum_interval=36500):
+        self.retention = retention
+        self.w = weights
+        self.maximum_interval = maximum_interval
+
+    def initial_difficulty(self, rating):
+        return min(10.0, max(1.0, self.w[4] - (rating - 3) * self.w[5]))
+
+    def initial_state(self):
+        # 学习当天按“记住了”（GOOD）初始化
+        return {'stability': self.w[GOOD - 1], 'difficulty': self.initial_difficulty(GOOD),
+                'ease': None, 'reps': 1, 'lapses': 0}
+
+    def retrievability(self, elapsed_days, stability):
+        return (1 + self.FACTOR * elapsed_days / stability) ** self.DECAY
+
+    def review(self, state, rating, elapsed_days):
+        w = self.w
+        state = dict(state)
+        stability = state['stability']
+        difficulty = state['difficulty']
+        r = self.retrievability(max(0, elapsed_days), stability)
+
+        if rating == AGAIN:
+            state['stability'] = min(stability, w[11] * difficulty ** -w[12]
+                                     * ((stability + 1) ** w[13] - 1) * math.exp(w[14] * (1 - r)))
+            state['reps'] = 0
+            state['lapses'] += 1
+        else:
+            hard_penalty = w[15] if rating == HARD else 1.0
+            easy_bonus = w[16] if rating == EASY else 1.0
+            state['stability'] = stability * (
+                math.exp(w[8]) * (11 - difficulty) * stability ** -w[9]
+                * (math.exp(w[10] * (1 - r)) - 1) * hard_penalty * easy_bonus + 1
+            )
+            state['reps'] += 1
+
+        # 难度向“简单”的初始难度均值回归
+        difficulty = difficulty - w[6] * (rating - 3)
+        difficulty = w[7] * self.initial_difficulty(EASY) + (1 - w[7]) * difficulty
+        state['difficulty'] = min(10.0, max(1.0, difficulty))
+        return state
+
+    def interval_factor(self):
+        """间隔与稳定性之比：目标保持率为 0.9 时恰为 1"""
+        return (self.retention ** (1 / self.DECAY) - 1) / self.FACTOR
+
+    def interval(self, state):
+        days = int(round(state['stability'] * self.interval_factor()))
+        return min(self.maximum_interval, max(1, days))
+
+    def intervals(self, columns):
+        days = np.rint(columns['stability'] * self.interval_factor())
+        return np.clip(days, 1, self.maximum_interval).astype(np.int64)
+
+SCHEDULERS = {
+    EbbinghausScheduler.name: EbbinghausScheduler,
+    SM2Scheduler.name: SM2Scheduler,
+    FSRSScheduler.name: FSRSScheduler,
+}
+
+def get_scheduler(name='ebbinghaus', **params):
+    """按名称创建调度器，params 为调度器参数（如 fsrs 的 retention）"""
+    if name not in SCHEDULERS:
+        raise ValueError(f'未知的调度器: {name}（可选: {", ".join(SCHEDULERS)}）')
+    return SCHEDULERS[name](**params)
+
+def review_item(conn, scheduler, review_id, rating, today=None, balance=False):
+    """复习一个项目（调用方负责事务）：更新记忆状态和下次复习日期
+    balance 为 True 时在容差窗口内选择复习负荷最低的一天作为下次复习日期
+    返回新的间隔天数；进入长期记忆被移出队列时返回0；找不到记录时返回None"""
+    today = today or date.today()
+    row = conn.execute('SELECT * FROM review_queue WHERE id = ?', (review_id,)).fetchone()
+    if not row:
+        return None
+
+    state = scheduler.state_from_row(row)
+    # 旧数据没有上次复习日期，按计划的复习日期倒推
+    last_review = row['last_review_date'] or (
+        date.fromisoformat(row['next_review_date']) - timedelta(days=row['review_interval'] or FIRST_INTERVAL)
+    ).isoformat()
+    elapsed = (today - date.fromisoformat(last_review)).days
+
+    state = scheduler.review(state, rating, elapsed)
+    interval = scheduler.interval(state)
+    # 记入今天的复习记录（同一项目当天重复复习只记一次），在移出队列之前写入
+    conn.execute('INSERT OR IGNORE INTO review_log (date, review_id) VALUES (?, ?)',
+                 (today.isoformat(), review_id))
+
+    if rating != AGAIN and interval >= RETIRE_INTERVAL:
+        conn.execute('DELETE FROM review_queue WHERE id = ?', (review_id,))
+        return 0
+
+    due = LoadBalancer.around(conn, interval, today).pick(interval) if balance else interval
+    conn.execute('''
+        UPDATE review_queue
+        SET next_review_date = ?, review_interval = ?, last_review_date = ?,
+            stability = ?, difficulty = ?, ease = ?, reps = ?, lapses = ?
+        WHERE id = ?
+    ''', ((today + timedelta(days=due)).isoformat(), interval, today.isoformat(),
+          state['stability'], state['difficulty'], state['ease'], state['reps'], state['lapses'],
+          review_id))
+    return interval
+
+def load_state_columns(conn, scheduler, today):
+    """读取整个复习队列的记忆状态，缺失值用调度器的初始值填充
+    返回游标，每行为 (id, 上次复习距今天数, *STATE_COLUMNS)，上次复习在过去时天数为负"""
+    initial = scheduler.initial_state()
+    defaults = [initial[name] for name in STATE_COLUMNS]
+    return conn.execute(f'''
+        SELECT id,
+               CAST(julianday(COALESCE(last_review_date, date(next_review_date, '-' || review_interval || ' days')))
+                    - julianday(?) AS INTEGER),
+               {', '.join(f'COALESCE({name}, ?)' for name in STATE_COLUMNS)}
+        FROM review_queue
+        ORDER BY id
+    ''', [today.isoformat()] + defaults)
+
+def state_table(cursor):
+    """把 load_state_columns() 的游标直接读成结构化数组（不经过行列表），NULL 记为 NaN"""
+    dtype = [('id', np.int64), ('elapsed', np.int64)] + [(name, np.float64) for name in STATE_COLUMNS]
+    return np.fromiter((tuple(math.nan if value is None else value for value in row) for row in cursor),
+                       dtype=dtype)
+
+def bulk_reschedule(conn, scheduler, today=None, balance=False):
+    """按调度器当前参数重新计算整个复习队列的间隔（调用方负责事务），返回更新的行数
+    新的复习日期 = 上次复习日期 + 间隔，已经过期的项目安排在今天；
+    balance 为 True 时依次在容差窗口内选择负荷最低的一天，使每天的复习量大致均匀"""
+    today = today or date.today()
+    cursor = load_state_columns(conn, scheduler, today)
+    if np is not None:
+        table = state_table(cursor)
+        if not len(table):
+            return 0
+        ids = table['id'].tolist()
+        intervals = scheduler.intervals({name: table[name] for name in STATE_COLUMNS})
+        dues = np.maximum(0, table['elapsed'] + intervals).tolist()
+        intervals = intervals.tolist()
+    else:
+        rows = [tuple(row) for row in cursor]
+        if not rows:
+            return 0
+        ids = [row[0] for row in rows]
+        intervals = [scheduler.interval(dict(zip(STATE_COLUMNS, row[2:]))) for row in rows]
+        dues = [max(0, row[1] + interval) for row, interval in zip(rows, intervals)]
+
+    if balance:
+        # 按到期先后依次安排；已到期的仍安排在今天
+        balancer = LoadBalancer()
+        for position in sorted(range(len(rows)), key=dues.__getitem__):
+            if dues[position] > 0:
+                dues[position] = balancer.pick(dues[position], intervals[position])
+
+    conn.executemany('''
+        UPDATE review_queue SET review_interval = ?, next_review_date = date(?, '+' || ? || ' days')
+        WHERE id = ?
+    ''', [(interval, today.isoformat(), due, review_id) for interval, due, review_id in zip(intervals, dues, ids)])
+    return len(ids)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='按调度器参数重新规划整个复习队列')
+    parser.add_argument('--db', default=DATABASE, help='数据库文件')
+    parser.add_argument('--scheduler', default='ebbinghaus', choices=sorted(SCHEDULERS))
+    parser.add_argument('--retention', type=float, default=None, help='fsrs 的目标记忆保持率')
+    parser.add_argument('--balance', action='store_true', help='在容差窗口内均衡每天的复习量')
+    args = parser.parse_args(argv)
+
+    params = {'retention': args.retention} if args.retention is not None else {}
+    scheduler = get_scheduler(args.scheduler, **params)
+
+    conn = sqlite3.connect(args.db)
+    try:
+        conn.execute('BEGIN IMMEDIATE')
+        updated = bulk_reschedule(conn, scheduler, balance=args.balance)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    print(f"🗓️  已按 {scheduler.name} 重新规划 {updated} 个复习项目"
+          f"{'' if np is not None else '（未安装 NumPy，逐行计算）'}")
+
+if __name__ == '__main__':
+    main()
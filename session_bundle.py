@@ -0,0 +1,89 @@
+"""
+今日学习数据包
+一次返回当天词池的全部单词（所有组）以及每个维度的掌握位图，
+学习页面在本地按组和维度筛选未掌握的单词，阶段切换时不再逐个请求单词列表；
+状态被重置后只需带上版本号请求增量（只包含位图）。
+"""
+
+import base64
+import hashlib
+
+from progress_cache import read_cache_version
+
+# 单词数据的字段顺序（words 中每个元素按此顺序排列）
+WORD_FIELDS = ['id', 'group', 'word', 'phonetic', 'translation', 'example_sentence']
+
+WORDS_SQL = '''
+    SELECT dp.id, dp.group_number, mv.word, mv.phonetic, mv.translation, mv.example_sentence
+    FROM daily_pool dp
+    JOIN master_vocabulary mv ON dp.master_word_id = mv.id
+    WHERE dp.date = ?
+    ORDER BY dp.id
+'''
+POOL_IDS_SQL = 'SELECT id FROM daily_pool WHERE date = ? ORDER BY id'
+MASTERY_SQL = '''
+    SELECT ws.daily_pool_id, ws.dimension
+    FROM daily_pool dp
+    JOIN daily_word_state ws ON ws.daily_pool_id = dp.id
+    WHERE dp.date = ? AND ws.is_mastered != 0
+'''
+
+def encode_bitmap(positions, size):
+    """把位置集合编码为 base64 位图，第 i 个单词对应第 i//8 个字节的第 i%8 位"""
+    bits = bytearray((size + 7) // 8)
+    for position in positions:
+        bits[position >> 3] |= 1 << (position & 7)
+    return base64.b64encode(bytes(bits)).decode('ascii')
+
+def bundle_version(conn, date_str, scope):
+    """数据包版本号：日期.词池版本.掌握状态版本.数据范围"""
+    scope_tag = hashlib.blake2b(str(scope).encode('utf-8'), digest_size=4).hexdigest()
+    return '.'.join([
+        date_str,
+        str(read_cache_version(conn, 'daily_pool')),
+        str(read_cache_version(conn, 'daily_word_state')),
+        scope_tag
+    ])
+
+def same_pool(version, since):
+    """两个版本号的词池部分（日期、词池版本、数据范围）是否一致"""
+    if not since:
+        return False
+    current = version.split('.')
+    previous = since.split('.')
+    return len(previous) == 4 and previous[:2] == current[:2] and previous[3] == current[3]
+
+def load_mastery(conn, date_str, pool_ids, dimensions):
+    """返回每个维度的掌握位图（已掌握或“我会这个”的单词置位）"""
+    index = {pool_id: position for position, pool_id in enumerate(pool_ids)}
+    names = {number: name for name, number in dimensions.items()}
+    positions = {name: [] for name in dimensions}
+
+    rows = conn.execute(MASTERY_SQL, (date_str,))
+    for pool_id, dimension in rows:
+        if pool_id in index and dimension in names:
+            positions[names[dimension]].append(index[pool_id])
+
+    return {name: encode_bitmap(found, len(pool_ids)) for name, found in positions.items()}
+
+def build_bundle(conn, date_str, dimensions, scope, since=None):
+    """构建今日学习数据包；since 与当前版本一致时只返回版本号，词池未变化时只返回位图"""
+    version = bundle_version(conn, date_str, scope)
+    if since == version:
+        return {'version': version, 'unchanged': True}
+
+    if same_pool(version, since):
+        # 词池未变化，客户端已有单词数据，只返回位图
+        pool_ids = [row[0] for row in conn.execute(POOL_IDS_SQL, (date_str,))]
+        return {'version': version, 'mastery': load_mastery(conn, date_str, pool_ids, dimensions)}
+
+    words = conn.execute(WORDS_SQL, (date_str,)).fetchall()
+    mastery = load_mastery(conn, date_str, [row[0] for row in words], dimensions)
+
+    return {
+        'version': version,
+        'date': date_str,
+        'fields': WORD_FIELDS,
+        'words': [list(row) for row in words],
+        'mastery': mastery
+    }
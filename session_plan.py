@@ -0,0 +1,235 @@
+"""
+每日学习计划
+学习流程（每天多少词、分几组、每组学几轮、练哪些维度、交叉复习怎么安排）用 JSON 描述，见 session_plans.json。
+加载时编译成一张步骤表：每一步是一个 (阶段, 组, 轮, 维度) 状态，预先算好阶段描述和进入这一步时需要重置的组，
+并建立状态到步骤序号的索引，推进学习进度只需一次字典查找，与计划的长短无关。
+
+计划格式：
+    {
+        "title": "标准计划",
+        "daily_words": 60,            # 或 "group_size": 20（每天单词数 = 组数 × 每组单词数）
+        "groups": 3,
+        "rounds": 3,                  # 每组主学习的轮数
+        "dimensions": ["recognition", "spelling"],
+        "cross_review": {"window": 2, "rounds": 1},   # 学完第k组后交叉复习最近 window 组；省略则不交叉复习
+        "final_battle": true,         # 最后把所有组再过一遍
+        "stages": [...]               # 可选：直接列出阶段，代替上面按组生成的阶段
+    }
+stages 中每个阶段为 {"stage": 名称, "groups": [组号...], "rounds": 轮数, "dimensions": [...], "kind": ..., "title": ...}，
+kind 为 main（单组主学习）、cross_review 或 final_battle，省略时单组为 main、多组为 cross_review。
+"""
+
+import json
+from collections import namedtuple
+
+COMPLETED = 'completed'
+COMPLETED_DESCRIPTION = '🎉 今日学习全部完成！'
+
+DIMENSION_NAMES = {
+    'recognition': '认（英译汉）',
+    'spelling': '写（汉译英）',
+    'listening': '听（听音写词）',
+    'speaking': '说（看词朗读）'
+}
+
+STAGE_KINDS = ('main', 'cross_review', 'final_battle')
+
+# 编译后的一步：reset_groups 为进入这一步时需要把掌握状态重置的组（开始新一轮时）
+Step = namedtuple('Step', 'stage group round dimension description reset_groups')
+
+def main_stage(group, rounds, dimensions):
+    return {'stage': f'group{group}_main', 'kind': 'main', 'groups': [group],
+            'rounds': rounds, 'dimensions': dimensions}
+
+def cross_review_stage(groups, rounds, dimensions):
+    return {'stage': 'cross_review_' + '_'.join(str(group) for group in groups), 'kind': 'cross_review',
+            'groups': groups, 'rounds': rounds, 'dimensions': dimensions}
+
+def generate_stages(group_count, rounds, dimensions, cross_review=None, final_battle=False):
+    """按组生成阶段：逐组主学习，每学完一组交叉复习最近 window 组，最后可选大乱斗"""
+    stages = []
+    window = (cross_review or {}).get('window', 0)
+    cross_rounds = (cross_review or {}).get('rounds', 1)
+    for group in range(1, group_count + 1):
+        stages.append(main_stage(group, rounds, dimensions))
+        if window >= 2 and group >= window:
+            stages.append(cross_review_stage(list(range(group - window + 1, group + 1)), cross_rounds, dimensions))
+    if final_battle:
+        stages.append({'stage': 'final_battle', 'kind': 'final_battle', 'groups': list(range(1, group_count + 1)),
+                       'rounds': 1, 'dimensions': dimensions})
+    return stages
+
+def stage_title(stage):
+    """阶段标题（进度条中显示）"""
+    if stage.get('title'):
+        return stage['title']
+    groups = stage['groups']
+    if stage['kind'] == 'main':
+        return f"第{groups[0]}组主学习({stage['rounds']}轮)"
+    if stage['kind'] == 'cross_review':
+        return f"交叉复习({groups[0]}-{groups[-1]}组)"
+    return '大乱斗模式'
+
+def step_description(stage, group, round_num, dimension):
+    """某一步的描述"""
+    dimension_name = DIMENSION_NAMES[dimension]
+    if stage['kind'] == 'main':
+        return f"第{group}组主学习 - 第{round_num}轮{dimension_name}"
+    round_text = f"第{round_num}轮" if stage['rounds'] > 1 else ''
+    if stage['kind'] == 'cross_review':
+        groups = stage['groups']
+        return f"交叉复习({groups[0]}-{groups[-1]}组) - {round_text}第{group}组{dimension_name}"
+    return f"大乱斗模式 - {round_text}第{group}组{dimension_name}"
+
+class SessionPlan:
+    """编译后的学习计划"""
+
+    def __init__(self, name, title, daily_words, group_count, stages):
+        self.name = name
+        self.title = title
+        self.daily_words = daily_words
+        self.group_count = group_count
+        self.group_size = -(-daily_words // group_count)  # 向上取整
+        self.stages = stages
+        self.steps = []
+        self.index = {}           # (阶段, 组, 轮, 维度) -> 步骤序号
+        self.stage_start = {}     # 阶段 -> 第一步的序号
+        self.stage_order = {}     # 阶段 -> 阶段序号
+        self.compile()
+
+    def compile(self):
+        """展开成步骤表：主学习每轮依次练各维度；交叉复习和大乱斗每轮依次练各组的各维度"""
+        for order, stage in enumerate(self.stages):
+            name = stage['stage']
+            self.stage_order[name] = order
+            self.stage_start[name] = len(self.steps)
+            for round_num in range(1, stage['rounds'] + 1):
+                # 第2轮起重新学习本阶段的组：进入这一轮的第一步时重置掌握状态
+                reset = tuple(stage['groups']) if round_num > 1 else ()
+                for group in stage['groups']:
+                    for dimension in stage['dimensions']:
+                        self.index[(name, group, round_num, dimension)] = len(self.steps)
+                        self.steps.append(Step(name, group, round_num, dimension,
+                                               step_description(stage, group, round_num, dimension), reset))
+                        reset = ()
+
+    def initial_progress(self):
+        first = self.steps[0]
+        return {
+            'current_stage': first.stage,
+            'current_group': first.group,
+            'current_round': first.round,
+            'current_dimension': first.dimension,
+            'stage_progress': {},
+            'completed_stages': []
+        }
+
+    def locate(self, progress):
+        """进度对应的步骤序号；阶段存在但具体状态不在计划中（如修改了计划）时返回该阶段第一步，阶段未知时返回None"""
+        key = (progress['current_stage'], progress['current_group'],
+               progress['current_round'], progress['current_dimension'])
+        position = self.index.get(key)
+        if position is None:
+            position = self.stage_start.get(progress['current_stage'])
+        return position
+
+    def advance(self, progress):
+        """推进到下一步（直接修改 progress），返回需要重置掌握状态的组"""
+        position = self.locate(progress)
+        if position is None:
+            return ()
+        if position + 1 >= len(self.steps):
+            progress['current_stage'] = COMPLETED
+            return ()
+
+        step = self.steps[position + 1]
+        if step.stage != progress['current_stage']:
+            progress['completed_stages'].append(progress['current_stage'])
+        progress['current_stage'] = step.stage
+        progress['current_group'] = step.group
+        progress['current_round'] = step.round
+        progress['current_dimension'] = step.dimension
+        return step.reset_groups
+
+    def describe(self, stage_name, group, round_num, dimension):
+        if stage_name == COMPLETED:
+            return COMPLETED_DESCRIPTION
+        position = self.index.get((stage_name, group, round_num, dimension))
+        if position is not None:
+            return self.steps[position].description
+        if stage_name in self.stage_order:
+            stage = self.stages[self.stage_order[stage_name]]
+            return f"{stage_title(stage)} - 第{group}组第{round_num}轮{DIMENSION_NAMES.get(dimension, dimension)}"
+        return "未知阶段"
+
+    def stage_position(self, stage_name):
+        """阶段序号（已完成时为阶段总数），未知阶段为0"""
+        if stage_name == COMPLETED:
+            return len(self.stages)
+        return self.stage_order.get(stage_name, 0)
+
+    def count_stages(self, kind):
+        """某类阶段的数量"""
+        return sum(1 for stage in self.stages if stage['kind'] == kind)
+
+    @property
+    def dimensions(self):
+        """计划中练习的全部维度（按首次出现的顺序）"""
+        return list(dict.fromkeys(dimension for stage in self.stages for dimension in stage['dimensions']))
+
+    def outline(self):
+        """各阶段的名称和标题"""
+        return [{'stage': stage['stage'], 'title': stage_title(stage)} for stage in self.stages]
+
+def normalize_stage(stage, group_count, defaults):
+    """补全并检查计划中直接列出的阶段"""
+    groups = stage.get('groups') or ([stage['group']] if 'group' in stage else [])
+    stage = dict(defaults, **stage)
+    stage['groups'] = groups
+    stage.pop('group', None)
+    stage.setdefault('kind', 'main' if len(groups) == 1 else 'cross_review')
+    if not stage.get('stage'):
+        raise ValueError('阶段缺少名称')
+    if stage['kind'] not in STAGE_KINDS:
+        raise ValueError(f"阶段 {stage['stage']} 的类型无效: {stage['kind']}")
+    if not groups or any(not 1 <= group <= group_count for group in groups):
+        raise ValueError(f"阶段 {stage['stage']} 的组号无效: {groups}")
+    return stage
+
+def compile_plan(name, spec, daily_words=None, group_count=None):
+    """把计划描述编译成 SessionPlan；daily_words、group_count 不为None时覆盖计划中的设置"""
+    group_count = group_count or spec.get('groups', 3)
+    daily_words = daily_words or spec.get('daily_words') or group_count * spec.get('group_size', 20)
+    rounds = spec.get('rounds', 3)
+    dimensions = spec.get('dimensions', ['recognition', 'spelling'])
+
+    if 'stages' in spec:
+        defaults = {'rounds': rounds, 'dimensions': dimensions}
+        stages = [normalize_stage(stage, group_count, defaults) for stage in spec['stages']]
+    else:
+        stages = generate_stages(group_count, rounds, dimensions,
+                                 spec.get('cross_review'), spec.get('final_battle', False))
+
+    if group_count < 1 or daily_words < group_count:
+        raise ValueError(f'学习计划 {name} 的单词数或组数无效')
+    if not stages:
+        raise ValueError(f'学习计划 {name} 没有任何阶段')
+    names = [stage['stage'] for stage in stages]
+    if len(set(names)) != len(names) or COMPLETED in names:
+        raise ValueError(f'学习计划 {name} 的阶段名称重复或无效')
+    for stage in stages:
+        if stage['rounds'] < 1 or not stage['dimensions']:
+            raise ValueError(f"阶段 {stage['stage']} 的轮数或维度无效")
+        unknown = [dimension for dimension in stage['dimensions'] if dimension not in DIMENSION_NAMES]
+        if unknown:
+            raise ValueError(f"阶段 {stage['stage']} 的维度无效: {unknown}")
+
+    return SessionPlan(name, spec.get('title', name), daily_words, group_count, stages)
+
+def load_plan(path, name, daily_words=None, group_count=None):
+    """从 JSON 文件读取并编译指定的学习计划"""
+    with open(path, encoding='utf-8') as f:
+        plans = json.load(f)
+    if name not in plans:
+        raise ValueError(f'学习计划不存在: {name}（可选: {", ".join(plans)}）')
+    return compile_plan(name, plans[name], daily_words, group_count)
@@ -0,0 +1,73 @@
+// 答题事件缓冲区
+// 每次答题（掌握/未掌握/跳过）先记录在本地，攒够 flushSize 条、阶段结束或离开页面时
+// 一次性提交到 /api/submit_answers，服务端在一个事务内按顺序应用。
+// 服务端评分不通过的“掌握了”事件会记为未掌握，并在响应的 rejected 中返回，交给 onRejected 处理。
+class AnswerBuffer {
+    constructor(flushSize = 10, endpoint = '/api/submit_answers', onRejected = null) {
+        this.flushSize = flushSize;
+        this.endpoint = endpoint;
+        this.onRejected = onRejected;
+        this.events = [];
+        this.inflight = Promise.resolve();
+
+        // 页面关闭或跳转时用 sendBeacon 提交剩余事件，不阻塞页面卸载
+        window.addEventListener('pagehide', () => this.flushOnUnload());
+    }
+
+    // 写（汉译英）需要带上用户的答案，服务端评分不正确时不会记为掌握
+    add(wordId, dimension, action, answer = null) {
+        const event = { word_id: wordId, dimension: dimension, action: action };
+        if (answer !== null) {
+            event.answer = answer;
+        }
+        this.events.push(event);
+        if (this.events.length >= this.flushSize) {
+            this.flush().catch(error => console.error('提交答题记录失败，将在下次提交时重试:', error));
+        }
+    }
+
+    // 提交所有缓冲的事件；多次调用按顺序排队执行，失败的事件放回队首等待重试
+    flush() {
+        this.inflight = this.inflight.catch(() => {}).then(async () => {
+            if (this.events.length === 0) {
+                return;
+            }
+            const batch = this.events;
+            this.events = [];
+            try {
+                const response = await fetch(this.endpoint, {
+                    method: 'POST',
+                    headers: { 'Content-Type': 'application/json' },
+                    body: JSON.stringify({ events: batch })
+                });
+                const result = await response.json();
+                if (!result.success) {
+                    throw new Error(result.error || '提交失败');
+                }
+                if (result.rejected && result.rejected.length > 0 && this.onRejected) {
+                    this.onRejected(result.rejected);
+                }
+            } catch (error) {
+                this.events = batch.concat(this.events);
+                throw error;
+            }
+        });
+        return this.inflight;
+    }
+
+    flushOnUnload() {
+        if (this.events.length === 0 || !navigator.sendBeacon) {
+            return;
+        }
+        const body = new Blob([JSON.stringify({ events: this.events })], { type: 'text/plain' });
+        if (navigator.sendBeacon(this.endpoint, body)) {
+            this.events = [];
+        }
+    }
+}
+
+// 被服务端拒绝的“掌握了”：本地数据包同步为未掌握，并提示用户
+function applyRejectedAnswers(bundle, rejected) {
+    rejected.forEach(event => bundle.mark(event.word_id, event.dimension, 'not_mastered'));
+    alert(`有${rejected.length}个拼写答案未通过服务端评分（${rejected[0].error}），已记为未掌握，稍后会重新出现`);
+}
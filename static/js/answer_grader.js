@@ -0,0 +1,64 @@
+// 答案评分
+// 标准答案和评分规则都在服务端（/api/grade_answers），页面只负责展示机器建议，
+// 各学习页面和复习页面的评分结果保持一致。
+const TYPO_MESSAGES = {
+    exact: '✅ 机器建议：拼写完全正确',
+    spacing: '✅ 机器建议：正确（只有空格或连字符不同）',
+    swapped_letters: '⚠️ 机器建议：有两个相邻字母顺序颠倒',
+    missing_letter: '⚠️ 机器建议：少写了一个字母',
+    extra_letter: '⚠️ 机器建议：多写了一个字母',
+    wrong_letter: '⚠️ 机器建议：有一个字母写错了',
+    close: '⚠️ 机器建议：拼写接近，请仔细对比',
+    wrong: '❌ 机器建议：答案有误，请仔细对比',
+    empty: '❌ 机器建议：未作答'
+};
+
+async function gradeAnswers(items) {
+    const response = await fetch('/api/grade_answers', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ answers: items })
+    });
+    const result = await response.json();
+    if (!result.success) {
+        throw new Error(result.error || '评分失败');
+    }
+    return result.results;
+}
+
+function describeGrade(grade, prefix = '') {
+    if (!grade) {
+        return '';
+    }
+    let message = TYPO_MESSAGES[grade.typo] || TYPO_MESSAGES.wrong;
+    if (prefix) {
+        message = message.replace('机器建议：', `机器建议：${prefix}`);
+    }
+    // 相差太远的答案服务端不计算确切距离（distance 为null）
+    if (!grade.correct && grade.distance !== null) {
+        message += `（相似度 ${Math.round(grade.similarity * 100)}%）`;
+    }
+    return message;
+}
+
+// 评分后把机器建议填入指定元素并返回评分结果；评分失败时只在控制台提示并返回null，不影响手动判断
+async function showMachineSuggestion(elementId, items, prefixes = []) {
+    const element = document.getElementById(elementId);
+    if (!element) {
+        return null;
+    }
+    try {
+        const grades = await gradeAnswers(items);
+        const lines = grades
+            .map((grade, index) => describeGrade(grade, prefixes[index] || ''))
+            .filter(line => line);
+        if (lines.length > 0) {
+            element.innerHTML = lines.join('<br>');
+            element.style.display = '';
+        }
+        return grades;
+    } catch (error) {
+        console.error('获取机器建议失败:', error);
+        return null;
+    }
+}
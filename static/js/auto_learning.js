@@ -0,0 +1,376 @@
+// 答题结果先缓存在本地，每10条或阶段结束时批量提交
+const answerBuffer = new AnswerBuffer(10, '/api/submit_answers',
+    rejected => applyRejectedAnswers(sessionBundle, rejected));
+// 今日单词和掌握状态，阶段切换时在本地筛选
+const sessionBundle = new SessionBundle();
+let currentProgress = {};
+let words = [];
+let currentIndex = 0;
+let currentRound = 1;
+let answeredWords = new Set();
+let roundErrors = [];
+// 写（汉译英）当前单词的答案和服务端评分（Promise），标记掌握时以评分为准
+let currentAnswer = null;
+let currentGrade = null;
+
+async function loadCurrentProgress() {
+    try {
+        const response = await fetch('/api/learning_progress');
+        currentProgress = await response.json();
+
+        document.getElementById('currentStage').textContent = currentProgress.stage_description;
+        updateProgressSteps();
+        loadCurrentWords();
+    } catch (error) {
+        console.error('加载进度失败:', error);
+        document.getElementById('learningContent').innerHTML = 
+            '<p style="text-align: center; color: red;">加载进度失败，请刷新重试</p>';
+    }
+}
+
+function updateProgressSteps() {
+    // 阶段列表和当前阶段序号由学习计划决定（见 /api/learning_progress）
+    const steps = (currentProgress.stages || []).map(stage => stage.title);
+    const currentStageIndex = currentProgress.stage_index || 0;
+    const stepsContainer = document.getElementById('progressSteps');
+
+    stepsContainer.innerHTML = steps.map((step, index) => {
+        let className = 'step';
+        if (index < currentStageIndex) {
+            className += ' completed';
+        } else if (index === currentStageIndex) {
+            className += ' current';
+        }
+        return `<div class="${className}">${step}</div>`;
+    }).join('');
+
+    // 更新进度条
+    const progressPercent = steps.length ? Math.min(currentStageIndex + 1, steps.length) / steps.length * 100 : 0;
+    document.getElementById('progressFill').style.width = progressPercent + '%';
+}
+
+async function loadCurrentWords() {
+    try {
+        // 先提交缓存的答题结果，再同步数据包（只取回变化的部分），在本地筛选未掌握的单词
+        await answerBuffer.flush();
+        await sessionBundle.refresh();
+
+        words = sessionBundle.wordsFor(currentProgress.current_dimension, currentProgress.current_group);
+        if (words.length === 0) {
+            showPhaseCompletion();
+            return;
+        }
+
+        showCurrentWord();
+        updateLearningProgress();
+    } catch (error) {
+        console.error('加载单词失败:', error);
+        document.getElementById('learningContent').innerHTML = 
+            '<p style="text-align: center; color: red;">加载单词失败，请刷新重试</p>';
+    }
+}
+
+function showCurrentWord() {
+    if (currentIndex >= words.length) {
+        checkRoundCompletion();
+        return;
+    }
+
+    const word = words[currentIndex];
+    const isRecognition = currentProgress.current_dimension === 'recognition';
+
+    const content = `
+        <div class="word-card">
+            <div class="word-display">
+                ${isRecognition ? word.word : word.translation}
+            </div>
+            ${isRecognition && word.phonetic ? `<div class="phonetic">/${word.phonetic}/</div>` : ''}
+            ${word.example_sentence && isRecognition ?
+                '<div class="example-hint-section">' +
+                    '<button class="hint-btn" onclick="toggleExampleSentence()" id="hintBtn">' +
+                        '💡 查看例句' +
+                    '</button>' +
+                    '<div class="example-sentence" id="exampleSentence" style="display: none;">' +
+                        '<strong>例句：</strong>' + word.example_sentence +
+                    '</div>' +
+                '</div>' : ''}
+        </div>
+
+        <div class="input-section">
+            <input type="text" class="answer-input" id="answerInput"
+                   placeholder="${isRecognition ? '请输入中文翻译' : '请输入英文单词'}"
+                   onkeypress="handleKeyPress(event)">
+            <br>
+            <button class="submit-btn" onclick="submitAnswer()">提交答案</button>
+        </div>
+    `;
+
+    document.getElementById('learningContent').innerHTML = content;
+    document.getElementById('answerInput').focus();
+}
+
+function toggleExampleSentence() {
+    try {
+        console.log('toggleExampleSentence 函数被调用');
+
+        const hintBtn = document.getElementById('hintBtn');
+        const exampleSentence = document.getElementById('exampleSentence');
+
+        console.log('找到的元素：', { hintBtn, exampleSentence });
+
+        if (hintBtn && exampleSentence) {
+            // 显示例句
+            exampleSentence.style.display = 'block';
+            // 隐藏按钮
+            hintBtn.style.display = 'none';
+            console.log('操作完成：例句已显示，按钮已隐藏');
+        } else {
+            console.error('找不到必要的元素');
+            console.log('hintBtn:', hintBtn);
+            console.log('exampleSentence:', exampleSentence);
+        }
+    } catch (error) {
+        console.error('toggleExampleSentence 执行出错：', error);
+    }
+}
+
+async function skipCurrentWord() {
+    const word = words[currentIndex];
+
+    if (confirm(`确定要跳过单词"${word.word}"吗？这会从当前维度的学习中移除该单词。`)) {
+        try {
+            answerBuffer.add(word.id, currentProgress.current_dimension, 'skip');
+            sessionBundle.mark(word.id, currentProgress.current_dimension, 'skip');
+
+            // 从当前单词列表中移除该单词
+            words.splice(currentIndex, 1);
+
+            // 调整当前索引
+            if (currentIndex >= words.length) {
+                currentIndex = 0;
+            }
+
+            // 显示下一个单词或检查完成状态
+            if (words.length === 0) {
+                showPhaseCompletion();
+            } else {
+                showCurrentWord();
+            }
+
+            updateLearningProgress();
+
+        } catch (error) {
+            console.error('跳过单词失败:', error);
+            alert('跳过失败，请重试');
+        }
+    }
+}
+
+function handleKeyPress(event) {
+    if (event.key === 'Enter') {
+        submitAnswer();
+    }
+}
+
+async function submitAnswer() {
+    const input = document.getElementById('answerInput');
+    const userAnswer = input.value.trim();
+
+    if (!userAnswer) {
+        alert('请输入答案');
+        return;
+    }
+
+    const word = words[currentIndex];
+    const correctAnswer = currentProgress.current_dimension === 'recognition' ? 
+        word.translation : word.word;
+
+    input.disabled = true;
+    showAnswerComparison(userAnswer, correctAnswer, word);
+}
+
+function showAnswerComparison(userAnswer, correctAnswer, word) {
+    const isRecognition = currentProgress.current_dimension === 'recognition';
+    currentAnswer = null;
+    currentGrade = null;
+
+    const content = `
+        <div class="word-card">
+            <div class="word-display">
+                ${isRecognition ? word.word : word.translation}
+            </div>
+            ${isRecognition && word.phonetic ? `<div class="phonetic">/${word.phonetic}/</div>` : ''}
+            ${word.example_sentence ? `<div class="example-sentence"><strong>例句：</strong>${word.example_sentence}</div>` : ''}
+        </div>
+
+        <div class="answer-section">
+            <div class="your-answer">你的答案：${userAnswer}</div>
+            <div class="correct-answer">正确答案：${correctAnswer}</div>
+            <div id="machineSuggestion" class="machine-suggestion" style="display: none;"></div>
+
+            <div class="judgment-section">
+                <p><strong>请判断你是否已经掌握这个单词：</strong></p>
+                <button class="judgment-btn mastered-btn" onclick="markWord(true)">我已掌握</button>
+                <button class="judgment-btn not-mastered-btn" onclick="markWord(false)">我未掌握</button>
+                <button class="judgment-btn" onclick="skipCurrentWord()" 
+                        style="background: #FF9800; margin-left: 20px;">
+                    我会这个（跳过）
+                </button>
+            </div>
+        </div>
+    `;
+
+    document.getElementById('learningContent').innerHTML = content;
+
+    // 写（汉译英）由服务端评分，给出拼写错误类型
+    if (!isRecognition) {
+        currentAnswer = userAnswer;
+        currentGrade = showMachineSuggestion('machineSuggestion',
+            [{ word_id: word.id, dimension: currentProgress.current_dimension, answer: userAnswer }]);
+    }
+}
+
+async function markWord(mastered) {
+    const word = words[currentIndex];
+
+    try {
+        // 服务端评分不正确的答案不能记为掌握，本地状态与服务端保持一致
+        if (mastered && currentGrade) {
+            const grades = await currentGrade;
+            if (grades && grades[0] && !grades[0].correct) {
+                mastered = false;
+            }
+        }
+        answerBuffer.add(word.id, currentProgress.current_dimension, mastered ? 'mastered' : 'not_mastered', currentAnswer);
+        sessionBundle.mark(word.id, currentProgress.current_dimension, mastered ? 'mastered' : 'not_mastered');
+
+        answeredWords.add(currentIndex);
+        if (!mastered) {
+            roundErrors.push(currentIndex);
+        }
+
+        setTimeout(() => {
+            nextWord();
+        }, 500);
+
+    } catch (error) {
+        console.error('标记单词状态失败:', error);
+        alert('保存失败，请重试');
+    }
+}
+
+function nextWord() {
+    currentIndex++;
+    showCurrentWord();
+    updateLearningProgress();
+}
+
+function checkRoundCompletion() {
+    if (roundErrors.length === 0) {
+        // 本轮全部正确，显示阶段完成
+        showPhaseCompletion();
+    } else {
+        // 有错误，需要重新开始
+        startNewRound();
+    }
+}
+
+function startNewRound() {
+    currentRound++;
+    const errorWords = roundErrors.map(index => words[index]);
+
+    // 打乱错误单词顺序
+    for (let i = errorWords.length - 1; i > 0; i--) {
+        const j = Math.floor(Math.random() * (i + 1));
+        [errorWords[i], errorWords[j]] = [errorWords[j], errorWords[i]];
+    }
+
+    words = errorWords;
+    currentIndex = 0;
+    answeredWords.clear();
+    roundErrors = [];
+
+    alert(`第${currentRound}轮开始！需要重新学习${words.length}个未掌握的单词`);
+    showCurrentWord();
+    updateLearningProgress();
+}
+
+function updateLearningProgress() {
+    const totalWords = words.length;
+    const completedWords = answeredWords.size;
+    const progressPercent = totalWords > 0 ? (completedWords / totalWords) * 100 : 0;
+
+    document.getElementById('progressText').textContent = 
+        `${currentProgress.stage_description} - 第${currentRound}轮 - 进度：${completedWords}/${totalWords} (${Math.round(progressPercent)}%)`;
+}
+
+function showPhaseCompletion() {
+    answerBuffer.flush().catch(error => console.error('提交答题记录失败:', error));
+
+    const content = `
+        <div class="phase-completion">
+            <h3>🎉 当前阶段完成！</h3>
+            <p>${currentProgress.stage_description} 已经完成</p>
+            <button class="next-phase-btn" onclick="moveToNextPhase()">
+                进入下一个学习阶段
+            </button>
+        </div>
+    `;
+
+    document.getElementById('learningContent').innerHTML = content;
+}
+
+async function moveToNextPhase() {
+    try {
+        await answerBuffer.flush();
+
+        const response = await fetch('/api/complete_current_phase', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            }
+        });
+
+        const result = await response.json();
+
+        if (result.is_completed) {
+            // 所有学习完成
+            document.getElementById('learningContent').innerHTML = `
+                <div class="phase-completion">
+                    <h2>🎉🎉🎉 恭喜！今日学习全部完成！</h2>
+                    <p>您已经完成了所有的学习流程，包括：</p>
+                    <ul>
+                        ${(currentProgress.stages || []).map(stage => `<li>${stage.title}</li>`).join('')}
+                    </ul>
+                    <button class="next-phase-btn" onclick="window.location.href='/'">
+                        返回主页
+                    </button>
+                </div>
+            `;
+        } else {
+            // 进入下一阶段（接口返回的是 next_* 字段）
+            currentProgress = {
+                ...currentProgress,
+                current_stage: result.next_stage,
+                current_group: result.next_group,
+                current_dimension: result.next_dimension,
+                stage_description: result.stage_description,
+                stage_index: result.stage_index
+            };
+            currentIndex = 0;
+            answeredWords.clear();
+            roundErrors = [];
+            currentRound = 1;
+
+            document.getElementById('currentStage').textContent = result.stage_description;
+            updateProgressSteps();
+            loadCurrentWords();
+        }
+    } catch (error) {
+        console.error('进入下一阶段失败:', error);
+        alert('进入下一阶段失败，请刷新重试');
+    }
+}
+
+// 页面加载时开始
+loadCurrentProgress();
@@ -0,0 +1,57 @@
+async function loadHistoryDates() {
+    try {
+        const response = await fetch('/api/history_dates');
+        const dates = await response.json();
+
+        if (dates.length === 0) {
+            document.getElementById('dateList').innerHTML = 
+                '<div class="no-data">还没有学习记录，快去开始学习吧！</div>';
+            return;
+        }
+
+        // 更新统计信息
+        document.getElementById('totalDays').textContent = dates.length;
+        document.getElementById('totalWords').textContent =
+            dates.reduce((total, dateItem) => total + (dateItem.word_count || 0), 0);
+
+        // 生成日期列表
+        const dateListHtml = dates.map(dateItem => {
+            const date = dateItem.date;
+            const dateObj = new Date(date);
+            const formattedDate = dateObj.toLocaleDateString('zh-CN', {
+                year: 'numeric',
+                month: 'long',
+                day: 'numeric',
+                weekday: 'long'
+            });
+
+            const isToday = date === new Date().toISOString().split('T')[0];
+            const badge = isToday ? '<span class="date-badge">今天</span>' : '';
+
+            return `
+                <div class="date-item" onclick="viewDateDetail('${date}')">
+                    <div class="date-title">
+                        ${formattedDate} ${badge}
+                    </div>
+                    <div class="date-info">
+                        📖 学习了${dateItem.word_count}个新单词 • 点击查看详情
+                    </div>
+                </div>
+            `;
+        }).join('');
+
+        document.getElementById('dateList').innerHTML = dateListHtml;
+
+    } catch (error) {
+        console.error('加载历史记录失败:', error);
+        document.getElementById('dateList').innerHTML = 
+            '<div class="no-data">加载失败，请刷新重试</div>';
+    }
+}
+
+function viewDateDetail(date) {
+    window.location.href = `/history/${date}`;
+}
+
+// 页面加载时获取历史记录
+loadHistoryDates();
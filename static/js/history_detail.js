@@ -0,0 +1,123 @@
+async function loadHistoryDetail() {
+    try {
+        const response = await fetch(`/api/history/${currentDate}`);
+        const data = await response.json();
+
+        // 更新页面标题
+        const dateObj = new Date(data.date);
+        const formattedDate = dateObj.toLocaleDateString('zh-CN', {
+            year: 'numeric',
+            month: 'long',
+            day: 'numeric',
+            weekday: 'long'
+        });
+        document.getElementById('dateTitle').textContent = formattedDate;
+
+        // 显示进度信息
+        updateProgressInfo(data.progress);
+
+        // 显示统计信息
+        updateSummaryStats(data);
+
+        // 显示单词组
+        displayWordGroups(data.groups);
+
+    } catch (error) {
+        console.error('加载历史详情失败:', error);
+        document.getElementById('groupsContainer').innerHTML = 
+            '<div class="loading">加载失败，请刷新重试</div>';
+    }
+}
+
+function updateProgressInfo(progress) {
+    let progressHtml = '';
+    if (progress) {
+        const completedStages = progress.completed_stages || [];
+        progressHtml = `
+            <strong>学习进度：</strong><br>
+            当前阶段：${progress.current_stage || '未开始'}<br>
+            已完成阶段：${completedStages.length > 0 ? completedStages.join(', ') : '无'}
+        `;
+    } else {
+        progressHtml = '<strong>学习进度：</strong>尚未开始学习';
+    }
+    document.getElementById('progressInfo').innerHTML = progressHtml;
+}
+
+function groupNumbers(groups) {
+    // 组数由学习计划决定，按接口返回的组逐个显示
+    return Object.keys(groups)
+        .map(key => parseInt(key.replace('group_', ''), 10))
+        .filter(number => !isNaN(number))
+        .sort((a, b) => a - b);
+}
+
+function updateSummaryStats(data) {
+    const groupCards = groupNumbers(data.groups).map(i => `
+        <div class="stat-card">
+            <div class="stat-number">${data.groups[`group_${i}`].length}</div>
+            <div class="stat-label">第${i}组</div>
+        </div>
+    `).join('');
+
+    const statsHtml = `
+        <div class="stat-card">
+            <div class="stat-number">${data.total_words}</div>
+            <div class="stat-label">总单词数</div>
+        </div>
+        ${groupCards}
+    `;
+    document.getElementById('summaryStats').innerHTML = statsHtml;
+}
+
+function displayWordGroups(groups) {
+    let groupsHtml = '';
+
+    for (const i of groupNumbers(groups)) {
+        const groupKey = `group_${i}`;
+        const words = groups[groupKey] || [];
+
+        if (words.length > 0) {
+            const wordsHtml = words.map(word => `
+                <div class="word-item">
+                    <div class="word-text">${word.word}</div>
+                    ${word.phonetic ? `<div class="phonetic">/${word.phonetic}/</div>` : ''}
+                    <div class="translation">${word.translation}</div>
+                    ${word.example_sentence ? `<div class="example"><strong>例句：</strong>${word.example_sentence}</div>` : ''}
+                </div>
+            `).join('');
+
+            const isLongList = words.length > 6;
+
+            groupsHtml += `
+                <div class="group-section">
+                    <div class="group-header">
+                        第${i}组单词 (${words.length}个)
+                    </div>
+                    <div class="words-container">
+                        ${isLongList ? '<button class="expand-btn" onclick="toggleExpand(this)">展开全部</button>' : ''}
+                        <div class="word-grid ${isLongList ? 'collapsed' : ''}">
+                            ${wordsHtml}
+                        </div>
+                    </div>
+                </div>
+            `;
+        }
+    }
+
+    document.getElementById('groupsContainer').innerHTML = groupsHtml;
+}
+
+function toggleExpand(button) {
+    const wordGrid = button.nextElementSibling;
+    if (wordGrid.classList.contains('collapsed')) {
+        wordGrid.classList.remove('collapsed');
+        button.textContent = '收起';
+    } else {
+        wordGrid.classList.add('collapsed');
+        button.textContent = '展开全部';
+    }
+}
+
+// 页面加载时获取详情
+loadHistoryDetail();
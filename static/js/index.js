@@ -0,0 +1,103 @@
+// 创建背景粒子
+function createParticles() {
+    const particlesContainer = document.getElementById('particles');
+    const particleCount = 15;
+
+    for (let i = 0; i < particleCount; i++) {
+        const particle = document.createElement('div');
+        particle.className = 'particle';
+
+        const size = Math.random() * 4 + 2;
+        particle.style.width = size + 'px';
+        particle.style.height = size + 'px';
+        particle.style.left = Math.random() * 100 + '%';
+        particle.style.top = Math.random() * 100 + '%';
+        particle.style.animationDelay = Math.random() * 6 + 's';
+        particle.style.animationDuration = (Math.random() * 4 + 4) + 's';
+
+        particlesContainer.appendChild(particle);
+    }
+}
+
+async function checkTodayStatus() {
+    try {
+        const response = await fetch('/api/today_status');
+        const data = await response.json();
+
+        document.getElementById('statusText').innerHTML = data.message;
+
+        // 获取学习进度
+        const progressResponse = await fetch('/api/learning_progress');
+        const progressData = await progressResponse.json();
+
+        if (progressData.stage_description) {
+            document.getElementById('statusText').innerHTML = 
+                `<strong>当前进度:</strong> ${progressData.stage_description}`;
+        }
+
+        // 检查复习单词数量
+        await checkReviewWords();
+
+        // 根据状态更新界面
+        if (!data.initialized) {
+            document.getElementById('statusText').innerHTML += '<br><em>点击"智能自动学习"开始今日学习！</em>';
+        }
+    } catch (error) {
+        console.error('检查状态失败:', error);
+        document.getElementById('statusText').innerHTML = '<span style="color: #f44336;">状态检查失败，请刷新重试</span>';
+    }
+}
+
+async function checkReviewWords() {
+    try {
+        // 只需要到期总数（在第一页中返回），取一条即可
+        const response = await fetch('/api/review_words?limit=1');
+        const data = await response.json();
+        const dueCount = data.total || 0;
+
+        const reviewEntrance = document.getElementById('reviewEntrance');
+        const reviewStatus = document.getElementById('reviewStatus');
+
+        if (dueCount > 0) {
+            reviewStatus.innerHTML = `<strong>今日需复习 ${dueCount} 个单词</strong><br>点击开始复习`;
+            reviewEntrance.style.borderImage = 'linear-gradient(135deg, #FF9800, #F57C00) 1';
+        } else {
+            reviewStatus.innerHTML = '今日暂无需复习的单词<br>继续学习新单词吧！';
+            reviewEntrance.classList.add('disabled');
+        }
+    } catch (error) {
+        console.error('检查复习单词失败:', error);
+        document.getElementById('reviewStatus').innerHTML = '复习功能暂不可用<br>请稍后再试';
+        document.getElementById('reviewEntrance').classList.add('disabled');
+    }
+}
+
+function startAutoLearning() {
+    window.location.href = '/start_auto_learning';
+}
+
+function startTodayLearning() {
+    window.location.href = '/today_learning';
+}
+
+function startReview() {
+    const reviewEntrance = document.getElementById('reviewEntrance');
+    if (reviewEntrance.classList.contains('disabled')) {
+        return;
+    }
+    window.location.href = '/review';
+}
+
+function viewHistory() {
+    window.location.href = '/history';
+}
+
+function manageWords() {
+    window.location.href = '/word_management';
+}
+
+// 页面加载时初始化
+document.addEventListener('DOMContentLoaded', () => {
+    createParticles();
+    checkTodayStatus();
+});
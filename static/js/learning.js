@@ -0,0 +1,919 @@
+// 答题结果先缓存在本地，每10条或本组完成时批量提交
+const answerBuffer = new AnswerBuffer(10, '/api/submit_answers',
+    rejected => applyRejectedAnswers(sessionBundle, rejected));
+// 今日单词和掌握状态，阶段切换时在本地筛选
+const sessionBundle = new SessionBundle();
+let words = [];
+let currentIndex = 0;
+let currentRound = 1;
+let answeredWords = new Set();
+let roundErrors = [];
+// 写（汉译英）当前单词的答案和服务端评分（Promise），标记掌握时以评分为准
+let currentAnswer = null;
+let currentGrade = null;
+
+async function loadWords() {
+    try {
+        // 先提交缓存的答题结果，再同步数据包（只取回变化的部分），在本地筛选未掌握的单词
+        await answerBuffer.flush();
+        await sessionBundle.refresh();
+
+        words = sessionBundle.wordsFor(dimension, group);
+        if (words.length === 0) {
+            showCompletionMessage();
+            return;
+        }
+
+        showCurrentWord();
+        updateProgress();
+    } catch (error) {
+        console.error('加载单词失败:', error);
+        document.getElementById('learningContent').innerHTML =
+            '<p style="text-align: center; color: red;">加载单词失败，请刷新重试</p>';
+    }
+}
+
+function showCurrentWord() {
+    if (currentIndex >= words.length) {
+        checkRoundCompletion();
+        return;
+    }
+
+    const word = words[currentIndex];
+    let content = '';
+
+    if (dimension === 'listening') {
+        // 听功能界面
+        content = `
+            <div class="word-card">
+                <div class="listening-section">
+                    <button class="play-btn" onclick="playWord('${word.word}')" id="playBtn">
+                        🔊 播放发音
+                    </button>
+
+                    <div class="listening-inputs">
+                        <div class="input-group">
+                            <label for="chineseInput">中文翻译：</label>
+                            <input type="text" class="answer-input" id="chineseInput"
+                                   placeholder="请输入中文翻译">
+                        </div>
+                        <div class="input-group">
+                            <label for="englishInput">英文单词：</label>
+                            <input type="text" class="answer-input" id="englishInput"
+                                   placeholder="请输入英文单词">
+                        </div>
+                    </div>
+
+                    ${word.example_sentence ?
+                        '<div class="example-hint-section">' +
+                            '<button class="hint-btn" onclick="toggleListeningHint()" id="hintBtn">' +
+                                '💡 查看提示' +
+                            '</button>' +
+                            '<div class="example-sentence" id="listeningHint" style="display: none;">' +
+                                '<strong>英文：</strong>' + word.word + '<br>' +
+                                '<strong>例句：</strong>' + word.example_sentence +
+                            '</div>' +
+                        '</div>' : ''}
+
+                    <button class="submit-btn" onclick="submitListeningAnswer()" style="margin-top: 20px;">
+                        提交答案
+                    </button>
+                </div>
+            </div>
+        `;
+    } else if (dimension === 'speaking') {
+        // 说功能界面
+        content = `
+            <div class="word-card">
+                <div class="speaking-section">
+                    <div class="network-status" id="networkStatus">
+                        📶 检测网络状态中...
+                    </div>
+
+                    <div class="word-display" style="font-size: 24px; margin: 20px 0;">
+                        ${word.translation}
+                    </div>
+
+                    ${word.example_sentence ?
+                        '<div class="example-hint-section">' +
+                            '<button class="hint-btn" onclick="toggleSpeakingHint()" id="hintBtn">' +
+                                '💡 查看提示' +
+                            '</button>' +
+                            '<div class="example-sentence" id="speakingHint" style="display: none;">' +
+                                '<strong>英文：</strong>' + word.word + '<br>' +
+                                '<strong>例句：</strong>' + word.example_sentence +
+                            '</div>' +
+                        '</div>' : ''}
+
+                    <div class="recording-controls">
+                        <button class="record-btn" id="recordBtn" onclick="toggleRecording()">
+                            🎤 开始录音
+                        </button>
+                    </div>
+
+                    <div class="playback-section" id="playbackSection">
+                        <p><strong>录音完成！</strong></p>
+                        <button class="play-recording-btn" onclick="playRecording()">
+                            🔊 播放录音
+                        </button>
+                        <div class="recognition-result" id="recognitionResult"></div>
+                    </div>
+
+                    <button class="submit-btn" onclick="submitSpeakingAnswer()" style="margin-top: 20px;">
+                        提交答案
+                    </button>
+                </div>
+            </div>
+        `;
+    } else {
+        // 认识和拼写功能界面
+        const isRecognition = dimension === 'recognition';
+        content = `
+            <div class="word-card">
+                <div class="word-display">
+                    ${isRecognition ? word.word : word.translation}
+                </div>
+                ${isRecognition && word.phonetic ? `<div class="phonetic">/${word.phonetic}/</div>` : ''}
+                ${word.example_sentence && isRecognition ?
+                    '<div class="example-hint-section">' +
+                        '<button class="hint-btn" onclick="toggleExampleSentence()" id="hintBtn">' +
+                            '💡 查看例句' +
+                        '</button>' +
+                        '<div class="example-sentence" id="exampleSentence" style="display: none;">' +
+                            '<strong>例句：</strong>' + word.example_sentence +
+                        '</div>' +
+                    '</div>' : ''}
+            </div>
+
+            <div class="input-section">
+                <input type="text" class="answer-input" id="answerInput"
+                       placeholder="${isRecognition ? '请输入中文翻译' : '请输入英文单词'}"
+                       onkeypress="handleKeyPress(event)">
+                <br>
+                <button class="submit-btn" onclick="submitAnswer()">提交答案</button>
+            </div>
+        `;
+    }
+
+    document.getElementById('learningContent').innerHTML = content;
+
+    // 聚焦到第一个输入框或初始化speaking功能
+    if (dimension === 'listening') {
+        document.getElementById('chineseInput').focus();
+    } else if (dimension === 'speaking') {
+        // 初始化说功能
+        initSpeaking();
+    } else {
+        document.getElementById('answerInput').focus();
+    }
+
+    // 更新导航按钮状态
+    document.getElementById('prevBtn').disabled = currentIndex === 0;
+    document.getElementById('nextBtn').disabled = !answeredWords.has(currentIndex);
+}
+
+function toggleExampleSentence() {
+    try {
+        const hintBtn = document.getElementById('hintBtn');
+        const exampleSentence = document.getElementById('exampleSentence');
+
+        if (hintBtn && exampleSentence) {
+            exampleSentence.style.display = 'block';
+            hintBtn.style.display = 'none';
+        }
+    } catch (error) {
+        console.error('toggleExampleSentence 执行出错：', error);
+    }
+}
+
+function toggleListeningHint() {
+    try {
+        const hintBtn = document.getElementById('hintBtn');
+        const listeningHint = document.getElementById('listeningHint');
+
+        if (hintBtn && listeningHint) {
+            listeningHint.style.display = 'block';
+            hintBtn.style.display = 'none';
+        }
+    } catch (error) {
+        console.error('toggleListeningHint 执行出错：', error);
+    }
+}
+
+function playWord(word) {
+    try {
+        if ('speechSynthesis' in window) {
+            // 停止当前播放
+            speechSynthesis.cancel();
+
+            const utterance = new SpeechSynthesisUtterance(word);
+            utterance.lang = 'en-US';
+            utterance.rate = 0.8; // 稍慢一点
+            utterance.volume = 1;
+
+            speechSynthesis.speak(utterance);
+        } else {
+            alert('您的浏览器不支持语音合成功能');
+        }
+    } catch (error) {
+        console.error('播放单词发音失败：', error);
+        alert('播放失败，请重试');
+    }
+}
+
+function submitListeningAnswer() {
+    const chineseInput = document.getElementById('chineseInput');
+    const englishInput = document.getElementById('englishInput');
+
+    const chineseAnswer = chineseInput.value.trim();
+    const englishAnswer = englishInput.value.trim();
+
+    if (!chineseAnswer && !englishAnswer) {
+        alert('请至少输入一个答案');
+        return;
+    }
+
+    const word = words[currentIndex];
+
+    // 禁用输入框
+    chineseInput.disabled = true;
+    englishInput.disabled = true;
+
+    // 显示答案对比界面
+    showListeningAnswerComparison(chineseAnswer, englishAnswer, word);
+}
+
+// Speaking功能相关变量和函数
+let mediaRecorder = null;
+let audioChunks = [];
+let recordedBlob = null;
+let isRecording = false;
+let isNetworkOnline = false;
+let speechRecognition = null;
+let recognizedText = '';
+let currentTargetWord = '';
+
+function initSpeaking() {
+    // 设置当前目标单词
+    currentTargetWord = words[currentIndex].word;
+
+    // 检测网络状态
+    checkNetworkStatus();
+
+    // 初始化语音识别
+    initSpeechRecognition();
+
+    // 请求麦克风权限
+    requestMicrophonePermission();
+}
+
+function initSpeechRecognition() {
+    if ('webkitSpeechRecognition' in window) {
+        speechRecognition = new webkitSpeechRecognition();
+    } else if ('SpeechRecognition' in window) {
+        speechRecognition = new SpeechRecognition();
+    } else {
+        console.log('浏览器不支持语音识别');
+        return;
+    }
+
+    speechRecognition.continuous = false;
+    speechRecognition.interimResults = false;
+    speechRecognition.lang = 'en-US';
+    speechRecognition.maxAlternatives = 3;
+
+    speechRecognition.onresult = function(event) {
+        if (event.results.length > 0) {
+            recognizedText = event.results[0][0].transcript.toLowerCase().trim();
+            console.log('识别结果:', recognizedText);
+            displayRecognitionResult();
+        }
+    };
+
+    speechRecognition.onerror = function(event) {
+        console.error('语音识别错误:', event.error);
+        const resultEl = document.getElementById('recognitionResult');
+        if (resultEl) {
+            resultEl.innerHTML = `<p>❌ 语音识别失败: ${event.error}</p>`;
+        }
+    };
+
+    speechRecognition.onend = function() {
+        console.log('语音识别结束');
+    };
+}
+
+function checkNetworkStatus() {
+    const statusEl = document.getElementById('networkStatus');
+
+    // 基础网络检测
+    if (navigator.onLine) {
+        // 进一步测试网络连接
+        fetch('https://www.google.com/favicon.ico', {
+            method: 'HEAD',
+            mode: 'no-cors',
+            cache: 'no-cache'
+        }).then(() => {
+            isNetworkOnline = true;
+            statusEl.innerHTML = '📶 在线模式 - 高级语音识别';
+            statusEl.className = 'network-status online';
+        }).catch(() => {
+            isNetworkOnline = false;
+            statusEl.innerHTML = '📴 离线模式 - 基础语音识别';
+            statusEl.className = 'network-status offline';
+        });
+    } else {
+        isNetworkOnline = false;
+        statusEl.innerHTML = '📴 离线模式 - 基础语音识别';
+        statusEl.className = 'network-status offline';
+    }
+}
+
+async function requestMicrophonePermission() {
+    try {
+        const stream = await navigator.mediaDevices.getUserMedia({ audio: true });
+        // 获得权限后立即停止，只是为了获取权限
+        stream.getTracks().forEach(track => track.stop());
+        console.log('麦克风权限已获得');
+    } catch (error) {
+        console.error('麦克风权限被拒绝:', error);
+        alert('需要麦克风权限才能使用说功能，请允许访问麦克风。');
+    }
+}
+
+function toggleSpeakingHint() {
+    try {
+        const hintBtn = document.getElementById('hintBtn');
+        const speakingHint = document.getElementById('speakingHint');
+
+        if (hintBtn && speakingHint) {
+            speakingHint.style.display = 'block';
+            hintBtn.style.display = 'none';
+        }
+    } catch (error) {
+        console.error('toggleSpeakingHint 执行出错：', error);
+    }
+}
+
+async function toggleRecording() {
+    if (isRecording) {
+        stopRecording();
+    } else {
+        startRecording();
+    }
+}
+
+async function startRecording() {
+    try {
+        const stream = await navigator.mediaDevices.getUserMedia({ audio: true });
+
+        // 同时开始录音和语音识别
+        mediaRecorder = new MediaRecorder(stream);
+        audioChunks = [];
+        recognizedText = '';
+
+        mediaRecorder.ondataavailable = (event) => {
+            audioChunks.push(event.data);
+        };
+
+        mediaRecorder.onstop = () => {
+            recordedBlob = new Blob(audioChunks, { type: 'audio/wav' });
+            stream.getTracks().forEach(track => track.stop());
+
+            // 显示播放区域
+            document.getElementById('playbackSection').classList.add('show');
+        };
+
+        // 开始录音
+        mediaRecorder.start();
+
+        // 开始语音识别
+        if (speechRecognition) {
+            speechRecognition.start();
+        } else {
+            console.log('语音识别未初始化');
+        }
+
+        isRecording = true;
+
+        // 更新按钮状态
+        const recordBtn = document.getElementById('recordBtn');
+        recordBtn.textContent = '⏹️ 停止录音';
+        recordBtn.classList.add('recording');
+
+        // 更新识别结果显示
+        const resultEl = document.getElementById('recognitionResult');
+        if (resultEl) {
+            resultEl.innerHTML = '<p>🎤 正在识别语音...</p>';
+        }
+
+    } catch (error) {
+        console.error('开始录音失败:', error);
+        alert('录音失败，请检查麦克风权限或设备。');
+    }
+}
+
+function stopRecording() {
+    if (mediaRecorder && isRecording) {
+        mediaRecorder.stop();
+        isRecording = false;
+
+        // 更新按钮状态
+        const recordBtn = document.getElementById('recordBtn');
+        recordBtn.textContent = '🎤 重新录音';
+        recordBtn.classList.remove('recording');
+    }
+}
+
+function playRecording() {
+    if (recordedBlob) {
+        const audio = new Audio(URL.createObjectURL(recordedBlob));
+        audio.play();
+    } else {
+        alert('没有录音可播放');
+    }
+}
+
+function displayRecognitionResult() {
+    const resultEl = document.getElementById('recognitionResult');
+    if (!resultEl) return;
+
+    const targetWord = currentTargetWord.toLowerCase();
+    const recognized = recognizedText.toLowerCase();
+
+    // 计算相似度和准确性
+    const { score, feedback } = evaluateRecognition(recognized, targetWord);
+
+    let statusIcon = '';
+    let statusClass = '';
+    let suggestion = '';
+
+    if (score >= 0.9) {
+        statusIcon = '✅';
+        statusClass = 'success';
+        suggestion = '发音很准确！';
+    } else if (score >= 0.7) {
+        statusIcon = '⚠️';
+        statusClass = 'warning';
+        suggestion = '发音基本正确，可以再练习一下。';
+    } else if (score >= 0.5) {
+        statusIcon = '❌';
+        statusClass = 'error';
+        suggestion = '发音需要改进，请多练习。';
+    } else {
+        statusIcon = '❌';
+        statusClass = 'error';
+        suggestion = '发音不够清晰，请重新尝试。';
+    }
+
+    resultEl.innerHTML = `
+        <div class="recognition-analysis ${statusClass}">
+            <p><strong>${statusIcon} 识别结果：</strong>"${recognizedText}"</p>
+            <p><strong>目标单词：</strong>"${currentTargetWord}"</p>
+            <p><strong>准确度：</strong>${Math.round(score * 100)}%</p>
+            <p><strong>建议：</strong>${suggestion}</p>
+            ${feedback ? `<p><strong>详细分析：</strong>${feedback}</p>` : ''}
+        </div>
+    `;
+}
+
+function evaluateRecognition(recognized, target) {
+    // 完全匹配
+    if (recognized === target) {
+        return { score: 1.0, feedback: '完全正确！' };
+    }
+
+    // 检查是否包含目标单词
+    if (recognized.includes(target)) {
+        return { score: 0.95, feedback: '单词识别正确，有一些额外的词汇。' };
+    }
+
+    // 计算编辑距离（相似度）
+    const similarity = calculateStringSimilarity(recognized, target);
+
+    let feedback = '';
+    if (similarity > 0.7) {
+        feedback = '发音很接近，可能是口音或语速的问题。';
+    } else if (similarity > 0.5) {
+        feedback = '部分音素正确，建议练习发音。';
+    } else if (recognized.length > 0) {
+        feedback = '识别到了语音，但与目标单词差异较大。';
+    } else {
+        feedback = '没有识别到清晰的语音，请说得更清楚一些。';
+    }
+
+    return { score: similarity, feedback };
+}
+
+function calculateStringSimilarity(str1, str2) {
+    const len1 = str1.length;
+    const len2 = str2.length;
+
+    if (len1 === 0) return len2 === 0 ? 1 : 0;
+    if (len2 === 0) return 0;
+
+    const matrix = [];
+
+    for (let i = 0; i <= len2; i++) {
+        matrix[i] = [i];
+    }
+
+    for (let j = 0; j <= len1; j++) {
+        matrix[0][j] = j;
+    }
+
+    for (let i = 1; i <= len2; i++) {
+        for (let j = 1; j <= len1; j++) {
+            if (str2[i - 1] === str1[j - 1]) {
+                matrix[i][j] = matrix[i - 1][j - 1];
+            } else {
+                matrix[i][j] = Math.min(
+                    matrix[i - 1][j - 1] + 1,
+                    matrix[i][j - 1] + 1,
+                    matrix[i - 1][j] + 1
+                );
+            }
+        }
+    }
+
+    const distance = matrix[len2][len1];
+    const maxLen = Math.max(len1, len2);
+    return (maxLen - distance) / maxLen;
+}
+
+function submitSpeakingAnswer() {
+    if (!recordedBlob) {
+        alert('请先录音');
+        return;
+    }
+
+    const word = words[currentIndex];
+
+    // 显示答案对比界面
+    showSpeakingAnswerComparison(word);
+}
+
+function showSpeakingAnswerComparison(word) {
+    // 生成机器建议
+    let machineSuggestion = '';
+    if (recognizedText) {
+        const targetWord = word.word.toLowerCase();
+        const recognized = recognizedText.toLowerCase();
+
+        // 计算相似度和准确性
+        const { score, feedback } = evaluateRecognition(recognized, targetWord);
+
+        if (score >= 0.9) {
+            machineSuggestion = '<div class="machine-suggestion">✅ 机器建议：发音很准确！</div>';
+        } else if (score >= 0.7) {
+            machineSuggestion = '<div class="machine-suggestion">⚠️ 机器建议：发音基本正确，可以再练习一下。</div>';
+        } else if (score >= 0.5) {
+            machineSuggestion = '<div class="machine-suggestion">❌ 机器建议：发音需要改进，请多练习。</div>';
+        } else {
+            machineSuggestion = '<div class="machine-suggestion">❌ 机器建议：发音不够清晰，建议重新录音。</div>';
+        }
+    } else {
+        machineSuggestion = '<div class="machine-suggestion">ℹ️ 机器建议：未检测到清晰的语音，请重新录音。</div>';
+    }
+
+    const content = `
+        <div class="word-card">
+            <div class="speaking-section">
+                <div class="network-status ${isNetworkOnline ? 'online' : 'offline'}">
+                    ${isNetworkOnline ? '📶 在线模式' : '📴 离线模式'}
+                </div>
+
+                <div class="answer-section">
+                    <div class="your-answer">
+                        <strong>你的任务：</strong>说出英文单词
+                    </div>
+                    <div class="correct-answer">
+                        <strong>正确答案：</strong>${word.word}
+                    </div>
+
+                    ${recognizedText ? `<div class="your-answer" style="margin-top: 10px;"><strong>识别结果：</strong>"${recognizedText}"</div>` : ''}
+
+                    ${machineSuggestion}
+
+                    <div style="margin: 20px 0;">
+                        <button class="play-recording-btn" onclick="playRecording()">
+                            🔊 播放你的录音
+                        </button>
+                        <button class="play-recording-btn" onclick="playWord('${word.word}')">
+                            🔊 播放标准发音
+                        </button>
+                    </div>
+
+                    ${word.example_sentence ? `<div class="example-sentence" style="margin-top: 20px;"><strong>例句：</strong>${word.example_sentence}</div>` : ''}
+
+                    <div class="judgment-section" style="margin-top: 30px;">
+                        <p><strong>请判断你是否已经掌握这个单词的发音：</strong></p>
+                        <button class="judgment-btn mastered-btn" onclick="markWord(true)">我已掌握</button>
+                        <button class="judgment-btn not-mastered-btn" onclick="markWord(false)">我未掌握</button>
+                        <button class="judgment-btn" onclick="skipCurrentWord()"
+                                style="background: linear-gradient(135deg, #B8A082, #A69078); margin-left: 20px;">
+                            我会这个（跳过）
+                        </button>
+                    </div>
+                </div>
+            </div>
+        </div>
+    `;
+
+    document.getElementById('learningContent').innerHTML = content;
+}
+
+async function skipCurrentWord() {
+    const word = words[currentIndex];
+
+    if (confirm(`确定要跳过单词"${word.word}"吗？这会从当前维度的学习中移除该单词。`)) {
+        try {
+            answerBuffer.add(word.id, dimension, 'skip');
+            sessionBundle.mark(word.id, dimension, 'skip');
+
+            // 从当前单词列表中移除该单词
+            words.splice(currentIndex, 1);
+
+            // 调整当前索引
+            if (currentIndex >= words.length) {
+                currentIndex = 0;
+            }
+
+            // 显示下一个单词或检查完成状态
+            if (words.length === 0) {
+                showCompletionMessage();
+            } else {
+                showCurrentWord();
+            }
+
+            updateProgress();
+
+        } catch (error) {
+            console.error('跳过单词失败:', error);
+            alert('跳过失败，请重试');
+        }
+    }
+}
+
+function handleKeyPress(event) {
+    if (event.key === 'Enter') {
+        submitAnswer();
+    }
+}
+
+async function submitAnswer() {
+    const input = document.getElementById('answerInput');
+    const userAnswer = input.value.trim();
+
+    if (!userAnswer) {
+        alert('请输入答案');
+        return;
+    }
+
+    const word = words[currentIndex];
+    const correctAnswer = dimension === 'recognition' ? word.translation : word.word;
+
+    // 禁用输入框，防止修改
+    input.disabled = true;
+
+    // 显示答案对比界面
+    showAnswerComparison(userAnswer, correctAnswer, word);
+}
+
+function showListeningAnswerComparison(chineseAnswer, englishAnswer, word) {
+    currentAnswer = null;
+    currentGrade = null;
+    const content = `
+        <div class="word-card">
+            <div class="listening-section">
+                <button class="play-btn" onclick="playWord('${word.word}')" style="margin-bottom: 20px;">
+                    🔊 重播发音
+                </button>
+
+                <div class="answer-section">
+                    <div class="your-answer">
+                        <strong>你的中文翻译：</strong>${chineseAnswer || '（未填写）'}
+                    </div>
+                    <div class="correct-answer">
+                        <strong>正确中文翻译：</strong>${word.translation}
+                    </div>
+
+                    <div class="your-answer" style="margin-top: 15px;">
+                        <strong>你的英文单词：</strong>${englishAnswer || '（未填写）'}
+                    </div>
+                    <div class="correct-answer">
+                        <strong>正确英文单词：</strong>${word.word}
+                    </div>
+
+                    <div id="machineSuggestion" class="machine-suggestion" style="display: none;"></div>
+
+                    ${word.example_sentence ? `<div class="example-sentence" style="margin-top: 20px;"><strong>例句：</strong>${word.example_sentence}</div>` : ''}
+
+                    <div class="judgment-section" style="margin-top: 30px;">
+                        <p><strong>请判断你是否已经掌握这个单词：</strong></p>
+                        <button class="judgment-btn mastered-btn" onclick="markWord(true)">我已掌握</button>
+                        <button class="judgment-btn not-mastered-btn" onclick="markWord(false)">我未掌握</button>
+                        <button class="judgment-btn" onclick="skipCurrentWord()"
+                                style="background: linear-gradient(135deg, #B8A082, #A69078); margin-left: 20px;">
+                            我会这个（跳过）
+                        </button>
+                    </div>
+                </div>
+            </div>
+        </div>
+    `;
+
+    document.getElementById('learningContent').innerHTML = content;
+
+    // 为英文单词提供机器建议（服务端评分）
+    if (englishAnswer) {
+        showMachineSuggestion('machineSuggestion',
+            [{ word_id: word.id, dimension: 'listening', answer: englishAnswer }], ['英文']);
+    }
+}
+
+function showAnswerComparison(userAnswer, correctAnswer, word) {
+    const isRecognition = dimension === 'recognition';
+    currentAnswer = null;
+    currentGrade = null;
+
+    const content = `
+        <div class="word-card">
+            <div class="word-display">
+                ${isRecognition ? word.word : word.translation}
+            </div>
+            ${isRecognition && word.phonetic ? `<div class="phonetic">/${word.phonetic}/</div>` : ''}
+            ${word.example_sentence ? `<div class="example-sentence"><strong>例句：</strong>${word.example_sentence}</div>` : ''}
+        </div>
+
+        <div class="answer-section">
+            <div class="your-answer">你的答案：${userAnswer}</div>
+            <div class="correct-answer">正确答案：${correctAnswer}</div>
+            <div id="machineSuggestion" class="machine-suggestion" style="display: none;"></div>
+
+            <div class="judgment-section">
+                <p><strong>请判断你是否已经掌握这个单词：</strong></p>
+                <button class="judgment-btn mastered-btn" onclick="markWord(true)">我已掌握</button>
+                <button class="judgment-btn not-mastered-btn" onclick="markWord(false)">我未掌握</button>
+                <button class="judgment-btn" onclick="skipCurrentWord()"
+                        style="background: linear-gradient(135deg, #B8A082, #A69078); margin-left: 20px;">
+                    我会这个（跳过）
+                </button>
+            </div>
+        </div>
+    `;
+
+    document.getElementById('learningContent').innerHTML = content;
+
+    // 写（汉译英）由服务端评分，给出拼写错误类型
+    if (!isRecognition) {
+        currentAnswer = userAnswer;
+        currentGrade = showMachineSuggestion('machineSuggestion',
+            [{ word_id: word.id, dimension: dimension, answer: userAnswer }]);
+    }
+}
+
+async function markWord(mastered) {
+    const word = words[currentIndex];
+
+    try {
+        // 服务端评分不正确的答案不能记为掌握，本地状态与服务端保持一致
+        if (mastered && currentGrade) {
+            const grades = await currentGrade;
+            if (grades && grades[0] && !grades[0].correct) {
+                mastered = false;
+            }
+        }
+        answerBuffer.add(word.id, dimension, mastered ? 'mastered' : 'not_mastered', currentAnswer);
+        sessionBundle.mark(word.id, dimension, mastered ? 'mastered' : 'not_mastered');
+
+        // 记录答题状态
+        answeredWords.add(currentIndex);
+        if (!mastered) {
+            roundErrors.push(currentIndex);
+        }
+
+        // 自动进入下一个单词
+        setTimeout(() => {
+            nextWord();
+        }, 500);
+
+    } catch (error) {
+        console.error('标记单词状态失败:', error);
+        alert('保存失败，请重试');
+    }
+}
+
+function nextWord() {
+    currentIndex++;
+    showCurrentWord();
+    updateProgress();
+}
+
+function previousWord() {
+    if (currentIndex > 0) {
+        currentIndex--;
+        showCurrentWord();
+        updateProgress();
+    }
+}
+
+function checkRoundCompletion() {
+    if (roundErrors.length === 0) {
+        // 本轮全部正确，完成学习
+        showCompletionMessage();
+    } else {
+        // 有错误，需要重新开始
+        startNewRound();
+    }
+}
+
+function startNewRound() {
+    currentRound++;
+    const errorWords = roundErrors.map(index => words[index]);
+
+    // 打乱错误单词顺序
+    for (let i = errorWords.length - 1; i > 0; i--) {
+        const j = Math.floor(Math.random() * (i + 1));
+        [errorWords[i], errorWords[j]] = [errorWords[j], errorWords[i]];
+    }
+
+    words = errorWords;
+    currentIndex = 0;
+    answeredWords.clear();
+    roundErrors = [];
+
+    alert(`第${currentRound}轮开始！需要重新学习${words.length}个未掌握的单词`);
+    showCurrentWord();
+    updateProgress();
+}
+
+function updateProgress() {
+    const totalWords = words.length;
+    const completedWords = answeredWords.size;
+    const progressPercent = totalWords > 0 ? (completedWords / totalWords) * 100 : 0;
+
+    document.getElementById('progressFill').style.width = progressPercent + '%';
+    document.getElementById('progressText').textContent =
+        `第${currentRound}轮 - 进度：${completedWords}/${totalWords} (${Math.round(progressPercent)}%)`;
+}
+
+function showCompletionMessage() {
+    answerBuffer.flush().catch(error => console.error('提交答题记录失败:', error));
+
+    const content = `
+        <div class="completion-message">
+            <h2>🎉 恭喜完成第${group}组${
+                dimension === 'recognition' ? '认（英译汉）' :
+                dimension === 'spelling' ? '写（汉译英）' :
+                dimension === 'listening' ? '听（听音写义）' :
+                '说（看译发音）'
+            }学习！</h2>
+            <p>你已经掌握了这组的所有单词，可以继续其他维度的学习或重新练习。</p>
+            <div style="margin-top: 30px;">
+                <button class="submit-btn" onclick="resetAndRestart()" style="margin-right: 15px;">
+                    🔄 重置并重新开始
+                </button>
+                <button class="submit-btn" onclick="window.location.href='/today_learning'">
+                    📚 返回选择其他学习
+                </button>
+            </div>
+        </div>
+    `;
+
+    document.getElementById('learningContent').innerHTML = content;
+    document.getElementById('progressFill').style.width = '100%';
+    document.getElementById('progressText').textContent = '已完成！';
+}
+
+async function resetAndRestart() {
+    try {
+        await answerBuffer.flush();
+
+        const response = await fetch('/api/reset_group_progress', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({
+                group: group,
+                dimension: dimension
+            })
+        });
+
+        const result = await response.json();
+        if (result.success) {
+            alert(result.message);
+            // 重新加载页面开始学习
+            window.location.reload();
+        } else {
+            alert('重置失败: ' + result.error);
+        }
+    } catch (error) {
+        console.error('重置失败:', error);
+        alert('重置失败，请重试');
+    }
+}
+
+// 页面加载时开始加载单词
+loadWords();
@@ -0,0 +1,23 @@
+// 创建彩屑动画
+function createConfetti() {
+    const confetti = document.getElementById('confetti');
+
+    for (let i = 0; i < 50; i++) {
+        const piece = document.createElement('div');
+        piece.className = 'confetti-piece';
+
+        // 随机位置和延迟
+        piece.style.left = Math.random() * 100 + '%';
+        piece.style.animationDelay = Math.random() * 3 + 's';
+        piece.style.animationDuration = (Math.random() * 3 + 2) + 's';
+
+        confetti.appendChild(piece);
+    }
+}
+
+function startReview() {
+    window.location.href = '/review';
+}
+
+// 页面加载时创建彩屑
+window.addEventListener('load', createConfetti);
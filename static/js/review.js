@@ -0,0 +1,298 @@
+let reviewWords = [];
+let currentIndex = 0;
+let correctCount = 0;
+let reviewTotal = 0;
+let queueStats = null;
+let pageRequest = null;
+const loadedIds = new Set();
+
+// 每次从服务端取的单词数；剩余未复习的单词少于这个数量时预取
+const BATCH_SIZE = 10;
+
+// 按优先级取接下来的单词；服务端会先返回已取出但未答题的单词，这里按 id 去重
+async function fetchReviewPage() {
+    const held = reviewWords.length - currentIndex;
+    const response = await fetch(`/api/review_next?count=${held + BATCH_SIZE}`);
+    const page = await response.json();
+    if (page.error) {
+        throw new Error(page.error);
+    }
+    for (const item of page.items) {
+        if (!loadedIds.has(item.id)) {
+            loadedIds.add(item.id);
+            reviewWords.push(item);
+        }
+    }
+    queueStats = page;
+    reviewTotal = currentIndex + page.remaining_today;
+}
+
+function hasMoreWords() {
+    return queueStats !== null && queueStats.remaining_today > reviewWords.length - currentIndex;
+}
+
+// 按需加载下一批；同一时间只有一个请求
+function loadMoreIfNeeded() {
+    if (!hasMoreWords() || pageRequest || reviewWords.length - currentIndex > BATCH_SIZE) {
+        return pageRequest;
+    }
+    pageRequest = fetchReviewPage()
+        .catch(error => console.error('加载更多复习单词失败:', error))
+        .finally(() => { pageRequest = null; });
+    return pageRequest;
+}
+
+async function loadReviewWords() {
+    try {
+        await fetchReviewPage();
+
+        if (reviewWords.length === 0) {
+            showNoWordsMessage();
+            return;
+        }
+
+        updateStats();
+        showCurrentWord();
+        updateProgress();
+    } catch (error) {
+        console.error('加载复习单词失败:', error);
+        document.getElementById('reviewContent').innerHTML = 
+            '<p style="text-align: center; color: red;">加载失败，请刷新重试</p>';
+    }
+}
+
+function updateStats() {
+    document.getElementById('reviewStats').innerHTML = 
+        `<p><strong>今日需复习单词：${reviewTotal}个</strong><br>按遗忘风险从高到低排列` +
+        (queueStats.daily_cap !== null && queueStats.backlog > reviewTotal
+            ? `，共积压${queueStats.backlog}个，每日上限${queueStats.daily_cap}个` : '') +
+        '</p>';
+}
+
+async function loadForecast(days = 14) {
+    try {
+        const response = await fetch(`/api/review_forecast?days=${days}`);
+        const forecast = await response.json();
+        if (forecast.total === 0) {
+            return;
+        }
+
+        const start = new Date(forecast.start + 'T00:00:00');
+        const peak = Math.max(forecast.peak, 1);
+        document.getElementById('forecastChart').innerHTML = forecast.counts.map((count, offset) => {
+            const day = new Date(start);
+            day.setDate(start.getDate() + offset);
+            const label = offset === 0 ? '今天' : `${day.getMonth() + 1}/${day.getDate()}`;
+            return `
+                <div class="forecast-day" title="${label}：${count}个">
+                    <div class="forecast-count">${count || ''}</div>
+                    <div class="forecast-bar" style="height: ${Math.round(count / peak * 100)}%"></div>
+                    <div class="forecast-label">${label}</div>
+                </div>
+            `;
+        }).join('');
+        document.getElementById('forecastSection').style.display = '';
+    } catch (error) {
+        console.error('加载复习量预测失败:', error);
+    }
+}
+
+function showCurrentWord() {
+    if (currentIndex >= reviewWords.length) {
+        showCompletionMessage();
+        return;
+    }
+
+    const word = reviewWords[currentIndex];
+    const intervalText = getIntervalText(word.review_interval);
+
+    const content = `
+        <div class="word-card">
+            <div class="review-info">
+                📅 首次学习：${word.first_studied_at} | 复习间隔：${intervalText}
+            </div>
+            <div class="word-display">${word.word}</div>
+            ${word.phonetic ? `<div class="phonetic">/${word.phonetic}/</div>` : ''}
+            ${word.example_sentence ? `<div class="example-sentence"><strong>例句：</strong>${word.example_sentence}</div>` : ''}
+        </div>
+
+        <div class="input-section">
+            <input type="text" class="answer-input" id="answerInput" 
+                   placeholder="请输入中文翻译" 
+                   onkeypress="handleKeyPress(event)">
+            <br>
+            <button class="submit-btn" onclick="submitAnswer()">提交答案</button>
+        </div>
+    `;
+
+    document.getElementById('reviewContent').innerHTML = content;
+    document.getElementById('answerInput').focus();
+}
+
+function getIntervalText(interval) {
+    const intervalMap = {
+        1: '1天', 2: '2天', 4: '4天', 7: '1周',
+        15: '半月', 30: '1月', 60: '2月'
+    };
+    return intervalMap[interval] || `${interval}天`;
+}
+
+function handleKeyPress(event) {
+    if (event.key === 'Enter') {
+        submitAnswer();
+    }
+}
+
+async function submitAnswer() {
+    const input = document.getElementById('answerInput');
+    const userAnswer = input.value.trim();
+
+    if (!userAnswer) {
+        alert('请输入答案');
+        return;
+    }
+
+    const word = reviewWords[currentIndex];
+    input.disabled = true;
+
+    showAnswerComparison(userAnswer, word.translation, word);
+}
+
+function showAnswerComparison(userAnswer, correctAnswer, word) {
+    const intervalText = getIntervalText(word.review_interval);
+
+    const content = `
+        <div class="word-card">
+            <div class="review-info">
+                📅 首次学习：${word.first_studied_at} | 复习间隔：${intervalText}
+            </div>
+            <div class="word-display">${word.word}</div>
+            ${word.phonetic ? `<div class="phonetic">/${word.phonetic}/</div>` : ''}
+            ${word.example_sentence ? `<div class="example-sentence"><strong>例句：</strong>${word.example_sentence}</div>` : ''}
+        </div>
+
+        <div class="answer-section">
+            <div class="your-answer">你的答案：${userAnswer}</div>
+            <div class="correct-answer">正确答案：${correctAnswer}</div>
+            <div id="machineSuggestion" class="machine-suggestion" style="display: none;"></div>
+
+            <div class="judgment-section">
+                <p><strong>请判断你的复习结果：</strong></p>
+                <button class="judgment-btn correct-btn" onclick="markReview(true)">
+                    复习正确 ✅
+                </button>
+                <button class="judgment-btn wrong-btn" onclick="markReview(false)">
+                    复习错误 ❌
+                </button>
+            </div>
+        </div>
+    `;
+
+    document.getElementById('reviewContent').innerHTML = content;
+    showMachineSuggestion('machineSuggestion', [{ review_id: word.id, answer: userAnswer }]);
+}
+
+async function markReview(correct) {
+    const word = reviewWords[currentIndex];
+
+    try {
+        const response = await fetch('/api/review_word', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({
+                review_id: word.id,
+                success: correct
+            })
+        });
+
+        const result = await response.json();
+        if (!result.success) {
+            throw new Error('更新复习记录失败');
+        }
+
+        if (correct) {
+            correctCount++;
+        }
+
+        setTimeout(() => {
+            nextWord();
+        }, 500);
+
+    } catch (error) {
+        console.error('更新复习记录失败:', error);
+        alert('保存失败，请重试');
+    }
+}
+
+async function nextWord() {
+    currentIndex++;
+    if (currentIndex >= reviewWords.length) {
+        // 预取尚未完成时等待下一页
+        await loadMoreIfNeeded();
+    } else {
+        loadMoreIfNeeded();
+    }
+    showCurrentWord();
+    updateProgress();
+}
+
+function updateProgress() {
+    const totalWords = Math.max(reviewTotal, reviewWords.length);
+    const completedWords = currentIndex;
+    const progressPercent = totalWords > 0 ? (completedWords / totalWords) * 100 : 0;
+
+    document.getElementById('progressFill').style.width = progressPercent + '%';
+    document.getElementById('progressText').textContent = 
+        `复习进度：${completedWords}/${totalWords} (${Math.round(progressPercent)}%)`;
+}
+
+function showCompletionMessage() {
+    const accuracy = currentIndex > 0 ? Math.round((correctCount / currentIndex) * 100) : 0;
+
+    const content = `
+        <div class="completion-message">
+            <h2>🎉 今日复习完成！</h2>
+            <p><strong>复习统计：</strong></p>
+            <p>总复习单词：${currentIndex}个</p>
+            <p>复习正确：${correctCount}个</p>
+            <p>正确率：${accuracy}%</p>
+            <br>
+            <p>复习正确的单词将按艾宾浩斯遗忘曲线安排下次复习时间</p>
+            <p>复习错误的单词将在明天重新复习</p>
+            <button class="submit-btn" onclick="window.location.href='/'">
+                返回主页
+            </button>
+        </div>
+    `;
+
+    document.getElementById('reviewContent').innerHTML = content;
+    document.getElementById('progressFill').style.width = '100%';
+    document.getElementById('progressText').textContent = '复习完成！';
+}
+
+function showNoWordsMessage() {
+    const capReached = queueStats !== null && queueStats.backlog > 0;
+    const content = `
+        <div class="no-words-message">
+            <h2>📖 今日无需复习</h2>
+            ${capReached
+                ? `<p>今天已复习${queueStats.reviewed}个单词，达到每日上限</p>
+                   <p>剩余${queueStats.backlog}个单词将在之后几天按优先级继续复习</p>`
+                : `<p>太棒了！今天没有需要复习的单词</p>
+                   <p>继续保持学习新单词，或者查看历史记录</p>`}
+            <button class="submit-btn" onclick="window.location.href='/'">
+                返回主页
+            </button>
+        </div>
+    `;
+
+    document.getElementById('reviewContent').innerHTML = content;
+    document.getElementById('reviewStats').innerHTML = 
+        '<p><strong>今日需复习单词：0个</strong></p>';
+}
+
+// 页面加载时开始加载复习单词
+loadReviewWords();
+loadForecast();
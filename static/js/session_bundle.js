@@ -0,0 +1,107 @@
+// 今日学习数据包
+// 从 /api/session_bundle 一次取得当天所有组的单词和各维度的掌握位图，保存在 sessionStorage 中，
+// 各学习页面和各阶段在本地筛选未掌握的单词；之后刷新时带上版本号，服务端只返回变化的部分。
+class SessionBundle {
+    constructor(endpoint = '/api/session_bundle', storageKey = 'sessionBundle') {
+        this.endpoint = endpoint;
+        this.storageKey = storageKey;
+        this.version = null;
+        this.fields = [];
+        this.words = [];
+        this.mastery = {};
+        this.restore();
+    }
+
+    restore() {
+        try {
+            const saved = JSON.parse(sessionStorage.getItem(this.storageKey));
+            if (saved && saved.version) {
+                this.version = saved.version;
+                this.fields = saved.fields;
+                this.words = saved.words;
+                this.mastery = saved.mastery;
+            }
+        } catch (error) {
+            sessionStorage.removeItem(this.storageKey);
+        }
+    }
+
+    save() {
+        try {
+            sessionStorage.setItem(this.storageKey, JSON.stringify({
+                version: this.version,
+                fields: this.fields,
+                words: this.words,
+                mastery: this.mastery
+            }));
+        } catch (error) {
+            // 存储空间不足时只保留内存中的数据
+        }
+    }
+
+    // 与服务端同步：版本未变化时不传输数据，词池未变化时只更新掌握位图
+    async refresh() {
+        const url = this.version
+            ? `${this.endpoint}?since=${encodeURIComponent(this.version)}`
+            : this.endpoint;
+        const response = await fetch(url);
+        const data = await response.json();
+        if (data.error) {
+            throw new Error(data.error);
+        }
+
+        if (!data.unchanged) {
+            if (data.words) {
+                this.fields = data.fields;
+                this.words = data.words;
+            }
+            this.mastery = {};
+            for (const [dimension, encoded] of Object.entries(data.mastery)) {
+                this.mastery[dimension] = SessionBundle.decodeBitmap(encoded);
+            }
+        }
+        this.version = data.version;
+        this.save();
+    }
+
+    static decodeBitmap(encoded) {
+        const binary = atob(encoded);
+        const bits = new Array(binary.length);
+        for (let i = 0; i < binary.length; i++) {
+            bits[i] = binary.charCodeAt(i);
+        }
+        return bits;
+    }
+
+    isMastered(dimension, position) {
+        const bits = this.mastery[dimension];
+        return Boolean(bits && (bits[position >> 3] & (1 << (position & 7))));
+    }
+
+    // 返回指定维度、指定组中未掌握的单词（与 /api/get_words 返回的格式一致）
+    wordsFor(dimension, group) {
+        const result = [];
+        this.words.forEach((row, position) => {
+            const word = {};
+            this.fields.forEach((field, i) => { word[field] = row[i]; });
+            if (word.group === group && !this.isMastered(dimension, position)) {
+                delete word.group;
+                result.push(word);
+            }
+        });
+        return result;
+    }
+
+    // 答题后更新内存中的位图；不写入 sessionStorage，保存的始终是与版本号对应的服务端状态
+    mark(wordId, dimension, action) {
+        if (action !== 'mastered' && action !== 'skip') {
+            return;
+        }
+        const idIndex = this.fields.indexOf('id');
+        const position = this.words.findIndex(row => row[idIndex] === wordId);
+        const bits = this.mastery[dimension];
+        if (position >= 0 && bits) {
+            bits[position >> 3] |= 1 << (position & 7);
+        }
+    }
+}
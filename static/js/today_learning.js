@@ -0,0 +1,86 @@
+let selectedGroup = null;
+let selectedDimension = null;
+let progress = {};
+
+async function loadProgress() {
+    try {
+        const response = await fetch('/api/learning_progress');
+        progress = await response.json();
+
+        updateUI();
+    } catch (error) {
+        console.error('加载进度失败:', error);
+        document.getElementById('progressInfo').textContent = '加载进度失败';
+    }
+}
+
+function updateUI() {
+    const progressInfo = document.getElementById('progressInfo');
+
+    if (progress.current_stage) {
+        progressInfo.innerHTML = `
+            <strong>当前进度：</strong>${progress.current_stage}<br>
+            <strong>当前组别：</strong>第${progress.current_group}组<br>
+            <strong>当前维度：</strong>${getDimensionName(progress.current_dimension)}
+        `;
+    } else {
+        progressInfo.textContent = '请选择第一组开始学习';
+    }
+}
+
+function getDimensionName(dimension) {
+    const names = {
+        'recognition': '认（英译汉）',
+        'spelling': '写（汉译英）',
+        'listening': '听（听音写义）',
+        'speaking': '说（看译发音）'
+    };
+    return names[dimension] || dimension;
+}
+
+function selectGroup(groupNum) {
+    selectedGroup = groupNum;
+
+    // 更新组别按钮样式
+    document.querySelectorAll('.group-button').forEach(btn => {
+        btn.classList.remove('active');
+    });
+    document.getElementById(`group${groupNum}`).classList.add('active');
+
+    updateStartButton();
+}
+
+function selectDimension(dimension) {
+    // 所有维度都已开发完成
+
+    selectedDimension = dimension;
+
+    // 更新维度按钮样式
+    document.querySelectorAll('.dimension-button').forEach(btn => {
+        btn.classList.remove('active');
+    });
+    document.getElementById(dimension).classList.add('active');
+
+    updateStartButton();
+}
+
+function updateStartButton() {
+    const button = document.getElementById('startButton');
+
+    if (selectedGroup && selectedDimension) {
+        button.disabled = false;
+        button.textContent = `开始第${selectedGroup}组${getDimensionName(selectedDimension)}学习`;
+    } else {
+        button.disabled = true;
+        button.textContent = '选择组别和维度开始学习';
+    }
+}
+
+function startLearning() {
+    if (selectedGroup && selectedDimension) {
+        window.location.href = `/learning/${selectedDimension}/${selectedGroup}`;
+    }
+}
+
+// 页面加载时获取进度
+loadProgress();
@@ -0,0 +1,382 @@
+let currentSearchWord = '';
+let suggestionTimer = null;
+let suggestionPage = 1;
+
+// 输入时联想单词（前缀补全），停止输入150毫秒后再请求
+function handleSearchInput() {
+    clearTimeout(suggestionTimer);
+    suggestionTimer = setTimeout(() => loadSuggestions(1), 150);
+}
+
+async function loadSuggestions(page) {
+    const query = document.getElementById('searchWord').value.trim();
+    const listDiv = document.getElementById('suggestionList');
+    if (!query) {
+        listDiv.innerHTML = '';
+        return;
+    }
+
+    try {
+        const response = await fetch(`/api/word_suggestions?q=${encodeURIComponent(query)}&page=${page}&page_size=8`);
+        const result = await response.json();
+        if (result.error || query !== document.getElementById('searchWord').value.trim()) {
+            return;
+        }
+
+        suggestionPage = page;
+        let html = result.items.map(item => `
+            <div class="suggestion-item" onclick="selectSuggestion('${item.word.replace(/'/g, "\\'")}')">
+                <strong>${item.word}</strong> <span>${item.translation}</span>
+            </div>
+        `).join('');
+        if (result.items.length === 0 && result.did_you_mean.length > 0) {
+            html = '<div class="suggestion-hint">您是不是要找：</div>' + result.did_you_mean.map(item => `
+                <div class="suggestion-item" onclick="selectSuggestion('${item.word.replace(/'/g, "\\'")}')">
+                    <strong>${item.word}</strong> <span>${item.translation}</span>
+                </div>
+            `).join('');
+        }
+        if (page > 1 || result.has_more) {
+            html += `
+                <div class="suggestion-pager">
+                    ${page > 1 ? `<button class="btn btn-sm" onclick="loadSuggestions(${page - 1})">上一页</button>` : ''}
+                    <span>共 ${result.total} 个</span>
+                    ${result.has_more ? `<button class="btn btn-sm" onclick="loadSuggestions(${page + 1})">下一页</button>` : ''}
+                </div>
+            `;
+        }
+        listDiv.innerHTML = html;
+    } catch (error) {
+        console.error('获取联想单词失败:', error);
+    }
+}
+
+function selectSuggestion(word) {
+    document.getElementById('searchWord').value = word;
+    document.getElementById('suggestionList').innerHTML = '';
+    searchWord();
+}
+
+function handleSearchKeyPress(event) {
+    if (event.key === 'Enter') {
+        searchWord();
+    }
+}
+
+async function searchWord() {
+    const word = document.getElementById('searchWord').value.trim();
+    if (!word) {
+        showMessage('请输入要搜索的单词', 'error');
+        return;
+    }
+
+    currentSearchWord = word;
+    clearTimeout(suggestionTimer);
+    document.getElementById('suggestionList').innerHTML = '';
+    const resultDiv = document.getElementById('searchResult');
+    resultDiv.innerHTML = '<div class="loading">搜索中...</div>';
+
+    try {
+        const response = await fetch('/api/search_word', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({ word: word })
+        });
+
+        const result = await response.json();
+
+        if (result.found) {
+            showFoundWord(result.word);
+        } else {
+            showWordNotFound(result.did_you_mean || []);
+        }
+    } catch (error) {
+        console.error('搜索失败:', error);
+        resultDiv.innerHTML = '<div class="message error">搜索失败，请重试</div>';
+    }
+}
+
+function showFoundWord(word) {
+    const resultDiv = document.getElementById('searchResult');
+    resultDiv.innerHTML = `
+        <div class="search-result found">
+            <div class="word-info">
+                <h3>${word.word}</h3>
+                ${word.phonetic ? `<p><strong>音标：</strong>/${word.phonetic}/</p>` : ''}
+                <p><strong>翻译：</strong>${word.translation}</p>
+                ${word.example_sentence ? `<p><strong>例句：</strong>${word.example_sentence}</p>` : ''}
+                <p><strong>状态：</strong>${getStatusText(word.status)}</p>
+            </div>
+            <div style="margin-top: 15px;">
+                <button class="btn btn-success" onclick="addWordToToday(${word.id})">
+                    添加到今日学习
+                </button>
+            </div>
+        </div>
+    `;
+    hideManualEntryForm();
+}
+
+function showWordNotFound(didYouMean) {
+    const resultDiv = document.getElementById('searchResult');
+    const hint = didYouMean.length > 0
+        ? `<p>您是不是要找：${didYouMean.map(word =>
+            `<a href="#" onclick="selectSuggestion('${word.replace(/'/g, "\\'")}'); return false;">${word}</a>`).join('、')}</p>`
+        : '';
+    resultDiv.innerHTML = `
+        <div class="search-result not-found">
+            <p><strong>未找到单词 "${currentSearchWord}"</strong></p>
+            ${hint}
+            <p>您可以手动录入这个新单词到词库中</p>
+            <button class="btn btn-primary" onclick="showManualEntryForm()">
+                手动录入新单词
+            </button>
+        </div>
+    `;
+}
+
+function showManualEntryForm() {
+    const form = document.getElementById('manualEntryForm');
+    form.style.display = 'block';
+    document.getElementById('newWord').value = currentSearchWord;
+    document.getElementById('newWord').focus();
+}
+
+function hideManualEntryForm() {
+    const form = document.getElementById('manualEntryForm');
+    form.style.display = 'none';
+    // 清空表单
+    document.getElementById('newWord').value = '';
+    document.getElementById('newPhonetic').value = '';
+    document.getElementById('newTranslation').value = '';
+    document.getElementById('newExample').value = '';
+}
+
+async function addWordToToday(wordId) {
+    try {
+        const response = await fetch('/api/add_word_to_today', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({ word_id: wordId })
+        });
+
+        const result = await response.json();
+
+        if (result.success) {
+            showMessage(result.message, 'success');
+            loadTodayWords(); // 刷新今日单词列表
+        } else {
+            showMessage(result.error, 'error');
+        }
+    } catch (error) {
+        console.error('添加失败:', error);
+        showMessage('添加失败，请重试', 'error');
+    }
+}
+
+async function createNewWord() {
+    const word = document.getElementById('newWord').value.trim();
+    const phonetic = document.getElementById('newPhonetic').value.trim();
+    const translation = document.getElementById('newTranslation').value.trim();
+    const example = document.getElementById('newExample').value.trim();
+
+    if (!word || !translation) {
+        showMessage('单词和翻译为必填项', 'error');
+        return;
+    }
+
+    try {
+        const response = await fetch('/api/create_and_add_word', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({
+                word: word,
+                phonetic: phonetic,
+                translation: translation,
+                example_sentence: example
+            })
+        });
+
+        const result = await response.json();
+
+        if (result.success) {
+            showMessage(result.message, 'success');
+            hideManualEntryForm();
+            document.getElementById('searchWord').value = '';
+            document.getElementById('searchResult').innerHTML = '';
+            loadTodayWords(); // 刷新今日单词列表
+        } else {
+            showMessage(result.error, 'error');
+        }
+    } catch (error) {
+        console.error('创建失败:', error);
+        showMessage('创建失败，请重试', 'error');
+    }
+}
+
+let fulltextCursor = null;
+
+function handleFulltextKeyPress(event) {
+    if (event.key === 'Enter') {
+        searchFulltext();
+    }
+}
+
+// 按释义/例句检索，loadMore 为 true 时用上一页返回的游标继续加载
+async function searchFulltext(loadMore = false) {
+    const query = document.getElementById('fulltextQuery').value.trim();
+    const resultDiv = document.getElementById('fulltextResult');
+    const moreButton = document.getElementById('fulltextMore');
+    if (!query) {
+        showMessage('请输入要查找的内容', 'error');
+        return;
+    }
+    if (!loadMore) {
+        fulltextCursor = null;
+        resultDiv.innerHTML = '<div class="loading">查找中...</div>';
+    }
+
+    try {
+        let url = `/api/search_fulltext?q=${encodeURIComponent(query)}&limit=20`;
+        if (loadMore && fulltextCursor) {
+            url += `&cursor=${encodeURIComponent(fulltextCursor)}`;
+        }
+        const response = await fetch(url);
+        const result = await response.json();
+        if (result.error) {
+            throw new Error(result.error);
+        }
+
+        const html = result.items.map(item => `
+            <div class="word-item">
+                <div class="word-details">
+                    <h4>${item.word}</h4>
+                    ${item.phonetic ? `<p><strong>音标：</strong>/${item.phonetic}/</p>` : ''}
+                    <p><strong>翻译：</strong>${item.translation_snippet || item.translation}</p>
+                    ${item.example_snippet ? `<p><strong>例句：</strong>${item.example_snippet}</p>` : ''}
+                    <p><strong>状态：</strong>${getStatusText(item.status)}</p>
+                </div>
+                <div class="word-actions">
+                    <button class="btn btn-success btn-sm" onclick="addWordToToday(${item.id})">添加到今日学习</button>
+                </div>
+            </div>
+        `).join('');
+
+        if (loadMore) {
+            resultDiv.insertAdjacentHTML('beforeend', html);
+        } else {
+            resultDiv.innerHTML = html || '<div class="loading">没有找到相关单词</div>';
+        }
+        fulltextCursor = result.next_cursor;
+        moreButton.style.display = fulltextCursor ? 'inline-block' : 'none';
+    } catch (error) {
+        console.error('查找失败:', error);
+        resultDiv.innerHTML = '<div class="message error">查找失败，请重试</div>';
+        moreButton.style.display = 'none';
+    }
+}
+
+async function loadTodayWords() {
+    const listDiv = document.getElementById('todayWordsList');
+    listDiv.innerHTML = '<div class="loading">加载中...</div>';
+
+    try {
+        const response = await fetch('/api/get_today_words');
+        const words = await response.json();
+
+        if (words.length === 0) {
+            listDiv.innerHTML = '<div class="loading">今日暂无学习单词</div>';
+            return;
+        }
+
+        let html = '';
+        words.forEach(word => {
+            const canRemove = word.can_remove;
+            const statusText = canRemove ? '可移除' : '已开始学习';
+
+            html += `
+                <div class="word-item">
+                    <div class="word-details">
+                        <h4>${word.word} <span class="group-badge">第${word.group_number}组</span></h4>
+                        ${word.phonetic ? `<p><strong>音标：</strong>/${word.phonetic}/</p>` : ''}
+                        <p><strong>翻译：</strong>${word.translation}</p>
+                        <p><strong>状态：</strong>${statusText}</p>
+                    </div>
+                    <div class="word-actions">
+                        ${canRemove ? `
+                            <button class="btn btn-danger btn-sm" onclick="removeWordFromToday(${word.daily_pool_id}, '${word.word}')">
+                                移除
+                            </button>
+                        ` : `
+                            <span style="color: #999; font-size: 0.9rem;">不可移除</span>
+                        `}
+                    </div>
+                </div>
+            `;
+        });
+
+        listDiv.innerHTML = html;
+
+    } catch (error) {
+        console.error('加载今日单词失败:', error);
+        listDiv.innerHTML = '<div class="message error">加载失败，请重试</div>';
+    }
+}
+
+async function removeWordFromToday(dailyPoolId, wordText) {
+    if (!confirm(`确定要从今日学习中移除单词 "${wordText}" 吗？`)) {
+        return;
+    }
+
+    try {
+        const response = await fetch('/api/remove_word_from_today', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({ daily_pool_id: dailyPoolId })
+        });
+
+        const result = await response.json();
+
+        if (result.success) {
+            showMessage(result.message, 'success');
+            loadTodayWords(); // 刷新列表
+        } else {
+            showMessage(result.error, 'error');
+        }
+    } catch (error) {
+        console.error('移除失败:', error);
+        showMessage('移除失败，请重试', 'error');
+    }
+}
+
+function getStatusText(status) {
+    const statusMap = {
+        'unlearned': '未学习',
+        'learning': '学习中',
+        'learned': '已学会'
+    };
+    return statusMap[status] || status;
+}
+
+function showMessage(message, type) {
+    const messageArea = document.getElementById('messageArea');
+    messageArea.innerHTML = `<div class="message ${type}">${message}</div>`;
+
+    // 3秒后自动清除消息
+    setTimeout(() => {
+        messageArea.innerHTML = '';
+    }, 3000);
+}
+
+// 页面加载时自动加载今日单词
+window.addEventListener('load', () => {
+    loadTodayWords();
+});
@@ -0,0 +1,210 @@
+"""
+多学习者模式
+每个学习者的学习数据（每日词池、掌握状态、进度、学习记录、复习队列）保存在各自的
+分片数据库 learners/<learner_id>.db 中，单词的学习状态保存在分片的 word_status 表，都以共享词库的单词id关联；
+共享词库数据库以只读方式 ATTACH 为 vocab，单词内容不复制到分片，分片连接上的临时视图 master_vocabulary
+把两者拼在一起，学习者再多，单词内容也只有共享词库一份，词库修改后所有学习者立即可见。
+多学习者模式下共享词库只读，新单词需要导入到共享词库。
+打开的分片连接池由 LRU 缓存管理，学习者再多，打开的文件句柄和内存占用也保持在上限以内。
+"""
+
+import os
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from urllib.parse import quote
+
+from db import ConnectionPool
+from migrations import migrate
+
+# 学习者ID只允许字母、数字、下划线和连字符，避免路径穿越
+LEARNER_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+def is_valid_learner_id(learner_id):
+    """检查学习者ID是否合法"""
+    return bool(learner_id) and bool(LEARNER_ID_PATTERN.match(learner_id))
+
+def resolve_learner(request, default='default'):
+    """从请求中解析学习者ID：依次查找 X-Learner-Id 请求头、learner 查询参数、learner_id Cookie"""
+    for candidate in (request.headers.get('X-Learner-Id'),
+                      request.args.get('learner'),
+                      request.cookies.get('learner_id')):
+        if is_valid_learner_id(candidate):
+            return candidate
+    return default
+
+# 分片中保存共享词库单词id的表
+WORD_ID_TABLES = ('daily_pool', 'learning_records', 'review_queue')
+
+# 分片连接上的单词视图：遮住分片中的同名空表，单词内容直接读共享词库，
+# 学习状态读分片的 word_status（没有记录的单词为 unlearned），原有的查询不需要区分模式
+WORD_VIEW = '''
+    CREATE TEMP VIEW IF NOT EXISTS master_vocabulary AS
+    SELECT v.id, v.word, v.phonetic, v.translation, v.example_sentence,
+           COALESCE((SELECT s.status FROM main.word_status s WHERE s.word_id = v.id), 'unlearned') AS status,
+           v.shuffle_key
+    FROM vocab.master_vocabulary v
+'''
+
+# 修改视图中的学习状态时写入 word_status；改回 unlearned 时删除记录
+WORD_STATUS_TRIGGER = '''
+    CREATE TEMP TRIGGER IF NOT EXISTS trg_master_vocabulary_status
+    INSTEAD OF UPDATE OF status ON master_vocabulary
+    BEGIN
+        DELETE FROM word_status WHERE word_id = NEW.id AND NEW.status = 'unlearned';
+        INSERT INTO word_status (word_id, status)
+        SELECT NEW.id, NEW.status WHERE NEW.status != 'unlearned'
+        ON CONFLICT (word_id) DO UPDATE SET status = excluded.status;
+    END
+'''
+
+def remap_word_ids(conn):
+    """旧版分片保存了共享词库的完整副本：按拼写把单词id换成共享词库的id，学习状态移到 word_status
+    共享词库中没有的单词（如分片中自建的单词）连同其词池、学习记录和复习项目一起删除。调用方负责事务"""
+    conn.execute('''
+        CREATE TEMP TABLE word_id_map AS
+        SELECT m.id AS old_id, v.id AS new_id, m.status
+        FROM main.master_vocabulary m
+        JOIN vocab.master_vocabulary v ON v.word = m.word
+    ''')
+    conn.execute('''
+        INSERT OR REPLACE INTO word_status (word_id, status)
+        SELECT new_id, status FROM word_id_map WHERE status != 'unlearned'
+    ''')
+    for table in WORD_ID_TABLES:
+        # 先换成负数，避免新旧id交叉时违反唯一约束；剩下的正数id在共享词库中不存在
+        conn.execute(f'''
+            UPDATE {table} SET master_word_id = -(
+                SELECT new_id FROM word_id_map WHERE old_id = {table}.master_word_id
+            )
+            WHERE master_word_id IN (SELECT old_id FROM word_id_map)
+        ''')
+        conn.execute(f'DELETE FROM {table} WHERE master_word_id > 0')
+        conn.execute(f'UPDATE {table} SET master_word_id = -master_word_id')
+    conn.execute('DELETE FROM daily_word_state WHERE daily_pool_id NOT IN (SELECT id FROM daily_pool)')
+    conn.execute('DELETE FROM main.master_vocabulary')
+    conn.execute('DROP TABLE temp.word_id_map')
+
+def prepare_shard(conn):
+    """迁移后整理分片：建立学习状态表，去掉分片中的单词副本和全文索引（全文检索直接使用共享词库的索引）
+    返回是否转换了旧版分片"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS word_status (
+            word_id INTEGER PRIMARY KEY,
+            status TEXT NOT NULL
+        )
+    ''')
+    for event in ('insert', 'delete', 'update'):
+        conn.execute(f'DROP TRIGGER IF EXISTS main.trg_master_vocabulary_fts_{event}')
+    conn.execute('DROP TABLE IF EXISTS main.master_vocabulary_fts')
+    conn.execute('DROP TABLE IF EXISTS main.shard_meta')
+    conn.commit()
+
+    if conn.execute('SELECT 1 FROM main.master_vocabulary LIMIT 1').fetchone() is None:
+        return False
+    with conn:
+        remap_word_ids(conn)
+    # 释放单词副本占用的空间
+    conn.execute('VACUUM')
+    return True
+
+class ShardRouter:
+    """学习者分片路由：按学习者ID返回对应分片的连接池，最多同时打开 max_open 个分片"""
+
+    def __init__(self, vocabulary_database, shard_dir='learners', max_open=64):
+        self.vocabulary_database = os.path.abspath(vocabulary_database)
+        self.shard_dir = shard_dir
+        self.max_open = max_open
+        self._pools = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def shard_path(self, learner_id):
+        """返回学习者分片数据库的路径"""
+        if not is_valid_learner_id(learner_id):
+            raise ValueError(f'无效的学习者ID: {learner_id!r}')
+        return os.path.join(self.shard_dir, f'{learner_id}.db')
+
+    def _attach_vocabulary(self, conn):
+        """以只读方式挂载共享词库"""
+        conn.execute("ATTACH DATABASE ? AS vocab",
+                     (f'file:{quote(self.vocabulary_database)}?mode=ro',))
+
+    def _connect_shard(self, conn):
+        """分片连接池的新连接：挂载共享词库并建立单词视图"""
+        self._attach_vocabulary(conn)
+        conn.execute(WORD_VIEW)
+        conn.execute(WORD_STATUS_TRIGGER)
+
+    def _open(self, learner_id):
+        """打开（必要时创建）学习者分片：升级表结构并整理分片"""
+        os.makedirs(self.shard_dir, exist_ok=True)
+        path = os.path.abspath(self.shard_path(learner_id))
+
+        # 迁移在没有单词视图的连接上执行，迁移语句操作的是分片中的同名表
+        conn = sqlite3.connect(path)
+        try:
+            self._attach_vocabulary(conn)
+            migrate(conn, verbose=False)
+            prepare_shard(conn)
+        finally:
+            conn.close()
+        return ConnectionPool(f'file:{quote(path)}', on_connect=self._connect_shard, uri=True)
+
+    def pool_for(self, learner_id):
+        """返回学习者分片的连接池（LRU）"""
+        with self._lock:
+            pool = self._pools.get(learner_id)
+            if pool is not None:
+                self._pools.move_to_end(learner_id)
+                return pool
+
+        # 打开分片涉及迁移和同步，不在锁内执行
+        pool = self._open(learner_id)
+
+        evicted = []
+        with self._lock:
+            existing = self._pools.get(learner_id)
+            if existing is not None:
+                # 其他线程已经打开了同一个分片
+                self._pools.move_to_end(learner_id)
+                evicted.append(pool)
+                pool = existing
+            else:
+                self._pools[learner_id] = pool
+                while len(self._pools) > self.max_open:
+                    _, old = self._pools.popitem(last=False)
+                    evicted.append(old)
+                    self.evictions += 1
+
+        for old in evicted:
+            old.close_all()
+        return pool
+
+    def release_thread(self):
+        """归还当前线程在所有已打开分片中持有的连接"""
+        with self._lock:
+            pools = list(self._pools.values())
+        for pool in pools:
+            pool.release_thread()
+
+    def learner_ids(self):
+        """已有分片数据库的学习者ID"""
+        if not os.path.isdir(self.shard_dir):
+            return []
+        return sorted(name[:-3] for name in os.listdir(self.shard_dir)
+                      if name.endswith('.db') and is_valid_learner_id(name[:-3]))
+
+    def open_count(self):
+        """当前打开的分片数量"""
+        with self._lock:
+            return len(self._pools)
+
+    def close_all(self):
+        """关闭所有分片连接"""
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+        for pool in pools:
+            pool.close_all()
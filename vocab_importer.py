@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+词书批量导入工具
+并行解析逐行JSON格式的词书文件（如 CET6_2.json、Level8_1.json），
+分块批量写入 master_vocabulary 表
+
+支持增量重导入：每条记录按 wordId（缺失时用 wordHead）保存内容哈希，
+每个词书文件保存字节偏移检查点。重复运行时只写入新增或变化的记录，
+中途崩溃后从检查点继续，且不会改变已在学习/已学会单词的 status。
+导入时同时维护每个单词在原始文件中的字节偏移索引（见 word_index.py）。
+
+用法:
+    python vocab_importer.py CET6_2.json Level4luan_1.json Level8_1.json
+    python vocab_importer.py --rescan            # 忽略检查点，重新比对全部记录
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from word_index import ensure_offset_table, has_offsets, store_offsets
+
+DATABASE = 'vocabulary.db'
+
+# 随项目附带的词书文件
+DEFAULT_WORD_BOOKS = ['CET6_2.json', 'Level4luan_1.json', 'Level8_1.json']
+
+# 每个解析任务包含的行数，同时也是每个写入事务的行数
+CHUNK_SIZE = 500
+
+def record_key(word_info):
+    """词书记录的唯一标识：优先使用 wordId，缺失时使用 wordHead"""
+    return word_info.get('wordId') or word_info['wordHead']
+
+def content_hash(line):
+    """计算一行原始记录的内容哈希"""
+    return hashlib.blake2b(line, digest_size=16).hexdigest()
+
+def parse_word_line(line):
+    """解析词书中的一行，返回 (key, word, phonetic, translation, example_sentence)"""
+    data = json.loads(line)
+    word_info = data['content']['word']
+    content = word_info.get('content', {})
+
+    word = word_info['wordHead']
+    phonetic = content.get('usphone', '')
+
+    # 获取中文释义
+    translations = [trans.get('tranCn', '') for trans in content.get('trans', [])]
+    translation = '；'.join(filter(None, translations))
+
+    # 获取例句
+    example_sentence = ''
+    sentences = content.get('sentence', {}).get('sentences', [])
+    if sentences:
+        example_sentence = sentences[0].get('sContent', '')
+
+    return record_key(word_info), word, phonetic, translation, example_sentence
+
+def parse_chunk(task):
+    """解析一块原始行（在子进程中执行），跳过空行和损坏的行
+
+    task 为 (start_offset, end_offset, lines)，返回 (end_offset, rows, offsets, errors)：
+    rows 中每一项为 (key, content_hash, word, phonetic, translation, example_sentence)，
+    offsets 中每一项为 (word, 行起始字节偏移, 行字节长度)。
+    """
+    offset, end_offset, lines = task
+    rows = []
+    offsets = []
+    errors = 0
+    for raw in lines:
+        line_offset = offset
+        offset += len(raw)
+        line = raw.strip()
+        if not line:
+            continue
+        try:
+            key, word, phonetic, translation, example_sentence = parse_word_line(line)
+        except (ValueError, KeyError, TypeError):
+            errors += 1
+            continue
+        rows.append((key, content_hash(line), word, phonetic, translation, example_sentence))
+        offsets.append((word, line_offset, len(raw)))
+    return end_offset, rows, offsets, errors
+
+def iter_chunks(path, chunk_size=CHUNK_SIZE, start=0):
+    """从字节偏移 start 起按行流式读取词书文件
+
+    每次产出 (块起始字节偏移, 块结束字节偏移, chunk_size 行原始字节)。
+    """
+    chunk = []
+    chunk_start = offset = start
+    with open(path, 'rb') as f:
+        f.seek(start)
+        for line in f:
+            chunk.append(line)
+            offset += len(line)
+            if len(chunk) >= chunk_size:
+                yield chunk_start, offset, chunk
+                chunk = []
+                chunk_start = offset
+    if chunk:
+        yield chunk_start, offset, chunk
+
+def _parse_in_order(chunks, executor, max_pending):
+    """把块提交到进程池并按提交顺序产出结果，同时最多保留 max_pending 个在途任务"""
+    if executor is None:
+        for chunk in chunks:
+            yield parse_chunk(chunk)
+        return
+
+    pending = deque()
+    for chunk in chunks:
+        pending.append(executor.submit(parse_chunk, chunk))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+def ensure_import_tables(conn):
+    """创建导入记录表和检查点表"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS import_records (
+            word_key TEXT PRIMARY KEY,
+            word TEXT NOT NULL,
+            content_hash TEXT NOT NULL,
+            source TEXT
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_import_records_word ON import_records (word)')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS import_checkpoints (
+            source TEXT PRIMARY KEY,
+            byte_offset INTEGER NOT NULL,
+            file_size INTEGER NOT NULL,
+            file_mtime INTEGER NOT NULL,
+            completed INTEGER DEFAULT 0,
+            updated_at TEXT
+        )
+    ''')
+    ensure_offset_table(conn)
+    conn.commit()
+
+def file_signature(path):
+    """返回 (文件大小, 修改时间ns)，用于判断检查点是否仍然有效"""
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+def load_checkpoint(conn, source, signature, rescan=False):
+    """返回 (起始字节偏移, 是否已完整导入)；文件变化或 rescan 时从头开始"""
+    if rescan:
+        return 0, False
+    row = conn.execute(
+        'SELECT byte_offset, file_size, file_mtime, completed FROM import_checkpoints WHERE source = ?',
+        (source,)
+    ).fetchone()
+    if row is None or (row[1], row[2]) != signature:
+        return 0, False
+    return row[0], bool(row[3])
+
+def save_checkpoint(conn, source, offset, signature, completed):
+    """记录文件的导入位置（与数据写入处于同一事务）"""
+    conn.execute('''
+        INSERT OR REPLACE INTO import_checkpoints
+        (source, byte_offset, file_size, file_mtime, completed, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', (source, offset, signature[0], signature[1], int(completed), datetime.now().isoformat()))
+
+def changed_rows(conn, rows):
+    """过滤出内容哈希与已导入版本不同（或从未导入）的记录"""
+    known = {}
+    keys = [row[0] for row in rows]
+    # 分批查询，避免超过SQLite参数数量上限
+    for i in range(0, len(keys), 500):
+        batch = keys[i:i + 500]
+        placeholders = ','.join('?' for _ in batch)
+        known.update(conn.execute(
+            f'SELECT word_key, content_hash FROM import_records WHERE word_key IN ({placeholders})', batch
+        ).fetchall())
+    return [row for row in rows if known.get(row[0]) != row[1]]
+
+def write_rows(conn, rows, offsets, source, offset, signature, completed):
+    """在一个事务内批量写入一块新增或变化的单词、整块的偏移索引并推进检查点，返回写入的单词数
+
+    已存在的单词只更新音标、释义和例句，不会改变 status；
+    同一个单词出现在多本词书中时，以最先导入它的记录为准。
+    """
+    with conn:
+        # 先登记记录（保持已有行的rowid不变），最早登记某个单词的记录即其归属记录
+        conn.executemany('''
+            INSERT INTO import_records (word_key, word, content_hash, source)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(word_key) DO UPDATE SET
+                word = excluded.word,
+                content_hash = excluded.content_hash,
+                source = excluded.source
+        ''', [(key, word, digest, source) for key, digest, word, *_ in rows])
+        # rowcount 只统计这条语句本身插入或更新的行，不含触发器（排序键、全文索引）写入的行
+        written = conn.executemany('''
+            INSERT INTO master_vocabulary
+            (word, phonetic, translation, example_sentence, status)
+            VALUES (?, ?, ?, ?, 'unlearned')
+            ON CONFLICT(word) DO UPDATE SET
+                phonetic = excluded.phonetic,
+                translation = excluded.translation,
+                example_sentence = excluded.example_sentence
+            WHERE ? = (
+                SELECT word_key FROM import_records
+                WHERE word = excluded.word ORDER BY rowid LIMIT 1
+            )
+        ''', [(word, phonetic, translation, example, key)
+              for key, _, word, phonetic, translation, example in rows]).rowcount
+        # 前面的行长度变化会使后续行整体偏移，所以整块的偏移都要刷新
+        store_offsets(conn, source, offsets)
+        save_checkpoint(conn, source, offset, signature, completed)
+    return written
+
+def import_word_books(paths, database=DATABASE, workers=None, chunk_size=CHUNK_SIZE,
+                      rescan=False, verbose=True):
+    """并行、增量地导入任意数量的词书文件，返回导入统计信息
+
+    workers 为进程数，None 表示使用CPU核数，1 表示在当前进程内解析。
+    已完整导入且未变化的文件直接跳过；未完成的文件从检查点继续；
+    rescan=True 时忽略检查点，重新比对每条记录的内容哈希。
+    """
+    paths = list(paths)
+    missing = [p for p in paths if not os.path.exists(p)]
+    if missing:
+        raise FileNotFoundError(f"词书文件不存在: {', '.join(missing)}")
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    stats = {'files': len(paths), 'skipped_files': 0, 'parsed': 0, 'changed': 0, 'written': 0, 'errors': 0}
+    conn = sqlite3.connect(database)
+    # 导入期间放宽持久化要求，每块提交一次
+    conn.execute('PRAGMA synchronous = NORMAL')
+    ensure_import_tables(conn)
+    started = time.perf_counter()
+
+    executor = None
+    try:
+        for path in paths:
+            source = os.path.basename(path)
+            signature = file_signature(path)
+            start, completed = load_checkpoint(conn, source, signature, rescan)
+            if completed and not has_offsets(conn, source):
+                # 建立偏移索引之前导入的词书，需要重新扫描一遍
+                start, completed = 0, False
+            if completed:
+                stats['skipped_files'] += 1
+                if verbose:
+                    print(f"⏭️  {path}: 未发生变化，跳过")
+                continue
+            if verbose and start:
+                print(f"↩️  {path}: 从检查点 {start} 字节处继续导入")
+
+            if executor is None and workers > 1:
+                executor = ProcessPoolExecutor(max_workers=workers)
+
+            file_started = time.perf_counter()
+            file_parsed = file_changed = file_written = 0
+            offset = start
+            chunks = iter_chunks(path, chunk_size, start)
+            for offset, rows, offsets, errors in _parse_in_order(chunks, executor, max(workers * 2, 2)):
+                file_parsed += len(rows)
+                rows = changed_rows(conn, rows)
+                file_written += write_rows(conn, rows, offsets, source, offset, signature, False)
+                file_changed += len(rows)
+                stats['errors'] += errors
+            with conn:
+                save_checkpoint(conn, source, offset, signature, True)
+
+            stats['parsed'] += file_parsed
+            stats['changed'] += file_changed
+            stats['written'] += file_written
+            if verbose:
+                elapsed = time.perf_counter() - file_started
+                print(f"📚 {path}: 解析 {file_parsed} 行，新增或变化 {file_changed} 条记录，"
+                      f"写入 {file_written} 个单词，{file_parsed / elapsed if elapsed else 0:.0f} 行/秒")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        conn.close()
+
+    stats['seconds'] = time.perf_counter() - started
+    stats['rows_per_sec'] = stats['parsed'] / stats['seconds'] if stats['seconds'] else 0.0
+    if verbose:
+        print(f"✅ 共处理 {stats['files']} 个词书（{stats['skipped_files']} 个未变化），"
+              f"解析 {stats['parsed']} 行，新增或变化 {stats['changed']} 条记录，写入 {stats['written']} 个单词，"
+              f"跳过 {stats['errors']} 行错误数据，"
+              f"耗时 {stats['seconds']:.2f} 秒（{stats['rows_per_sec']:.0f} 行/秒）")
+    return stats
+
+def main(argv=None):
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description='批量导入逐行JSON格式的词书文件')
+    parser.add_argument('files', nargs='*', default=DEFAULT_WORD_BOOKS,
+                        help='词书文件路径（默认导入项目自带的全部词书）')
+    parser.add_argument('--db', default=DATABASE, help='数据库文件路径')
+    parser.add_argument('--workers', type=int, default=None, help='解析进程数（默认CPU核数）')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='每个事务写入的行数')
+    parser.add_argument('--rescan', action='store_true', help='忽略检查点，重新比对全部记录的内容哈希')
+    args = parser.parse_args(argv)
+
+    # 确保表结构存在（延迟导入，避免与 app 循环引用）
+    from app import init_db
+    init_db(args.db)
+
+    try:
+        import_word_books(args.files, database=args.db, workers=args.workers,
+                          chunk_size=args.chunk_size, rescan=args.rescan)
+    except FileNotFoundError as e:
+        print(f"❌ {e}")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,156 @@
+"""
+词书原始文件的字节偏移索引
+导入时记录每个单词在原始词书文件（CET6_2.json、Level*.json）中所在行的
+字节偏移和长度，查询单词详情时通过内存映射只读取并解析这一行，
+无需把完整的词典内容加载进数据库或内存
+"""
+
+import json
+import mmap
+import os
+import threading
+
+from db import get_pool
+
+DATABASE = 'vocabulary.db'
+
+def ensure_offset_table(conn):
+    """创建单词偏移索引表"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS word_offsets (
+            word TEXT NOT NULL COLLATE NOCASE,
+            source TEXT NOT NULL,
+            byte_offset INTEGER NOT NULL,
+            length INTEGER NOT NULL,
+            PRIMARY KEY (word, source)
+        )
+    ''')
+
+def store_offsets(conn, source, offsets):
+    """写入一批 (word, byte_offset, length)，调用方负责事务"""
+    conn.executemany('''
+        INSERT INTO word_offsets (word, source, byte_offset, length)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(word, source) DO UPDATE SET
+            byte_offset = excluded.byte_offset,
+            length = excluded.length
+    ''', [(word, source, offset, length) for word, offset, length in offsets])
+
+def has_offsets(conn, source):
+    """检查某个词书文件是否已建立偏移索引"""
+    return conn.execute(
+        'SELECT 1 FROM word_offsets WHERE source = ? LIMIT 1', (source,)
+    ).fetchone() is not None
+
+def format_word_detail(data):
+    """把词书中的一条原始记录整理为单词详情"""
+    word_info = data['content']['word']
+    content = word_info.get('content', {})
+
+    return {
+        'word': word_info['wordHead'],
+        'word_id': word_info.get('wordId'),
+        'book_id': data.get('bookId'),
+        'usphone': content.get('usphone', ''),
+        'ukphone': content.get('ukphone', ''),
+        'translations': [{
+            'pos': trans.get('pos', ''),
+            'translation': trans.get('tranCn', ''),
+            'definition': trans.get('tranOther', '')
+        } for trans in content.get('trans', [])],
+        'sentences': [{
+            'sentence': s.get('sContent', ''),
+            'translation': s.get('sCn', '')
+        } for s in content.get('sentence', {}).get('sentences', [])],
+        'real_exam_sentences': [{
+            'sentence': s.get('sContent', ''),
+            'source': s.get('sourceInfo', {})
+        } for s in content.get('realExamSentence', {}).get('sentences', [])],
+        'phrases': [{
+            'phrase': p.get('pContent', ''),
+            'translation': p.get('pCn', '')
+        } for p in content.get('phrase', {}).get('phrases', [])],
+        'synonyms': [{
+            'pos': syno.get('pos', ''),
+            'translation': syno.get('tran', ''),
+            'words': [hwd.get('w', '') for hwd in syno.get('hwds', [])]
+        } for syno in content.get('syno', {}).get('synos', [])],
+        'related_words': [{
+            'pos': rel.get('pos', ''),
+            'words': [{'word': w.get('hwd', ''), 'translation': w.get('tran', '').strip()}
+                      for w in rel.get('words', [])]
+        } for rel in content.get('relWord', {}).get('rels', [])],
+        'antonyms': [anto.get('hwd', '') for anto in content.get('antos', {}).get('anto', [])],
+        'memory_method': content.get('remMethod', {}).get('val', ''),
+        'exam_questions': content.get('exam', [])
+    }
+
+class WordDetailIndex:
+    """基于偏移索引和内存映射的单词详情查询"""
+
+    def __init__(self, database=DATABASE, book_dir='.'):
+        self.database = database
+        self.book_dir = book_dir
+        self._maps = {}
+        self._lock = threading.Lock()
+
+    def _get_map(self, source):
+        """返回词书文件的内存映射，文件大小变化时重新映射"""
+        path = os.path.join(self.book_dir, source)
+        size = os.path.getsize(path)
+        with self._lock:
+            cached = self._maps.get(source)
+            if cached and cached[0] == size:
+                return cached[1]
+            if cached:
+                cached[1].close()
+            if size == 0:
+                self._maps.pop(source, None)
+                return None
+            with open(path, 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[source] = (size, mapped)
+            return mapped
+
+    def locate(self, word):
+        """查找单词所在的 (source, byte_offset, length)，优先返回最先导入的词书"""
+        conn = get_pool(self.database).acquire()
+        try:
+            return conn.execute('''
+                SELECT source, byte_offset, length FROM word_offsets
+                WHERE word = ? ORDER BY rowid LIMIT 1
+            ''', (word,)).fetchone()
+        finally:
+            conn.close()
+
+    def read_record(self, source, offset, length):
+        """从内存映射中解码一行原始记录"""
+        try:
+            mapped = self._get_map(source)
+        except OSError:
+            return None
+        if mapped is None or offset + length > len(mapped):
+            return None
+        try:
+            return json.loads(mapped[offset:offset + length])
+        except ValueError:
+            return None
+
+    def get_detail(self, word):
+        """返回单词的完整详情，未收录或索引已失效时返回None"""
+        location = self.locate(word)
+        if not location:
+            return None
+
+        data = self.read_record(*location)
+        # 词书文件在导入后被修改，偏移已失效
+        if not data or data.get('content', {}).get('word', {}).get('wordHead', '').lower() != word.lower():
+            return None
+        return format_word_detail(data)
+
+    def close(self):
+        """关闭所有内存映射"""
+        with self._lock:
+            for _, mapped in self._maps.values():
+                mapped.close()
+            self._maps.clear()
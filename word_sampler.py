@@ -0,0 +1,57 @@
+"""
+未学习单词的随机抽样
+master_vocabulary.shuffle_key 为每个单词持久化保存一个随机排序键（插入时由触发器生成），
+相当于把整本词书预先洗好牌。抽样时随机选一个起点，沿 (status, shuffle_key) 索引
+顺序取出 k 个未学习单词（到末尾后从头继续），只需 O(log n + k) 次索引访问，
+不再需要 ORDER BY RANDOM() 对全部未学习单词排序。
+"""
+
+import random
+
+# shuffle_key 的取值范围为 [0, KEY_SPACE)，与 SQLite abs(random()) 一致
+KEY_SPACE = 2 ** 63
+
+# 从排序键 start 开始顺序取未学习单词；到末尾后从头取到 start 之前
+SAMPLE_FROM_SQL = '''
+    SELECT id FROM master_vocabulary
+    WHERE status = 'unlearned' AND shuffle_key >= ?
+    ORDER BY shuffle_key
+    LIMIT ?
+'''
+SAMPLE_WRAP_SQL = '''
+    SELECT id FROM master_vocabulary
+    WHERE status = 'unlearned' AND shuffle_key < ?
+    ORDER BY shuffle_key
+    LIMIT ?
+'''
+
+def sampling_rng(seed, date_str):
+    """返回抽样用的随机数生成器；seed 为 None 时不固定种子
+
+    固定种子时同一天的抽样结果可复现，便于测试和基准测试。
+    """
+    if seed is None:
+        return random.Random()
+    return random.Random(f'{seed}:{date_str}')
+
+def sample_unlearned_ids(conn, k, rng=None):
+    """随机抽取 k 个未学习单词的id，不足 k 个时返回全部"""
+    rng = rng or random.Random()
+    start = rng.randrange(KEY_SPACE)
+
+    ids = [row[0] for row in conn.execute(SAMPLE_FROM_SQL, (start, k))]
+
+    # 到达排序键末尾，从头继续取
+    if len(ids) < k:
+        ids += [row[0] for row in conn.execute(SAMPLE_WRAP_SQL, (start, k - len(ids)))]
+    return ids
+
+def reshuffle_words(conn, seed=None):
+    """重新为所有单词生成排序键（调用方负责提交）；指定 seed 时结果可复现"""
+    rng = random.Random(seed)
+    ids = [row[0] for row in conn.execute('SELECT id FROM master_vocabulary ORDER BY id')]
+    conn.executemany(
+        'UPDATE master_vocabulary SET shuffle_key = ? WHERE id = ?',
+        [(rng.randrange(KEY_SPACE), word_id) for word_id in ids]
+    )
+    return len(ids)
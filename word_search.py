@@ -0,0 +1,209 @@
+"""
+单词搜索索引
+从 master_vocabulary 构建的内存索引：
+- 前缀树（Trie）：前缀补全，每个节点记录子树中的单词数，分页时整棵跳过偏移量之前的子树
+- 对称删除索引：按编辑距离查找拼写相近的单词（“您是不是要找”）
+新单词按 id 增量加入索引，不需要重建。
+"""
+
+import threading
+
+# 按 id 增量加载新单词
+REFRESH_SQL = 'SELECT id, word FROM master_vocabulary WHERE id > ? ORDER BY id'
+
+def bounded_edit_distance(a, b, max_distance):
+    """编辑距离（Levenshtein），超过 max_distance 时提前结束并返回 max_distance + 1
+    只计算对角线附近宽度为 2 * max_distance + 1 的带状区域"""
+    limit = max_distance + 1
+    if abs(len(a) - len(b)) > max_distance:
+        return limit
+    if len(a) > len(b):
+        a, b = b, a
+    n = len(b)
+
+    previous = list(range(n + 1))
+    for i, ca in enumerate(a, 1):
+        current = [limit] * (n + 1)
+        current[0] = i if i <= max_distance else limit
+        best = current[0]
+        for j in range(max(1, i - max_distance), min(n, i + max_distance) + 1):
+            value = min(previous[j - 1] + (ca != b[j - 1]), previous[j] + 1, current[j - 1] + 1)
+            current[j] = value
+            if value < best:
+                best = value
+        if best > max_distance:
+            return limit
+        previous = current
+    return min(previous[n], limit)
+
+def deletes(key, max_distance, prefix_length):
+    """删除至多 max_distance 个字符得到的所有字符串（只取前 prefix_length 个字符）"""
+    key = key[:prefix_length]
+    variants = {key}
+    frontier = {key}
+    for _ in range(max_distance):
+        frontier = {s[:i] + s[i + 1:] for s in frontier for i in range(len(s))}
+        variants |= frontier
+    return variants
+
+class TrieNode:
+    __slots__ = ('children', 'entries', 'count')
+
+    def __init__(self):
+        self.children = {}
+        self.entries = None   # 以此节点结尾的单词 [(id, word)]
+        self.count = 0        # 子树中的单词数
+
+class Trie:
+    """小写单词前缀树"""
+
+    def __init__(self):
+        self.root = TrieNode()
+
+    def insert(self, key, entry):
+        node = self.root
+        node.count += 1
+        for char in key:
+            child = node.children.get(char)
+            if child is None:
+                child = node.children[char] = TrieNode()
+            child.count += 1
+            node = child
+        if node.entries is None:
+            node.entries = []
+        node.entries.append(entry)
+
+    def find(self, prefix):
+        """返回前缀对应的节点"""
+        node = self.root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return None
+        return node
+
+    def page(self, prefix, offset, limit):
+        """按字母顺序返回以 prefix 开头的单词的第 offset 条起的 limit 条，以及总数"""
+        node = self.find(prefix)
+        if node is None or limit <= 0:
+            return [], (node.count if node else 0)
+
+        results = []
+        stack = [node]
+        while stack and len(results) < limit:
+            current = stack.pop()
+            if current.entries:
+                if offset >= len(current.entries):
+                    offset -= len(current.entries)
+                else:
+                    results.extend(current.entries[offset:offset + limit - len(results)])
+                    offset = 0
+            # 逆序压栈，保证按字母顺序弹出
+            for char in sorted(current.children, reverse=True):
+                child = current.children[char]
+                stack.append(child)
+            # 整棵子树都在偏移量之前时直接跳过
+            while stack and offset >= stack[-1].count:
+                offset -= stack.pop().count
+        return results, node.count
+
+class DeleteIndex:
+    """对称删除索引：编辑距离不超过 k 的两个单词，各自删除至多 k 个字符后必有相同的结果。
+    预先为每个单词生成删除变体，查询时生成查询词的删除变体取出候选，再逐个精确计算距离。
+    只对前 prefix_length 个字符生成变体，控制索引大小。"""
+
+    def __init__(self, max_distance=2, prefix_length=7):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.variants = {}
+        self.keys = []
+
+    def insert(self, key, entry):
+        position = len(self.keys)
+        self.keys.append((key, entry))
+        for variant in deletes(key, self.max_distance, self.prefix_length):
+            positions = self.variants.get(variant)
+            if positions is None:
+                self.variants[variant] = [position]
+            else:
+                positions.append(position)
+
+    def search(self, key, max_distance):
+        """返回编辑距离不超过 max_distance 的 [(distance, entry)]"""
+        max_distance = min(max_distance, self.max_distance)
+        candidates = set()
+        for variant in deletes(key, max_distance, self.prefix_length):
+            positions = self.variants.get(variant)
+            if positions:
+                candidates.update(positions)
+
+        results = []
+        for position in candidates:
+            candidate, entry = self.keys[position]
+            distance = bounded_edit_distance(key, candidate, max_distance)
+            if distance <= max_distance:
+                results.append((distance, entry))
+        return results
+
+def fuzzy_distance_limit(query):
+    """根据单词长度决定允许的拼写错误数"""
+    return 1 if len(query) <= 4 else 2
+
+class WordSearchIndex:
+    """单词前缀/模糊搜索索引，按 master_vocabulary.id 增量加载"""
+
+    def __init__(self):
+        self.trie = Trie()
+        self.deletes = DeleteIndex()
+        self.exact = {}
+        self.last_id = 0
+        self.size = 0
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    def add(self, word_id, word):
+        """加入一个单词；id 不大于已加载的最大 id 时视为已加载，直接忽略"""
+        key = word.strip().lower()
+        if not key:
+            return
+        entry = (word_id, word)
+        with self._lock:
+            if word_id <= self.last_id:
+                return
+            self.trie.insert(key, entry)
+            self.deletes.insert(key, entry)
+            self.exact.setdefault(key, []).append(entry)
+            self.last_id = word_id
+            self.size += 1
+
+    def refresh(self, conn):
+        """加载 id 大于已加载最大 id 的新单词，返回加载数量"""
+        latest = conn.execute('SELECT MAX(id) FROM master_vocabulary').fetchone()[0] or 0
+        if latest <= self.last_id:
+            return 0
+        with self._refresh_lock:
+            rows = conn.execute(REFRESH_SQL, (self.last_id,)).fetchall()
+            for word_id, word in rows:
+                self.add(word_id, word)
+        return len(rows)
+
+    def lookup(self, query):
+        """精确匹配（不区分大小写）"""
+        return list(self.exact.get(query.strip().lower(), []))
+
+    def prefix(self, query, offset=0, limit=10):
+        """前缀补全：返回 (entries, total)"""
+        with self._lock:
+            return self.trie.page(query.strip().lower(), offset, limit)
+
+    def fuzzy(self, query, limit=10, max_distance=None):
+        """拼写相近的单词，按编辑距离和字母顺序排序：返回 [(distance, entry)]"""
+        key = query.strip().lower()
+        if not key:
+            return []
+        if max_distance is None:
+            max_distance = fuzzy_distance_limit(key)
+        with self._lock:
+            found = self.deletes.search(key, max_distance)
+        found.sort(key=lambda item: (item[0], item[1][1].lower()))
+        return found[:limit]